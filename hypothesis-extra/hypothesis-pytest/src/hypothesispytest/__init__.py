@@ -26,6 +26,11 @@ class StoringReporter(object):
         self.results.append(msg)
 
 
+def pytest_collection_modifyitems(items):
+    from hypothesis.core import prefetch_examples
+    prefetch_examples(getattr(item, 'obj', None) for item in items)
+
+
 @pytest.mark.hookwrapper
 def pytest_pyfunc_call(pyfuncitem):
     from hypothesis.reporting import with_reporter
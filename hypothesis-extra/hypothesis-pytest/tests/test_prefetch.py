@@ -0,0 +1,51 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+pytest_plugins = str('pytester')
+
+
+TESTSUITE = """
+from hypothesis import given, Settings
+from hypothesis.database import ExampleDatabase
+
+database = ExampleDatabase()
+settings = Settings(database=database)
+
+
+@given(int, settings=settings)
+def test_one(x):
+    pass
+
+
+class TestStuff(object):
+    @given(int, settings=settings)
+    def test_two(self, x):
+        pass
+
+
+def test_was_prefetched():
+    assert test_one.hypothesis_database_key in database.prefetched
+    assert TestStuff.test_two.hypothesis_database_key in database.prefetched
+"""
+
+
+def test_prefetches_examples_at_collection(testdir):
+    script = testdir.makepyfile(TESTSUITE)
+    result = testdir.runpytest(script, '--verbose')
+    assert result.ret == 0
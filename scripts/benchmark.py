@@ -0,0 +1,292 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+
+"""Microbenchmarks for hot spots in example generation.
+
+Run as python scripts/benchmark.py [name ...] from the root of the repo
+with src on your PYTHONPATH. With no names it runs every benchmark.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import sys
+import timeit
+from random import Random
+
+import hypothesis.internal.distributions as dist
+import hypothesis.searchstrategy.strategies as strategies
+from hypothesis.database import ExampleDatabase
+from hypothesis.errors import UnsatisfiedAssumption
+from hypothesis.internal.chooser import chooser
+from hypothesis.utils.conventions import not_set
+from hypothesis.strategies import text, lists, one_of, tuples, booleans, \
+    integers, fixed_dictionaries
+from hypothesis.searchstrategy.plans import compiled
+from hypothesis.searchstrategy.strategies import FilteredStrategy, \
+    MappedSearchStrategy
+from hypothesis.internal.randomness import FastRandom, SplitRandom, \
+    randints
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def accept(f):
+        BENCHMARKS[name] = f
+        return f
+    return accept
+
+
+def report(label, f, number):
+    best = min(timeit.repeat(f, number=number, repeat=3))
+    print('    %-36s %10.3f us/call' % (label, best / number * 10 ** 6))
+
+
+class CountingRandom(Random):
+
+    def __init__(self, seed):
+        Random.__init__(self, seed)
+        self.calls = 0
+
+    def random(self):
+        self.calls += 1
+        return Random.random(self)
+
+    def randint(self, a, b):
+        self.calls += 1
+        return Random.randint(self, a, b)
+
+
+def rejection_choose(weights, random):
+    """The rejection sampler chooser used to use, for comparison."""
+    while True:
+        i = random.randint(0, len(weights) - 1)
+        if random.random() <= weights[i]:
+            return i
+
+
+def rejection_non_empty_subset(random, elements, activation_chance):
+    """The non_empty_subset we used to have, for comparison."""
+    result = []
+    while not result:
+        result = [
+            x
+            for x in elements
+            if dist.biased_coin(random, activation_chance)
+        ]
+    return result
+
+
+@benchmark('chooser')
+def bench_chooser():
+    for n in (2, 10, 50):
+        # One heavy branch and a lot of light ones, as one_of tends to get.
+        weights = [256] + [1] * (n - 1)
+        c = chooser(weights)
+        random = CountingRandom(0)
+        print('  %d weights:' % (n,))
+        report('rejection', lambda: rejection_choose(c.weights, random), 10000)
+        report('alias', lambda: c.choose(random), 10000)
+        for label, f in (
+            ('rejection', lambda: rejection_choose(c.weights, random)),
+            ('alias', lambda: c.choose(random)),
+        ):
+            random.calls = 0
+            for _ in range(1000):
+                f()
+            print('    %-30s %8.2f rng calls/call' % (
+                label, random.calls / 1000))
+
+
+@benchmark('non_empty_subset')
+def bench_non_empty_subset():
+    for n in (2, 10, 50):
+        elements = list(range(n))
+        chance = 2.0 / n
+        random = Random(0)
+        print('  %d elements:' % (n,))
+        report('rejection', lambda: rejection_non_empty_subset(
+            random, elements, chance), 10000)
+        report('direct', lambda: dist.non_empty_subset(
+            random, elements, chance), 10000)
+
+
+@benchmark('randomness')
+def bench_randomness():
+    standard = Random(0)
+    fast = FastRandom(0)
+    report('Random.randint', lambda: standard.randint(0, 10), 100000)
+    report('FastRandom.randint', lambda: fast.randint(0, 10), 100000)
+    report('Random.choice', lambda: standard.choice('abcdef'), 100000)
+    report('FastRandom.choice', lambda: fast.choice('abcdef'), 100000)
+    report('20 x getrandbits(8)', lambda: [
+        standard.getrandbits(8) + 1 for _ in range(20)], 10000)
+    report('randints(20)', lambda: randints(fast, 1, 256, 20), 10000)
+
+
+@benchmark('split_random')
+def bench_split_random():
+    report('Random(seed)', lambda: Random(2 ** 63 + 1), 10000)
+    report('SplitRandom(seed)', lambda: SplitRandom(2 ** 63 + 1), 10000)
+    for strategy in (integers(), lists(integers())):
+        parameter = strategy.draw_parameter(Random(0))
+        print('  %r:' % (strategy,))
+        seeds = [Random(i).getrandbits(64) for i in range(200)]
+        for cls in (Random, SplitRandom):
+            # Different generators draw different sized examples from any
+            # one seed, so we average over a lot of them.
+            label = '200 x draw_template(%s(seed))' % (cls.__name__,)
+            report(label, lambda: [
+                strategy.draw_template(cls(seed), parameter)
+                for seed in seeds
+            ], 10)
+    flatmapped = integers(1, 3).flatmap(lambda n: lists(integers(), n, n))
+    random = Random(0)
+    templates = [
+        flatmapped.draw_template(random, flatmapped.draw_parameter(random))
+        for _ in range(1000)
+    ]
+
+    def reify_all():
+        for template in templates:
+            template.target_data = not_set
+            flatmapped.reify(template)
+    report('reify flatmap x 1000', reify_all, 5)
+
+
+@benchmark('wide_union')
+def bench_wide_union():
+    lazy_size = strategies.LAZY_UNION_SIZE
+    for n in (2, 16, 64):
+        union = one_of(*[
+            fixed_dictionaries({'a': integers(), 'b': text()})
+            for _ in range(n)
+        ])
+        random = Random(0)
+
+        def draw():
+            parameter = union.draw_parameter(random)
+            for _ in range(10):
+                union.draw_template(random, parameter)
+        print('  %d branches:' % (n,))
+        try:
+            strategies.LAZY_UNION_SIZE = float('inf')
+            report('eager parameter + 10 templates', draw, 100)
+            strategies.LAZY_UNION_SIZE = 0
+            report('lazy parameter + 10 templates', draw, 100)
+        finally:
+            strategies.LAZY_UNION_SIZE = lazy_size
+
+
+@benchmark('plans')
+def bench_plans():
+    for label, arguments in (
+        ('booleans', (booleans(), booleans(), {'x': booleans()})),
+        ('collections', (integers(), text(), {'x': lists(integers())})),
+    ):
+        # The same shape of strategy that given builds for its arguments.
+        wrapper = tuples(tuples(*arguments[:-1]), fixed_dictionaries(
+            arguments[-1]))
+        random = Random(0)
+        parameters = [wrapper.draw_parameter(random) for _ in range(20)]
+        templates = [wrapper.draw_template(random, p) for p in parameters]
+        print('  %s:' % (label,))
+        for name, strategy in (
+            ('interpreted', wrapper), ('compiled', compiled(wrapper))
+        ):
+            report('%s 20 x draw_template' % (name,), lambda: [
+                strategy.draw_template(random, p) for p in parameters], 500)
+            report('%s 20 x reify' % (name,), lambda: [
+                strategy.reify(t) for t in templates], 500)
+            report('%s 20 x draw_value' % (name,), lambda: [
+                strategy.draw_value(random, p) for p in parameters], 500)
+
+
+@benchmark('map_chain')
+def bench_map_chain():
+    def steps():
+        return (
+            (lambda x: x + 1, False), (abs, False), (lambda x: x >= 0, True),
+            (lambda x: x * 2, False), (bool, True), (str, False),
+        )
+
+    base = integers()
+    nested = base
+    fused = base
+    for f, is_filter in steps():
+        # How the chain used to be built, one wrapper per step.
+        if is_filter:
+            nested = FilteredStrategy(strategy=nested, condition=f)
+            fused = fused.filter(f)
+        else:
+            nested = MappedSearchStrategy(strategy=nested, pack=f)
+            fused = fused.map(f)
+    random = Random(0)
+    parameter = base.draw_parameter(random)
+    templates = [base.draw_template(random, parameter) for _ in range(100)]
+
+    def reify_all(strategy):
+        for template in templates:
+            try:
+                strategy.reify(template)
+            except UnsatisfiedAssumption:
+                pass
+    for label, strategy in (('nested', nested), ('fused', fused)):
+        report('%s 100 x reify' % (label,), lambda: reify_all(strategy), 200)
+        report('%s 100 x to_basic' % (label,), lambda: [
+            strategy.to_basic(t) for t in templates], 200)
+
+
+@benchmark('serialization')
+def bench_serialization():
+    wrapper = tuples(
+        tuples(lists(tuples(integers(), booleans()), average_size=1000)),
+        fixed_dictionaries({}),
+    )
+    random = Random(0)
+    template = wrapper.draw_and_produce(random)
+    while len(template[0][0]) < 1000:
+        template = wrapper.draw_and_produce(random)
+    basic = wrapper.to_basic(template)
+    print('  a list of %d elements:' % (len(template[0][0]),))
+    for name, strategy in (
+        ('interpreted', wrapper), ('compiled', compiled(wrapper))
+    ):
+        storage = ExampleDatabase().storage(name)
+
+        def save_and_fetch():
+            storage.save(template, strategy)
+            for fetched in storage.fetch(strategy):
+                pass
+        report('%s to_basic' % (name,), lambda: strategy.to_basic(
+            template), 20)
+        report('%s from_basic' % (name,), lambda: strategy.from_basic(
+            basic), 20)
+        report('%s Storage save + fetch' % (name,), save_and_fetch, 20)
+
+
+def main(names):
+    for name in names or sorted(BENCHMARKS):
+        print('%s:' % (name,))
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
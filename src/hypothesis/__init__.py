@@ -28,7 +28,8 @@ from __future__ import division, print_function, absolute_import, \
 from hypothesis.searchstrategy import strategy
 from hypothesis.settings import Settings, Verbosity
 from hypothesis.version import __version_info__, __version__
-from hypothesis.core import given, assume, find, example
+from hypothesis.core import given, assume, find, example, \
+    reproduce_failure
 
 # Force strategy extensions to be loaded here
 import hypothesis.strategies as unused
@@ -42,6 +43,7 @@ __all__ = [
     'strategy',
     'find',
     'example',
+    'reproduce_failure',
     '__version__',
     '__version_info__',
 ]
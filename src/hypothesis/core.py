@@ -19,32 +19,41 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import json
 import math
 import time
+import zlib
+import base64
 import inspect
 import binascii
 import functools
 import traceback
 from random import Random
-from itertools import islice
+from itertools import chain, islice
 from collections import namedtuple
 
 import hypothesis.strategies as sd
 from hypothesis.extra import load_entry_points
-from hypothesis.errors import Flaky, Timeout, NoSuchExample, \
-    Unsatisfiable, InvalidArgument, UnsatisfiedAssumption, \
-    DefinitelyNoSuchExample
+from hypothesis.errors import Flaky, BadData, Timeout, NoSuchExample, \
+    Unsatisfiable, DidNotReproduce, InvalidArgument, \
+    UnsatisfiedAssumption, DefinitelyNoSuchExample
 from hypothesis.control import assume  # noqa
 from hypothesis.settings import Settings, Verbosity
 from hypothesis.executors import executor
 from hypothesis.reporting import report, debug_report, verbose_report, \
     current_verbosity
 from hypothesis.deprecation import note_deprecation
-from hypothesis.internal.compat import qualname
-from hypothesis.internal.tracker import Tracker
+from hypothesis.internal.compat import hrange, qualname, integer_types
+from hypothesis.internal.sizing import scale_for, size_scale, size_budget
+from hypothesis.internal.tracing import BranchCollector
+from hypothesis.internal.randomness import FastRandom, random_for_example
+from hypothesis.internal.tracker import Tracker, ValueTracker
+from hypothesis.internal.novelty import structural_features
+from hypothesis.internal.mutation import mutate_basic
 from hypothesis.internal.reflection import arg_string, copy_argspec, \
     function_digest, fully_qualified_name, \
     get_pretty_function_description
+from hypothesis.searchstrategy.plans import compiled
 from hypothesis.internal.examplesource import ParameterSource
 from hypothesis.searchstrategy.strategies import strategy
 
@@ -56,6 +65,11 @@ def time_to_call_it_a_day(settings, start_time):
     return time.time() >= start_time + settings.timeout
 
 
+# The number of mutated variants of each example from the database that
+# find_satisfying_template tries before it starts generating new examples.
+MUTATIONS_PER_STORED_EXAMPLE = 20
+
+
 def find_satisfying_template(
     search_strategy, random, condition, tracker, settings, storage=None,
     max_parameter_tries=None,
@@ -77,9 +91,21 @@ def find_satisfying_template(
     this a valid test) or NoSuchExample (to indicate that this probably means
     that condition is true with very high probability).
 
+    Each template we draw gets its own random, derived from a seed for the
+    whole run (the first thing we draw from random) and its index among the
+    templates we drew. Its parameter comes from a ParameterSource, which
+    adapts to the examples before it, so the template can only be
+    regenerated on its own with random_for_example given that same
+    parameter.
+
     """
+    run_seed = random.getrandbits(64)
     satisfying_examples = 0
     examples_considered = 0
+    # Only counts freshly drawn examples, so the index an example is drawn
+    # at doesn't depend on what was in the database or how many mutations
+    # we tried.
+    examples_generated = 0
     timed_out = False
     max_iterations = max(settings.max_iterations, settings.max_examples)
     max_examples = min(max_iterations, settings.max_examples)
@@ -89,16 +115,70 @@ def find_satisfying_template(
     )
     start_time = time.time()
 
+    max_corpus_size = settings.max_corpus_size if storage else 0
+    corpus_features = set()
+    if max_corpus_size > 0:
+        corpus_features = storage.corpus_features()
+
+    def offer_to_corpus(example):
+        if max_corpus_size <= 0:
+            return
+        features = structural_features(search_strategy.to_basic(example))
+        if not features.issubset(corpus_features):
+            corpus_features.update(features)
+            storage.save_to_corpus(example, search_strategy, max_corpus_size)
+
+    collector = BranchCollector() if settings.coverage_guided else None
+    coverage = set()
+    # In coverage guided mode, the examples which ran some branch of code
+    # that no example before them had.
+    interesting = []
+
+    def run(example):
+        if collector is None:
+            return condition(example)
+        try:
+            with collector:
+                return condition(example)
+        finally:
+            if not collector.branches.issubset(coverage):
+                coverage.update(collector.branches)
+                interesting.append(example)
+
+    def mutate(example):
+        try:
+            return search_strategy.from_basic(mutate_basic(
+                search_strategy.to_basic(example), random
+            ))
+        except BadData:
+            return None
+
+    # If there are few enough templates that we can try every one of them
+    # within our budget, we just do that: drawing them at random would keep
+    # hitting the ones we've already seen long before we found the last few.
+    all_templates = None
+    if search_strategy.template_upper_bound <= max_examples:
+        all_templates = search_strategy.all_templates()
+    exhausted = False
+
+    corpus = []
     if storage:
-        for example in storage.fetch(search_strategy):
+        replay = storage.fetch(search_strategy)
+        if max_corpus_size > 0:
+            replay = chain(
+                replay, storage.fetch_corpus(search_strategy))
+        for example in replay:
             if examples_considered >= max_iterations:
                 break
             examples_considered += 1
             if time_to_call_it_a_day(settings, start_time):
                 break
-            tracker.track(example)
+            if tracker.track(example) > 1:
+                continue
+            corpus.append(example)
             try:
-                if condition(example):
+                if run(example):
+                    storage.record_failure(example, search_strategy)
                     return example
                 satisfying_examples += 1
             except UnsatisfiedAssumption:
@@ -106,10 +186,66 @@ def find_satisfying_template(
             if satisfying_examples >= max_examples:
                 break
 
-    parameter_source = ParameterSource(
-        random=random, strategy=search_strategy,
-        max_tries=max_parameter_tries,
+    # Before generating anything new, try small variations on the examples
+    # from the database, as inputs close to ones which used to fail are much
+    # more likely to fail than completely random ones. If we're guided by
+    # coverage we prefer to vary the ones which ran new code.
+    mutation_budget = min(
+        len(corpus) * MUTATIONS_PER_STORED_EXAMPLE, max_examples // 2
     )
+    if all_templates is not None:
+        mutation_budget = 0
+    for _ in hrange(mutation_budget):
+        if len(tracker) >= search_strategy.template_upper_bound:
+            break
+        if examples_considered >= max_iterations:
+            break
+        if satisfying_examples >= max_examples:
+            break
+        if time_to_call_it_a_day(settings, start_time):
+            break
+        example = mutate(random.choice(interesting or corpus))
+        if example is None:
+            continue
+        examples_considered += 1
+        if tracker.track(example) > 1:
+            continue
+        try:
+            if run(example):
+                return example
+            satisfying_examples += 1
+            offer_to_corpus(example)
+        except UnsatisfiedAssumption:
+            pass
+
+    if all_templates is not None:
+        for example in all_templates:
+            if examples_considered >= max_iterations:
+                break
+            if satisfying_examples >= max_examples:
+                break
+            if time_to_call_it_a_day(settings, start_time):
+                break
+            examples_considered += 1
+            if tracker.track(example) > 1:
+                continue
+            try:
+                if run(example):
+                    return example
+            except UnsatisfiedAssumption:
+                continue
+            satisfying_examples += 1
+            offer_to_corpus(example)
+        else:
+            exhausted = True
+
+    ramp_length = settings.size_ramp * max_examples
+    with size_scale(scale_for(1, ramp_length)):
+        parameter_source = ParameterSource(
+            random=random, strategy=search_strategy,
+            max_tries=max_parameter_tries,
+            seeds=storage.fetch_parameter_seeds() if storage else (),
+        )
 
     assert search_strategy.template_upper_bound >= 0
     if isinstance(search_strategy.template_upper_bound, float):
@@ -117,7 +253,7 @@ def find_satisfying_template(
     else:
         assert isinstance(search_strategy.template_upper_bound, int)
 
-    for parameter in parameter_source:  # pragma: no branch
+    while not exhausted:
         if len(tracker) >= search_strategy.template_upper_bound:
             break
         if examples_considered >= max_iterations:
@@ -128,38 +264,79 @@ def find_satisfying_template(
             break
         examples_considered += 1
 
-        example = search_strategy.draw_template(
-            random, parameter
-        )
+        # In coverage guided mode, spend half our time on variations of the
+        # examples which found new code.
+        if interesting and random.randint(0, 1):
+            example = mutate(random.choice(interesting))
+            if example is None or tracker.track(example) > 1:
+                continue
+            try:
+                if run(example):
+                    return example
+            except UnsatisfiedAssumption:
+                continue
+            satisfying_examples += 1
+            offer_to_corpus(example)
+            continue
+
+        with size_scale(scale_for(examples_considered, ramp_length)):
+            parameter = parameter_source.pick_a_parameter()
+        examples_generated += 1
+        with size_budget(settings.size_budget):
+            example = search_strategy.draw_template(
+                random_for_example(run_seed, examples_generated), parameter)
         if tracker.track(example) > 1:
             debug_report('Skipping duplicate example')
             parameter_source.mark_bad()
             continue
+        n_interesting = len(interesting)
         try:
-            if condition(example):
+            if run(example):
+                if storage:
+                    storage.save_parameter_seed(
+                        parameter_source.current_seed,
+                        parameter_source.current_scale,
+                    )
                 return example
         except UnsatisfiedAssumption:
             parameter_source.mark_bad()
             continue
+        if len(interesting) > n_interesting:
+            parameter_source.mark_good()
         satisfying_examples += 1
-    run_time = time.time() - start_time
-    timed_out = settings.timeout >= 0 and run_time >= settings.timeout
+        offer_to_corpus(example)
     if (
-        satisfying_examples and
-        len(tracker) >= search_strategy.template_upper_bound
+        satisfying_examples and (
+            exhausted or
+            len(tracker) >= search_strategy.template_upper_bound
+        )
     ):
         raise DefinitelyNoSuchExample(
             get_pretty_function_description(condition),
             satisfying_examples,
         )
-    elif satisfying_examples < min_satisfying_examples:
+    raise_no_satisfying_example(
+        condition, settings, start_time, len(tracker), satisfying_examples,
+        min_satisfying_examples,
+    )
+
+
+def raise_no_satisfying_example(
+    condition, settings, start_time, examples_tried, satisfying_examples,
+    min_satisfying_examples,
+):
+    """Raise the appropriate error for having failed to find an example
+    satisfying condition after trying examples_tried distinct ones."""
+    run_time = time.time() - start_time
+    timed_out = settings.timeout >= 0 and run_time >= settings.timeout
+    if satisfying_examples < min_satisfying_examples:
         if timed_out:
             raise Timeout((
                 'Ran out of time before finding a satisfying example for %s.' +
                 ' Only found %d examples (%d satisfying assumptions) in %.2fs.'
             ) % (
                 get_pretty_function_description(condition),
-                len(tracker), satisfying_examples, run_time
+                examples_tried, satisfying_examples, run_time
             ))
         else:
             raise Unsatisfiable((
@@ -167,13 +344,91 @@ def find_satisfying_template(
                 'Only %d out of %d examples considered satisfied assumptions'
             ) % (
                 get_pretty_function_description(condition),
-                satisfying_examples, len(tracker)))
+                satisfying_examples, examples_tried))
     else:
         raise NoSuchExample(get_pretty_function_description(condition))
 
 
+def can_draw_values_directly(search_strategy, settings, storage):
+    """Can we look for examples with find_satisfying_value rather than
+    find_satisfying_template? That is, will we never need the template for an
+    example: We're not going to simplify or save them, and there are enough
+    possible templates that we won't be enumerating them."""
+    return (
+        settings.max_shrinks <= 0 and
+        storage is None and
+        not settings.coverage_guided and
+        not settings.deduplicate_values and
+        search_strategy.template_upper_bound > settings.max_examples
+    )
+
+
+def find_satisfying_value(
+    search_strategy, random, condition, settings, max_parameter_tries=None,
+):
+    """A version of find_satisfying_template which draws values directly
+    without going through templates, which is much faster but means there's
+    no way to avoid duplicates or to simplify what we find.
+
+    Returns the first value for which condition is truthy, and otherwise
+    raises the same exceptions find_satisfying_template would, except that it
+    can never know that there is definitely no such example.
+
+    """
+    run_seed = random.getrandbits(64)
+    satisfying_examples = 0
+    examples_considered = 0
+    max_iterations = max(settings.max_iterations, settings.max_examples)
+    max_examples = min(max_iterations, settings.max_examples)
+    min_satisfying_examples = min(
+        settings.min_satisfying_examples,
+        max_examples,
+    )
+    start_time = time.time()
+
+    ramp_length = settings.size_ramp * max_examples
+    with size_scale(scale_for(1, ramp_length)):
+        parameter_source = ParameterSource(
+            random=random, strategy=search_strategy,
+            max_tries=max_parameter_tries,
+        )
+
+    while (
+        examples_considered < max_iterations and
+        satisfying_examples < max_examples and
+        not time_to_call_it_a_day(settings, start_time)
+    ):
+        examples_considered += 1
+        with size_scale(scale_for(examples_considered, ramp_length)):
+            parameter = parameter_source.pick_a_parameter()
+        try:
+            with size_budget(settings.size_budget):
+                value = search_strategy.draw_value(
+                    random_for_example(run_seed, examples_considered),
+                    parameter)
+            if condition(value):
+                return value
+        except UnsatisfiedAssumption:
+            parameter_source.mark_bad()
+            continue
+        satisfying_examples += 1
+    raise_no_satisfying_example(
+        condition, settings, start_time, examples_considered,
+        satisfying_examples, min_satisfying_examples,
+    )
+
+
+# How often, in seconds, simplify_template_such_that offers a checkpoint of
+# its progress.
+CHECKPOINT_INTERVAL = 1.0
+
+
+ShrinkState = namedtuple('ShrinkState', ('warmup', 'changed', 'exhausted'))
+
+
 def simplify_template_such_that(
-    search_strategy, random, t, f, tracker, settings, start_time
+    search_strategy, random, t, f, tracker, settings, start_time,
+    checkpoint=None, resume_from=None,
 ):
     """Perform a greedy search to produce a "simplest" version of a template
     that satisfies some predicate.
@@ -187,6 +442,12 @@ def simplify_template_such_that(
     If f throws UnsatisfiedAssumption this will be treated the same as if
     it returned False.
 
+    If checkpoint is not None it will periodically be called with the best
+    template so far and a ShrinkState describing how far through the search
+    we are, and will be called a final time when we stop, with a state of
+    None if the search ran to completion. Passing such a state back in as
+    resume_from will pick the search up where it left off.
+
     """
     assert isinstance(random, Random)
 
@@ -196,11 +457,34 @@ def simplify_template_such_that(
     changed = True
     max_warmup = 5
     warmup = 0
+    exhausted = set()
+    if resume_from is not None:
+        warmup = resume_from.warmup - 1
+        exhausted = set(resume_from.exhausted)
+        debug_report('Resuming simplification from round %d' % (
+            resume_from.warmup,
+        ))
+    last_checkpoint = time.time()
+
+    def offer_checkpoint():
+        if checkpoint is not None:
+            checkpoint(t, ShrinkState(warmup, changed, sorted(exhausted)))
+
     while (
         (changed or warmup < max_warmup) and
         successful_shrinks < settings.max_shrinks
     ):
-        changed = False
+        # Passes are identified by their position in the round, as the same
+        # pass can come up more than once in it. Only the round we are
+        # resuming skips the ones it had already finished.
+        if resume_from is not None:
+            changed = resume_from.changed
+            resume_from = None
+            skip = frozenset(exhausted)
+        else:
+            changed = False
+            exhausted = set()
+            skip = frozenset()
         warmup += 1
         if warmup < max_warmup:
             debug_report('Running warmup simplification round %d' % (
@@ -209,7 +493,9 @@ def simplify_template_such_that(
         elif warmup == max_warmup:
             debug_report('Warmup is done. Moving on to fully simplifying')
 
-        for simplify in search_strategy.simplifiers(random, t):
+        for i, simplify in enumerate(search_strategy.simplifiers(random, t)):
+            if i in skip:
+                continue
             debug_report('Applying simplification pass %s' % (
                 simplify.__name__,
             ))
@@ -219,6 +505,7 @@ def simplify_template_such_that(
                     simpler = islice(simpler, warmup)
                 for s in simpler:
                     if time_to_call_it_a_day(settings, start_time):
+                        offer_checkpoint()
                         return
                     if tracker.track(s) > 1:
                         continue
@@ -233,9 +520,36 @@ def simplify_template_such_that(
                         pass
                 else:
                     break
+                if time.time() >= last_checkpoint + CHECKPOINT_INTERVAL:
+                    offer_checkpoint()
+                    last_checkpoint = time.time()
+            exhausted.add(i)
 
             if successful_shrinks >= settings.max_shrinks:
-                break
+                offer_checkpoint()
+                return
+    if checkpoint is not None:
+        checkpoint(t, None)
+
+
+def load_shrink_state(data):
+    """Convert the basic data saved by a checkpoint back into a ShrinkState,
+    or return None if it is not valid."""
+    try:
+        warmup, changed, exhausted = data
+    except (TypeError, ValueError):
+        return None
+    if not (
+        isinstance(warmup, int) and warmup >= 1 and
+        isinstance(changed, bool) and isinstance(exhausted, list) and
+        all(
+            isinstance(i, integer_types) and not isinstance(i, bool) and
+            i >= 0
+            for i in exhausted
+        )
+    ):
+        return None
+    return ShrinkState(warmup, changed, exhausted)
 
 
 def best_satisfying_template(
@@ -250,7 +564,10 @@ def best_satisfying_template(
 
     """
     if tracker is None:
-        tracker = Tracker()
+        if settings.deduplicate_values:
+            tracker = ValueTracker(search_strategy.reify)
+        else:
+            tracker = Tracker()
     start_time = time.time()
 
     successful_shrinks = -1
@@ -259,14 +576,43 @@ def best_satisfying_template(
             search_strategy, random, condition, tracker, settings, storage,
             max_parameter_tries=max_parameter_tries,
         )
+        checkpoint = None
+        resume_from = None
+        checkpointed = []
+        if storage is not None:
+            resume_from = load_shrink_state(storage.fetch_checkpoint(
+                satisfying_example, search_strategy
+            ))
+
+            def save_checkpoint(template, state):
+                if state is None:
+                    storage.clear_checkpoint()
+                    return
+                # The checkpointed template is saved as an ordinary example
+                # too, so that the next run replays it and can resume from
+                # it even if this run never gets to finish.
+                storage.save(template, search_strategy)
+                storage.save_checkpoint(template, search_strategy, [
+                    state.warmup, state.changed, list(state.exhausted)
+                ])
+                for stale in checkpointed:
+                    if stale != template:
+                        storage.delete(stale, search_strategy)
+                checkpointed[:] = [template]
+            checkpoint = save_checkpoint
+
         for simpler in simplify_template_such_that(
             search_strategy, random, satisfying_example, condition, tracker,
-            settings, start_time,
+            settings, start_time, checkpoint=checkpoint,
+            resume_from=resume_from,
         ):
             successful_shrinks += 1
             satisfying_example = simpler
         if storage is not None:
             storage.save(satisfying_example, search_strategy)
+            for stale in checkpointed:
+                if stale != satisfying_example:
+                    storage.delete(stale, search_strategy)
         if not successful_shrinks:
             verbose_report('Could not shrink example')
         elif successful_shrinks == 1:
@@ -313,12 +659,54 @@ def example(*args, **kwargs):
     return accept
 
 
+def reproduce_failure(blob):
+    """Run the test on the single example encoded in blob, as printed when a
+    test fails, rather than searching for examples. This is meant for
+    debugging a failure you can't otherwise reproduce (e.g. because it
+    happened on another machine) and shouldn't be left in your tests.
+
+    The blob is only valid for the test it was printed for and for the same
+    version of Hypothesis.
+
+    """
+    def accept(test):
+        test.hypothesis_reproduce_failure = blob
+        return test
+    return accept
+
+
+def encode_failure(data):
+    """Encode the basic data for a template as a short ASCII string."""
+    return base64.b64encode(zlib.compress(
+        json.dumps(data, separators=(',', ':')).encode('utf-8')
+    )).decode('ascii')
+
+
+def decode_failure(blob):
+    """The inverse of encode_failure."""
+    try:
+        return json.loads(zlib.decompress(
+            base64.b64decode(blob.encode('ascii'))
+        ).decode('utf-8'))
+    except (TypeError, ValueError, UnicodeError, binascii.Error, zlib.error):
+        raise InvalidArgument('Invalid reproduction blob %r' % (blob,))
+
+
 def reify_and_execute(
     search_strategy, template, test,
     print_example=False, always_print=False,
 ):
     def run():
-        args, kwargs = search_strategy.reify(template)
+        return execute(
+            search_strategy.reify(template), test,
+            print_example=print_example, always_print=always_print,
+        )()
+    return run
+
+
+def execute(value, test, print_example=False, always_print=False):
+    def run():
+        args, kwargs = value
         if print_example:
             report(
                 lambda: 'Falsifying example: %s(%s)' % (
@@ -371,13 +759,15 @@ def given(*generator_arguments, **generator_kwargs):
         )
 
     def run_test_with_generator(test):
+        database_key = fully_qualified_name(test)
+
         if settings.derandomize:
             assert provided_random is None
-            random = Random(
+            random = FastRandom(
                 function_digest(test)
             )
         else:
-            random = provided_random or Random()
+            random = provided_random or FastRandom()
 
         original_argspec = inspect.getargspec(test)
         if original_argspec.varargs:
@@ -427,6 +817,9 @@ def given(*generator_arguments, **generator_kwargs):
             test.__name__, argspec
         )
         def wrapped_test(*arguments, **kwargs):
+            # Looked up when the test is called, so that tools like
+            # keepshrinking can run it with different settings.
+            settings = wrapped_test.hypothesis_settings
             selfy = None
             # Because we converted all kwargs to given into real args and
             # error if we have neither args nor kwargs, this should always
@@ -477,16 +870,64 @@ def given(*generator_arguments, **generator_kwargs):
                     (k, convert_to_specifier(v)) for (k, v) in kwargs.items()))
             )
 
-            search_strategy = strategy(given_specifier, settings)
+            search_strategy = compiled(strategy(given_specifier, settings))
+
+            blob = getattr(wrapped_test, 'hypothesis_reproduce_failure', None)
+            if blob is not None:
+                try:
+                    template = search_strategy.from_basic(decode_failure(blob))
+                except BadData:
+                    raise InvalidArgument((
+                        'Reproduction blob %r does not match the arguments '
+                        'of %s') % (blob, test.__name__))
+                test_runner(reify_and_execute(
+                    search_strategy, template, test, print_example=True))
+                raise DidNotReproduce(
+                    'Expected %s to fail on the example it was asked to '
+                    'reproduce, but it passed' % (test.__name__,))
 
             if settings.database:
-                storage = settings.database.storage(
-                    fully_qualified_name(test))
+                storage = settings.database.storage(database_key)
             else:
                 storage = None
 
             last_exception = [None]
 
+            tracker = None
+            if settings.deduplicate_values:
+                # Arguments which were passed in rather than generated (e.g.
+                # self) are the same for every example, and usually aren't
+                # values we know how to compare, so we leave them out.
+                generated = set(
+                    k for k, v in kwargs.items()
+                    if isinstance(v, HypothesisProvided)
+                )
+
+                def generated_values(template):
+                    value_args, value_kwargs = search_strategy.reify(template)
+                    return [
+                        a for a, x in zip(value_args, arguments)
+                        if isinstance(x, HypothesisProvided)
+                    ], dict(
+                        (k, v) for k, v in value_kwargs.items()
+                        if k in generated
+                    )
+                tracker = ValueTracker(generated_values)
+
+            if can_draw_values_directly(search_strategy, settings, storage):
+                # We won't shrink, so the first failure propagates straight
+                # out of here and if we get to the end the test has passed.
+                def is_value_example(value):
+                    test_runner(execute(value, test, always_print=True))
+                    return False
+
+                try:
+                    find_satisfying_value(
+                        search_strategy, random, is_value_example, settings)
+                except NoSuchExample:
+                    pass
+                return
+
             def is_template_example(xs):
                 try:
                     test_runner(reify_and_execute(
@@ -510,7 +951,7 @@ def given(*generator_arguments, **generator_kwargs):
             try:
                 falsifying_template = best_satisfying_template(
                     search_strategy, random, is_template_example,
-                    settings, storage
+                    settings, storage, tracker=tracker,
                 )
             except NoSuchExample:
                 return
@@ -518,10 +959,19 @@ def given(*generator_arguments, **generator_kwargs):
             assert last_exception[0] is not None
 
             with settings:
-                test_runner(reify_and_execute(
-                    search_strategy, falsifying_template, test,
-                    print_example=True
-                ))
+                try:
+                    test_runner(reify_and_execute(
+                        search_strategy, falsifying_template, test,
+                        print_example=True
+                    ))
+                except Exception:
+                    report(
+                        'You can reproduce this example by temporarily '
+                        "adding @reproduce_failure('%s') as a decorator on "
+                        'your test' % (encode_failure(
+                            search_strategy.to_basic(falsifying_template)),)
+                    )
+                    raise
 
                 report(
                     'Failed to reproduce exception. Expected: \n' +
@@ -537,13 +987,83 @@ def given(*generator_arguments, **generator_kwargs):
         wrapped_test.__name__ = test.__name__
         wrapped_test.__doc__ = test.__doc__
         wrapped_test.is_hypothesis_test = True
+        wrapped_test.hypothesis_settings = settings
+        wrapped_test.hypothesis_database_key = database_key
+        wrapped_test.hypothesis_argument_specifiers = dict(
+            zip(arguments[len(arguments) - len(specifiers):], specifiers))
         wrapped_test.hypothesis_explicit_examples = getattr(
             test, 'hypothesis_explicit_examples', []
         )
+        wrapped_test.hypothesis_reproduce_failure = getattr(
+            test, 'hypothesis_reproduce_failure', None
+        )
         return wrapped_test
     return run_test_with_generator
 
 
+def prefetch_examples(tests):
+    """Load the saved examples for every one of these tests that was
+    decorated with given from their databases in bulk, so that running the
+    tests does not have to query the database separately for each one.
+
+    Anything in tests which is not a test using given is ignored.
+
+    """
+    keys_by_database = {}
+    for test in tests:
+        if not getattr(test, 'is_hypothesis_test', False):
+            continue
+        database = test.hypothesis_settings.database
+        if database is None:
+            continue
+        keys_by_database.setdefault(database, []).append(
+            test.hypothesis_database_key)
+    for database, keys in keys_by_database.items():
+        database.prefetch(keys)
+
+
+def given_strategy(test):
+    """Return the strategy that test, which must be decorated with given,
+    uses to generate its arguments (or at least one which is equivalent as far
+    as the database is concerned)."""
+    specifiers = test.hypothesis_argument_specifiers
+    settings = test.hypothesis_settings
+    strategies = {}
+    for name in inspect.getargspec(test).args:
+        # Anything we don't generate, e.g. self, is passed in when the test is
+        # called and is represented by a just() strategy, whose only template
+        # is None whatever the value.
+        if name in specifiers:
+            strategies[name] = strategy(specifiers[name], settings)
+        else:
+            strategies[name] = sd.just(None)
+    return strategy(
+        sd.tuples(sd.tuples(), sd.fixed_dictionaries(strategies)), settings)
+
+
+def template_for_arguments(test, arguments, search_strategy=None):
+    """Return a template for given_strategy(test) (or search_strategy if it
+    is not None, to save rebuilding it) that will call test with these values
+    for its generated arguments. arguments is a dict mapping the name of
+    every generated argument to a value.
+
+    Raises NotInvertible if any of the values could not have been generated.
+
+    """
+    specifiers = test.hypothesis_argument_specifiers
+    if set(arguments) != set(specifiers):
+        raise InvalidArgument(
+            'Expected values for arguments %s but got %s' % (
+                ', '.join(sorted(specifiers)), ', '.join(sorted(arguments))))
+    if search_strategy is None:
+        search_strategy = given_strategy(test)
+    values = dict(
+        (name, arguments.get(name))
+        for name in inspect.getargspec(test).args
+    )
+    return search_strategy.template_for(((), values))
+
+
 def find(specifier, condition, settings=None, random=None, storage=None):
     settings = settings or Settings(
         max_examples=2000,
@@ -551,7 +1071,7 @@ def find(specifier, condition, settings=None, random=None, storage=None):
         max_shrinks=2000,
     )
 
-    search = strategy(specifier, settings)
+    search = compiled(strategy(specifier, settings))
 
     if storage is None and settings.database is not None:
         storage = settings.database.storage(
@@ -560,11 +1080,10 @@ def find(specifier, condition, settings=None, random=None, storage=None):
             )
         )
 
-    random = random or Random()
+    random = random or FastRandom()
     successful_examples = [0]
 
-    def template_condition(template):
-        result = search.reify(template)
+    def value_condition(result):
         success = condition(result)
 
         if success:
@@ -585,10 +1104,22 @@ def find(specifier, condition, settings=None, random=None, storage=None):
                 ))
         return success
 
+    def template_condition(template):
+        return value_condition(search.reify(template))
+
+    value_condition.__name__ = condition.__name__
     template_condition.__name__ = condition.__name__
-    tracker = Tracker()
+    if settings.deduplicate_values:
+        tracker = ValueTracker(search.reify)
+    else:
+        tracker = Tracker()
 
     try:
+        if can_draw_values_directly(search, settings, storage):
+            return find_satisfying_value(
+                search, random, value_condition, settings,
+                max_parameter_tries=2,
+            )
         return search.reify(best_satisfying_template(
             search, random, template_condition, settings,
             tracker=tracker, max_parameter_tries=2,
@@ -596,6 +1127,13 @@ def find(specifier, condition, settings=None, random=None, storage=None):
         ))
     except Timeout:
         raise
+    except DefinitelyNoSuchExample as e:
+        # We tried every template there is. The tracker may still have seen
+        # fewer than template_upper_bound of them, as that counts every
+        # ordering of a set but we only enumerate one of each.
+        raise DefinitelyNoSuchExample(
+            get_pretty_function_description(condition), e.n_examples,
+        )
     except NoSuchExample:
         if search.template_upper_bound <= len(tracker):
             raise DefinitelyNoSuchExample(
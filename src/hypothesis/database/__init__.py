@@ -17,18 +17,74 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import time
+import hashlib
 
+from hypothesis.internal.compat import hrange, text_type, integer_types
+from hypothesis.internal.novelty import structural_features
 from hypothesis.searchstrategy.strategies import BadData
 from hypothesis.database.formats import JSONFormat
 from hypothesis.database.backend import SQLiteBackend
 
 
+def metadata_key(key, data):
+    """The key under which metadata about the example saved under key as data
+    is stored.
+
+    Each example gets a key of its own, named for a hash of its data, so
+    that updating the metadata for one example never has to read or write
+    anything about the others.
+
+    """
+    if isinstance(data, text_type):
+        data = data.encode('utf-8')
+    elif not isinstance(data, bytes):
+        data = repr(data).encode('utf-8')
+    return '%s:metadata:%s' % (key, hashlib.sha1(data).hexdigest())
+
+
+def checkpoint_key(key):
+    """The key under which a checkpoint of an interrupted attempt to simplify
+    an example saved under key is stored."""
+    return '%s:checkpoint' % (key,)
+
+
+def parameters_key(key):
+    """The key under which the seeds for parameters that found examples saved
+    under key are stored."""
+    return '%s:parameters' % (key,)
+
+
+def corpus_key(key):
+    """The key under which the corpus of interesting passing examples for
+    the examples saved under key is stored."""
+    return '%s:corpus' % (key,)
+
+
+def data_size(data):
+    try:
+        return len(data)
+    except TypeError:
+        return 0
+
+
 class Storage(object):
 
-    """Handles saving and loading examples matching a particular specifier."""
+    """Handles saving and loading examples matching a particular specifier.
+
+    Alongside every saved example we also keep a record of the last time it
+    failed and how many runs it has failed in, where saving an example or
+    calling record_failure for it counts as a failure (but only once per
+    Storage object). fetch uses this to replay the examples which failed
+    most recently (and, among those, the smallest) first.
+
+    Separately it can keep a bounded corpus of passing examples which were
+    structurally novel when they were seen, for replaying on later runs.
+
+    """
 
     def __repr__(self):
-        return 'Storage(%s)' % (self.specifier,)
+        return 'Storage(%s)' % (self.key,)
 
     def __init__(
         self, backend, key, format,
@@ -38,14 +94,236 @@ class Storage(object):
         self.backend = backend
         self.format = format
         self.key = key
+        self.checkpoint_key = checkpoint_key(key)
+        self.parameters_key = parameters_key(key)
+        self.corpus_key = corpus_key(key)
+        self.saved = set()
 
     def save(self, value, strategy):
+        self.save_many([value], strategy)
+
+    def save_many(self, values, strategy):
+        now = int(time.time() * 1000000)
+        for value in values:
+            serialized = self.format.serialize_basic(strategy.to_basic(value))
+            self.database.save_data(self.key, serialized)
+            self.record(serialized, now)
+
+    def record_failure(self, value, strategy):
+        """Update the history of value, which has already been saved, to say
+        that it has just failed again, without saving it again."""
+        self.record(
+            self.format.serialize_basic(strategy.to_basic(value)),
+            int(time.time() * 1000000),
+        )
+
+    def record(self, serialized, now):
+        key = metadata_key(self.key, serialized)
+        increment = 0 if serialized in self.saved else 1
+        self.saved.add(serialized)
+        existing = list(self.database.fetch_data(key))
+        _, failure_count = self.parse_metadata(existing)
+        for data in existing:
+            self.database.delete_data(key, data)
+        self.database.save_data(key, self.format.serialize_basic([
+            now, max(1, failure_count + increment)
+        ]))
+
+    def delete(self, value, strategy):
+        serialized = self.format.serialize_basic(strategy.to_basic(value))
+        self.database.delete_data(self.key, serialized)
+        key = metadata_key(self.key, serialized)
+        for data in self.database.fetch_data(key):
+            self.database.delete_data(key, data)
+
+    def save_checkpoint(self, value, strategy, state):
+        """Record that we have simplified as far as value, with state being
+        basic data describing how to carry on from there.
+
+        Only one checkpoint is kept per key, so this replaces any previous
+        checkpoint.
+
+        """
+        self.clear_checkpoint()
+        self.database.save_data(
+            self.checkpoint_key, self.format.serialize_basic([
+                strategy.to_basic(value), state
+            ]))
+
+    def fetch_checkpoint(self, value, strategy):
+        """Return the state last checkpointed for value, or None if the most
+        recent checkpoint is not for value."""
+        serialized = self.format.serialize_basic(strategy.to_basic(value))
+        for data in self.database.fetch_data(self.checkpoint_key):
+            try:
+                converted, state = self.format.deserialize_data(data)
+                if self.format.serialize_basic(converted) == serialized:
+                    return state
+            except (TypeError, ValueError):
+                continue
+        return None
+
+    def clear_checkpoint(self):
+        for data in self.database.fetch_data(self.checkpoint_key):
+            self.database.delete_data(self.checkpoint_key, data)
+
+    # The number of parameter seeds we keep for each key. Once this is
+    # exceeded the least recently saved seeds are discarded.
+    max_parameter_seeds = 10
+
+    def parameter_seed_entries(self):
+        """Return a list of pairs (data, (last_saved, seed, scale)) for every
+        valid parameter seed, most recently saved first."""
+        entries = []
+        for data in self.database.fetch_data(self.parameters_key):
+            try:
+                seed, last_saved, scale = self.format.deserialize_data(data)
+            except (TypeError, ValueError):
+                continue
+            if (
+                isinstance(seed, integer_types) and
+                isinstance(last_saved, integer_types) and
+                isinstance(scale, (float,) + integer_types) and
+                0 <= scale <= 1
+            ):
+                entries.append((data, (last_saved, seed, scale)))
+        entries.sort(key=lambda entry: entry[1][0], reverse=True)
+        return entries
+
+    def save_parameter_seed(self, seed, scale=1.0):
+        """Record that the parameter drawn from this seed at this size scale
+        was productive."""
+        self.database.save_data(
+            self.parameters_key, self.format.serialize_basic([
+                seed, int(time.time() * 1000000), scale
+            ]))
+        seen = set()
+        for data, (_, existing_seed, _) in self.parameter_seed_entries():
+            if (
+                existing_seed in seen or
+                len(seen) >= self.max_parameter_seeds
+            ):
+                self.database.delete_data(self.parameters_key, data)
+            seen.add(existing_seed)
+
+    def fetch_parameter_seeds(self):
+        """Return a list of pairs (seed, scale) for the distinct seeds saved
+        with save_parameter_seed, most recently saved first."""
+        seeds = []
+        seen = set()
+        for _, (_, seed, scale) in self.parameter_seed_entries():
+            if seed not in seen:
+                seen.add(seed)
+                seeds.append((seed, scale))
+        return seeds
+
+    def corpus_entries(self):
+        """Return a list of triples (data, last_saved, features) for every
+        valid entry in the corpus, oldest first."""
+        entries = []
+        for data in self.database.fetch_data(self.corpus_key):
+            try:
+                converted, last_saved = self.format.deserialize_data(data)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(last_saved, integer_types):
+                entries.append(
+                    (data, last_saved, structural_features(converted)))
+        entries.sort(key=lambda entry: entry[1])
+        return entries
+
+    def corpus_features(self):
+        """Return the set of structural features of everything in the
+        corpus."""
+        features = set()
+        for _, _, entry_features in self.corpus_entries():
+            features.update(entry_features)
+        return features
+
+    def save_to_corpus(self, value, strategy, max_size):
+        """Add value to the corpus of interesting passing examples if it has
+        structural features which nothing already in there has.
+
+        If this takes the corpus over max_size entries, the entries which
+        contribute the fewest features that no other entry has are evicted,
+        oldest first. Returns True if value was added.
+
+        """
         converted = strategy.to_basic(value)
-        serialized = self.format.serialize_basic(converted)
-        self.backend.save(self.key, serialized)
+        features = structural_features(converted)
+        entries = self.corpus_entries()
+        known = set()
+        for _, _, entry_features in entries:
+            known.update(entry_features)
+        if features.issubset(known):
+            return False
+        data = self.format.serialize_basic([
+            converted, int(time.time() * 1000000)
+        ])
+        self.database.save_data(self.corpus_key, data)
+        entries.append((data, None, features))
+        while len(entries) > max_size:
+            counts = {}
+            for _, _, entry_features in entries:
+                for feature in entry_features:
+                    counts[feature] = counts.get(feature, 0) + 1
+
+            def uniqueness(i):
+                return sum(
+                    1 for feature in entries[i][2] if counts[feature] == 1
+                )
+            victim = min(hrange(len(entries)), key=uniqueness)
+            self.database.delete_data(self.corpus_key, entries[victim][0])
+            del entries[victim]
+        return True
+
+    def fetch_corpus(self, strategy):
+        """Yield every example in the corpus that is valid for strategy,
+        most recently saved first."""
+        for data, _, _ in reversed(self.corpus_entries()):
+            try:
+                converted, _ = self.format.deserialize_data(data)
+                yield strategy.from_basic(converted)
+            except BadData:
+                continue
+
+    def parse_metadata(self, entries):
+        """Return the latest valid (last_failed, failure_count) pair in the
+        data of entries, or (0, 0) if there isn't one."""
+        result = (0, 0)
+        for data in entries:
+            try:
+                last_failed, failure_count = self.format.deserialize_data(data)
+            except (TypeError, ValueError):
+                continue
+            if (
+                isinstance(last_failed, integer_types) and
+                isinstance(failure_count, integer_types)
+            ):
+                result = max(result, (last_failed, failure_count))
+        return result
+
+    def failure_history(self, value, strategy):
+        """Return a pair (last_failed, failure_count) for value, which is
+        (0, 0) if it has never been saved."""
+        return self.parse_metadata(self.database.fetch_data(metadata_key(
+            self.key, self.format.serialize_basic(strategy.to_basic(value))
+        )))
 
     def fetch(self, strategy):
-        for data in self.backend.fetch(self.key):
+        stored = list(self.database.fetch_data(self.key))
+        keys = dict((data, metadata_key(self.key, data)) for data in stored)
+        metadata = self.database.fetch_many_data(set(keys.values()))
+        history = dict(
+            (data, self.parse_metadata(metadata[keys[data]]))
+            for data in stored
+        )
+
+        def replay_order(data):
+            last_failed, failure_count = history[data]
+            return (-last_failed, -failure_count, data_size(data))
+
+        for data in sorted(stored, key=replay_order):
             try:
                 yield strategy.from_basic(
                     self.format.deserialize_data(data))
@@ -79,6 +357,7 @@ class ExampleDatabase(object):
                 'but backend expects data of type %s' % (
                     self.format.data_type(), self.backend.data_type()
                 )))
+        self.prefetched = {}
 
     def storage(self, key):
         """Get a storage object corresponding to this specifier."""
@@ -89,5 +368,75 @@ class ExampleDatabase(object):
             format=self.format,
         )
 
+    def prefetch(self, keys):
+        """Load the data for all of these keys from the backend in bulk, so
+        that storage for any of them can be read without going back to the
+        backend.
+
+        Saves made through this database's storage objects are reflected in
+        the prefetched data, but changes made to the backend by any other
+        means will not be seen for these keys until clear_prefetched is
+        called.
+
+        """
+        keys = list(keys)
+        self.prefetch_data([
+            k
+            for key in keys
+            for k in (
+                key, checkpoint_key(key), parameters_key(key),
+                corpus_key(key),
+            )
+        ])
+        # The metadata for each example is under a key of its own, which we
+        # can only know once we have the examples.
+        self.prefetch_data([
+            metadata_key(key, data)
+            for key in keys
+            for data in self.prefetched.get(key, ())
+        ])
+
+    def prefetch_data(self, keys):
+        keys = [k for k in keys if k not in self.prefetched]
+        if keys:
+            self.prefetched.update(self.backend.fetch_many(keys))
+
+    def fetch_data(self, key):
+        prefetched = self.prefetched.get(key)
+        if prefetched is not None:
+            return list(prefetched)
+        return self.backend.fetch(key)
+
+    def fetch_many_data(self, keys):
+        """Return a dict mapping each of keys to a list of its data, loading
+        all of those which weren't prefetched from the backend at once."""
+        result = {}
+        missing = []
+        for key in keys:
+            prefetched = self.prefetched.get(key)
+            if prefetched is not None:
+                result[key] = list(prefetched)
+            else:
+                missing.append(key)
+        if missing:
+            result.update(self.backend.fetch_many(missing))
+        return result
+
+    def save_data(self, key, data):
+        self.backend.save(key, data)
+        prefetched = self.prefetched.get(key)
+        if prefetched is not None and data not in prefetched:
+            prefetched.append(data)
+
+    def delete_data(self, key, data):
+        self.backend.delete(key, data)
+        prefetched = self.prefetched.get(key)
+        if prefetched is not None and data in prefetched:
+            prefetched.remove(data)
+
+    def clear_prefetched(self):
+        self.prefetched = {}
+
     def close(self):
+        self.prefetched = {}
         self.backend.close()
@@ -17,12 +17,27 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import json
+import socket
 import sqlite3
+import hashlib
+import threading
 from abc import abstractmethod
 from contextlib import contextmanager
 
+from hypothesis.settings import storage_directory
 from hypothesis.internal.compat import text_type
 
+try:
+    from queue import Queue, Empty
+    from http.client import HTTPConnection, HTTPException
+    from urllib.parse import quote, urlparse
+except ImportError:  # pragma: no cover
+    from Queue import Queue, Empty
+    from httplib import HTTPConnection, HTTPException
+    from urllib import quote
+    from urlparse import urlparse
+
 
 class Backend(object):
 
@@ -59,6 +74,24 @@ class Backend(object):
     def fetch(self, key):
         """yield the values matching this key."""
 
+    def fetch_many(self, keys):
+        """Return a dict mapping each of these keys to a list of the values
+        matching it.
+
+        By default this just calls fetch for each key, but backends for
+        which a single bulk lookup is cheaper than many small ones should
+        override it.
+
+        """
+        return dict((key, list(self.fetch(key))) for key in keys)
+
+    def close(self):
+        """Release any resources held by this backend.
+
+        Does nothing by default.
+
+        """
+
 
 class SQLiteBackend(Backend):
 
@@ -127,6 +160,25 @@ class SQLiteBackend(Backend):
             """, (key,))
             return [value for (value,) in cursor]
 
+    # SQLite limits the number of parameters a single statement may have, so
+    # bulk fetches are split into chunks of at most this many keys.
+    max_keys_per_query = 500
+
+    def fetch_many(self, keys):
+        self.create_db_if_needed()
+        keys = list(set(keys))
+        result = dict((key, []) for key in keys)
+        with self.cursor() as cursor:
+            for i in range(0, len(keys), self.max_keys_per_query):
+                chunk = keys[i:i + self.max_keys_per_query]
+                cursor.execute("""
+                    select key, value from hypothesis_data_mapping
+                    where key in (%s)
+                """ % (', '.join('?' * len(chunk)),), chunk)
+                for key, value in cursor:
+                    result[key].append(value)
+        return result
+
     def keys(self):
         """Iterate over all keys in the database."""
         self.create_db_if_needed()
@@ -149,3 +201,357 @@ class SQLiteBackend(Backend):
                 )
             """)
         self.db_created = True
+
+
+class LayeredBackend(Backend):
+
+    """A backend which combines a single writable tier with any number of
+    read-only tiers, e.g. a local database in front of a team-wide one that
+    has been published as a build artifact.
+
+    fetch yields the values for a key from the writable tier followed by each
+    read-only tier in order, each distinct value at most once. save and delete
+    only ever touch the writable tier, so a value that lives in a read-only
+    tier cannot be deleted through this backend.
+
+    Read-only tiers are assumed not to change while in use, so values read from
+    them are cached in memory for the lifetime of the backend.
+
+    """
+
+    def __init__(self, writable, read_only=()):
+        self.writable = writable
+        self.read_only = tuple(read_only)
+        for tier in self.read_only:
+            if tier.data_type() != writable.data_type():
+                raise ValueError((
+                    'Inconsistent data types: read only tier %r provides '
+                    'data of type %s but writable tier %r expects data of '
+                    'type %s') % (
+                        tier, tier.data_type(),
+                        writable, writable.data_type(),
+                ))
+        self.read_only_cache = {}
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (
+            self.__class__.__name__, self.writable, list(self.read_only),
+        )
+
+    def data_type(self):
+        return self.writable.data_type()
+
+    def save(self, key, value):
+        self.writable.save(key, value)
+
+    def delete(self, key, value):
+        self.writable.delete(key, value)
+
+    def read_only_values(self, key):
+        try:
+            return self.read_only_cache[key]
+        except KeyError:
+            pass
+        result = []
+        for tier in self.read_only:
+            result.extend(tier.fetch(key))
+        self.read_only_cache[key] = result
+        return result
+
+    def fetch(self, key):
+        return self.merge(self.writable.fetch(key), self.read_only_values(key))
+
+    def fetch_many(self, keys):
+        keys = list(keys)
+        uncached = [k for k in keys if k not in self.read_only_cache]
+        if uncached:
+            for k in uncached:
+                self.read_only_cache[k] = []
+            for tier in self.read_only:
+                for k, values in tier.fetch_many(uncached).items():
+                    self.read_only_cache[k].extend(values)
+        writable = self.writable.fetch_many(keys)
+        return dict(
+            (k, self.merge(writable.get(k, ()), self.read_only_cache[k]))
+            for k in keys
+        )
+
+    def merge(self, *tiers):
+        seen = set()
+        result = []
+        for values in tiers:
+            for value in values:
+                if value not in seen:
+                    seen.add(value)
+                    result.append(value)
+        return result
+
+    def close(self):
+        self.writable.close()
+        for tier in self.read_only:
+            tier.close()
+
+
+class HTTPBackend(Backend):
+
+    """A backend which talks to a simple key/value HTTP service, such as the
+    one provided by hypothesis.tools.exampleserver.
+
+    The service is expected to support the following requests, all of which
+    have JSON bodies:
+
+        GET /keys/<key>: respond with the list of values for key
+        POST /keys/<key>: save every value in the request's list under key
+        DELETE /keys/<key>: delete every value in the request's list from key
+        POST /fetch: respond with an object mapping every key in the request's
+            list to the list of values for it
+
+    Everything read from the service is kept in an on-disk read cache, which is
+    also used as a fallback when the service cannot be reached. Nothing but
+    fetch_many ever waits on the network: saves and deletes are written to
+    the cache immediately and sent to the service by a background thread,
+    and fetch answers from the cache straight away and has the same thread
+    refresh the key from the service for next time. fetch_many loads all of
+    its keys in a single request, after which fetching any of them is served
+    entirely from the cache.
+
+    """
+
+    def __init__(self, url, cache_path=None, timeout=10):
+        parsed = urlparse(url)
+        if parsed.scheme != 'http' or not parsed.hostname:
+            raise ValueError('Invalid URL %r for HTTPBackend' % (url,))
+        self.url = url
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip('/')
+        self.timeout = timeout
+        if cache_path is None:
+            cache_path = '%s/%s.db' % (
+                storage_directory('http_cache'),
+                hashlib.sha1(url.encode('utf-8')).hexdigest(),
+            )
+        self.cache = SQLiteBackend(cache_path)
+        self.fresh_keys = set()
+        # Saves and deletes which have been queued for each key but not yet
+        # sent, which a refresh from the service must not undo.
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.idle_connections = []
+        self.connections_lock = threading.Lock()
+        self.flush_queue = Queue()
+        self.flush_thread = None
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.url)
+
+    def data_type(self):
+        return text_type
+
+    def acquire_connection(self):
+        with self.connections_lock:
+            if self.idle_connections:
+                return self.idle_connections.pop()
+        return HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def release_connection(self, connection):
+        with self.connections_lock:
+            self.idle_connections.append(connection)
+
+    def request(self, method, path, body):
+        """Make a request with an optional JSON body over a pooled keep-alive
+        connection and return the decoded JSON response.
+
+        A request that fails on a connection from the pool is retried once on
+        a new connection, as the service may have closed it while idle.
+
+        """
+        headers = {}
+        if body is not None:
+            body = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        for attempt in (0, 1):
+            connection = self.acquire_connection()
+            try:
+                connection.request(
+                    method, self.base_path + path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (HTTPException, socket.error):
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            self.release_connection(connection)
+            if response.status != 200:
+                raise HTTPException('%s %s failed with status %d' % (
+                    method, path, response.status
+                ))
+            return json.loads(data.decode('utf-8'))
+
+    def key_path(self, key):
+        return '/keys/' + quote(key.encode('utf-8'), safe=b'')
+
+    def pending_changes(self, key):
+        """Returns a dict mapping each value with a queued save or delete for
+        key to the method of the latest one."""
+        with self.pending_lock:
+            return dict(
+                (value, method) for method, value in self.pending.get(key, ())
+            )
+
+    def update_cache(self, cache, key, values, pending):
+        """Make the values for key in cache match values, apart from any with
+        a change in pending which the service may not have seen yet."""
+        values = set(values)
+        for value, method in pending.items():
+            if method == 'POST':
+                values.add(value)
+            else:
+                values.discard(value)
+        stale = set(cache.fetch(key))
+        for value in values:
+            if value in stale:
+                stale.remove(value)
+            else:
+                cache.save(key, value)
+        for value in stale:
+            cache.delete(key, value)
+        self.fresh_keys.add(key)
+
+    def fetch_many(self, keys):
+        keys = list(keys)
+        stale = [k for k in keys if k not in self.fresh_keys]
+        if stale:
+            # Changes may be sent while the request is in flight, so anything
+            # pending either before or after it might be missing from the
+            # response.
+            pending = dict((key, self.pending_changes(key)) for key in stale)
+            try:
+                result = self.request('POST', '/fetch', stale)
+            except (HTTPException, socket.error, ValueError):
+                pass
+            else:
+                for key in stale:
+                    pending[key].update(self.pending_changes(key))
+                    self.update_cache(
+                        self.cache, key, result.get(key, ()), pending[key])
+        return self.cache.fetch_many(keys)
+
+    def fetch(self, key):
+        if key not in self.fresh_keys:
+            # This is called while running tests, so rather than wait on the
+            # network we answer from the cache and refresh it in the
+            # background.
+            self.fresh_keys.add(key)
+            self.enqueue('GET', key, None)
+        return self.cache.fetch(key)
+
+    def save(self, key, value):
+        self.cache.save(key, value)
+        self.enqueue('POST', key, value)
+
+    def delete(self, key, value):
+        self.cache.delete(key, value)
+        self.enqueue('DELETE', key, value)
+
+    def enqueue(self, method, key, value):
+        if self.flush_thread is None:
+            self.flush_thread = threading.Thread(target=self.run_flushes)
+            self.flush_thread.daemon = True
+            self.flush_thread.start()
+        if method != 'GET':
+            with self.pending_lock:
+                self.pending.setdefault(key, []).append((method, value))
+        self.flush_queue.put((method, key, value))
+
+    def run_flushes(self):
+        # SQLite connections can only be used from the thread that created
+        # them, so refreshes are written to the cache through our own.
+        cache = SQLiteBackend(self.cache.path)
+        try:
+            while True:
+                batch = [self.flush_queue.get()]
+                while True:
+                    try:
+                        batch.append(self.flush_queue.get_nowait())
+                    except Empty:
+                        break
+                try:
+                    finished = self.send_batch(batch, cache)
+                finally:
+                    for _ in batch:
+                        self.flush_queue.task_done()
+                if finished:
+                    return
+        finally:
+            cache.close()
+
+    def send_batch(self, batch, cache):
+        """Send a batch of queued saves and deletes to the service, grouping
+        consecutive ones for the same key into a single request, then carry
+        out any refreshes in it. Returns True if the batch contained the
+        signal to stop flushing.
+
+        Nothing that goes wrong here is allowed to escape, as flush would
+        wait forever on a flush thread that had died.
+
+        """
+        changes = []
+        refreshes = []
+        finished = False
+        for item in batch:
+            if item is None:
+                finished = True
+                continue
+            method, key, value = item
+            if method == 'GET':
+                refreshes.append(key)
+            elif changes and changes[-1][:2] == (method, key):
+                changes[-1][2].append(value)
+            else:
+                changes.append((method, key, [value]))
+        for method, key, values in changes:
+            try:
+                self.request(method, self.key_path(key), values)
+            except Exception:
+                # The values are still in the local cache, so losing them
+                # here is no worse than losing any other cached data.
+                pass
+            with self.pending_lock:
+                pending = self.pending[key]
+                for value in values:
+                    pending.remove((method, value))
+                if not pending:
+                    del self.pending[key]
+        for key in refreshes:
+            try:
+                values = self.request('GET', self.key_path(key), None)
+                # Only this thread sends changes, so everything not yet sent
+                # is still pending now.
+                self.update_cache(
+                    cache, key, values, self.pending_changes(key))
+            except Exception:
+                pass
+        return finished
+
+    def flush(self):
+        """Block until every queued save, delete and refresh has been
+        carried out.
+
+        There is no need to call this before close, which does the same.
+
+        """
+        if self.flush_thread is not None:
+            self.flush_queue.join()
+
+    def close(self):
+        if self.flush_thread is not None:
+            self.flush_queue.put(None)
+            self.flush_thread.join()
+            self.flush_thread = None
+        with self.connections_lock:
+            for connection in self.idle_connections:
+                connection.close()
+            self.idle_connections = []
+        self.cache.close()
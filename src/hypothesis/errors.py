@@ -108,6 +108,12 @@ class Flaky(HypothesisException):
     """
 
 
+class DidNotReproduce(HypothesisException):
+
+    """A test decorated with reproduce_failure did not fail when run on the
+    example it was asked to reproduce."""
+
+
 class Timeout(Unsatisfiable):
 
     """We were unable to find enough examples that satisfied the preconditions
@@ -126,6 +132,13 @@ class BadData(HypothesisException, ValueError):
     we could have put into the database given this schema."""
 
 
+class NotInvertible(HypothesisException, ValueError):
+
+    """A value could not be converted back into a template for a strategy,
+    either because the strategy does not support doing so or because it could
+    not have produced that value."""
+
+
 class InvalidArgument(HypothesisException, TypeError):
 
     """Used to indicate that the arguments to a Hypothesis function were in
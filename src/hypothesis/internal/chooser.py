@@ -23,6 +23,17 @@ from hypothesis.internal.compat import hrange
 
 class chooser(object):
 
+    """Picks indices into weights with probability proportional to their
+    weight.
+
+    This uses Vose's alias method, so each choice costs a single call to
+    random.random() however many weights there are and however skewed they
+    are: The unit interval is cut into len(weights) equally sized columns, each
+    of which is shared between at most two indices, so picking a point in it
+    picks a column and then an index within that column.
+
+    """
+
     def __init__(self, weights):
         weights = list(weights)
         if not weights:
@@ -40,8 +51,31 @@ class chooser(object):
             weights[i] /= normalizer
         self.weights = tuple(weights)
 
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        probabilities = [1.0] * n
+        aliases = list(hrange(n))
+        small = [i for i in hrange(n) if scaled[i] < 1]
+        large = [i for i in hrange(n) if scaled[i] >= 1]
+        while small and large:
+            lo = small.pop()
+            hi = large.pop()
+            probabilities[lo] = scaled[lo]
+            aliases[lo] = hi
+            scaled[hi] -= 1 - scaled[lo]
+            if scaled[hi] < 1:
+                small.append(hi)
+            else:
+                large.append(hi)
+        # Anything left over is only there because of floating point error,
+        # so gets a column to itself.
+        self.probabilities = tuple(probabilities)
+        self.aliases = tuple(aliases)
+
     def choose(self, random):
-        while True:
-            i = random.randint(0, len(self.weights) - 1)
-            if random.random() <= self.weights[i]:
-                return i
+        u = random.random() * len(self.probabilities)
+        i = int(u)
+        if u - i < self.probabilities[i]:
+            return i
+        return self.aliases[i]
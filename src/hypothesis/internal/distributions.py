@@ -31,6 +31,8 @@ def geometric(random, p):
     1 / p - 1
 
     """
+    if p >= 1:
+        return 0
     denom = math.log1p(-p)
     return int(math.log(random.random()) / denom)
 
@@ -56,11 +58,25 @@ def non_empty_subset(random, elements, activation_chance=None):
             desired_expected_value = 2.0
         activation_chance = desired_expected_value / len(elements)
 
-    result = []
-    while not result:
-        result = [
-            x
-            for x in elements
-            if biased_coin(random, activation_chance)
-        ]
+    if activation_chance >= 1:
+        return list(elements)
+
+    # Rather than drawing subsets until we get a non-empty one, we pick the
+    # first element in the subset directly: Conditional on the subset being
+    # non-empty, the index of its first element is a geometric distribution
+    # truncated to len(elements), which we can sample by inverting its CDF.
+    # Everything after that is in the subset independently as usual (we
+    # inline biased_coin there as this is a hot loop).
+    log_miss = math.log1p(-activation_chance)
+    all_miss = math.exp(log_miss * len(elements))
+    first = int(
+        math.log1p(-random.random() * (1 - all_miss)) / log_miss
+    )
+    first = min(first, len(elements) - 1)
+    result = [
+        x
+        for x in elements[first + 1:]
+        if random.random() <= activation_chance
+    ]
+    result.insert(0, elements[first])
     return result
@@ -17,6 +17,9 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+from hypothesis.internal.randomness import FastRandom
+from hypothesis.internal.sizing import size_scale, current_scale
+
 
 class ParameterSource(object):
 
@@ -30,15 +33,29 @@ class ParameterSource(object):
     heuristics and special cases to attempt to drive towards both novelty and
     reliability.
 
+    Every parameter is drawn from a Random seeded with a value drawn from
+    random, which is available as current_seed, at the size scale in effect
+    when it was drawn, which is available as current_scale. Passing
+    previously used (seed, scale) pairs in as seeds will cause the
+    parameters drawn from them to be tried first, in order, before any new
+    ones, each at the scale it was first drawn at.
+
+    Calling mark_good() after an example instead extends the life of the
+    current parameter, and once any parameter has been marked good, half of
+    the time we need a new parameter we go back to one of those instead
+    (again at its original scale).
+
     """
 
     def __init__(
         self,
-        random, strategy, max_tries=None,
+        random, strategy, max_tries=None, seeds=(),
     ):
         self.max_tries = max_tries or 10
         self.random = random
         self.strategy = strategy
+        self.pending_seeds = list(reversed(seeds))
+        self.good_seeds = []
         self.new_parameter()
         self.started = False
         self.mark_set = False
@@ -58,10 +75,34 @@ class ParameterSource(object):
         self.should_switch = True
         self.mark_set = True
 
+    def mark_good(self):
+        """The last example was interesting, e.g. because it ran some code
+        that no previous example did.
+
+        Can we have more of that please?
+
+        """
+        if not self.started:
+            raise ValueError('No parameters have been generated yet')
+        self.count = 0
+        seed = (self.current_seed, self.current_scale)
+        if seed not in self.good_seeds:
+            self.good_seeds.append(seed)
+
     def new_parameter(self):
         self.count = 0
         self.should_switch = False
-        self.current_parameter = self.strategy.draw_parameter(self.random)
+        if self.pending_seeds:
+            self.current_seed, self.current_scale = self.pending_seeds.pop()
+        elif self.good_seeds and self.random.randint(0, 1):
+            self.current_seed, self.current_scale = self.random.choice(
+                self.good_seeds)
+        else:
+            self.current_seed = self.random.getrandbits(64)
+            self.current_scale = current_scale.value
+        with size_scale(self.current_scale):
+            self.current_parameter = self.strategy.draw_parameter(
+                FastRandom(self.current_seed))
         return self.current_parameter
 
     def pick_a_parameter(self):
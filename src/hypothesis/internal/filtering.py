@@ -0,0 +1,349 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Support for turning simple filters into strategies which only generate
+values that can pass them, rather than generating values and throwing most of
+them away.
+
+We recognise lambdas whose body is a comparison of the argument (or its len)
+against a numeric literal, or a test that the argument modulo a literal is
+equal to a literal, or an and of any of these. Strategies which know how to
+restrict themselves then get a chance to do so via SearchStrategy.narrowed.
+
+The filter is always still applied to the values of the narrowed strategy,
+so it's fine for narrowing to be approximate as long as it never rules out
+a value which satisfies the predicate.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import ast
+import math
+import types
+import inspect
+
+from hypothesis.internal.compat import integer_types
+from hypothesis.internal.reflection import args_for_lambda_ast, \
+    extract_lambda_source
+
+OPERATORS = {
+    ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==',
+}
+
+FLIPPED = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '=='}
+
+
+class Constraints(object):
+
+    """The bounds implied by a predicate on the values it accepts and on their
+    lengths, plus optionally a modulus and remainder that integer values must
+    satisfy.
+
+    Bounds are recorded exactly as they appear in the predicate, so a bound
+    may be strict and need not have the same type as the values it bounds.
+
+    """
+
+    def __init__(self):
+        self.value_bounds = [None, None]
+        self.size_bounds = [None, None]
+        self.modulus = None
+        self.remainder = None
+
+    def __repr__(self):
+        return 'Constraints(value=%r, size=%r, modulus=%r, remainder=%r)' % (
+            self.value_bounds, self.size_bounds, self.modulus,
+            self.remainder,
+        )
+
+    def __bool__(self):
+        return (
+            self.value_bounds != [None, None] or
+            self.size_bounds != [None, None] or
+            self.modulus is not None
+        )
+
+    __nonzero__ = __bool__
+
+    def add_comparison(self, bounds, op, value):
+        if op in ('>', '>=', '=='):
+            bounds[0] = tighter(bounds[0], (value, op == '>'), max)
+        if op in ('<', '<=', '=='):
+            bounds[1] = tighter(bounds[1], (value, op == '<'), min)
+
+    def integer_bounds(self):
+        """Returns the tightest inclusive integer bounds (either of which may
+        be None) on values which satisfy these constraints."""
+        return integer_bounds(self.value_bounds)
+
+    def integer_size_bounds(self):
+        """Returns inclusive bounds (either of which may be None) on the
+        lengths of values which satisfy these constraints."""
+        lower, upper = integer_bounds(self.size_bounds)
+        if lower is not None and lower < 0:
+            lower = None
+        return lower, upper
+
+    def float_bounds(self):
+        """Returns inclusive float bounds (either of which may be None) on
+        values which satisfy these constraints.
+
+        Strict bounds are returned as non-strict ones, which is fine
+        because the filter will reject the end points.
+
+        """
+        result = []
+        for bound, zero in zip(self.value_bounds, (-0.0, 0.0)):
+            if bound is None:
+                result.append(None)
+                continue
+            try:
+                value = float(bound[0])
+            except OverflowError:
+                value = math.copysign(float('inf'), bound[0])
+            if math.isinf(value):
+                result.append(None)
+                continue
+            if value == 0:
+                # -0.0 == 0.0, so a bound at zero must allow both of them.
+                value = zero
+            result.append(value)
+        return tuple(result)
+
+
+def tighter(existing, new, pick):
+    if existing is None:
+        return new
+    if existing[0] == new[0]:
+        return (existing[0], existing[1] or new[1])
+    if pick(existing[0], new[0]) == existing[0]:
+        return existing
+    return new
+
+
+def integer_bounds(bounds):
+    lower, upper = bounds
+    result = []
+    if lower is None:
+        result.append(None)
+    else:
+        value, strict = lower
+        if strict:
+            result.append(int(math.floor(value)) + 1)
+        else:
+            result.append(int(math.ceil(value)))
+    if upper is None:
+        result.append(None)
+    else:
+        value, strict = upper
+        if strict:
+            result.append(int(math.ceil(value)) - 1)
+        else:
+            result.append(int(math.floor(value)))
+    return tuple(result)
+
+
+def literal_number(node):
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError):
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, integer_types):
+        return value
+    if isinstance(value, float) and not (
+        math.isnan(value) or math.isinf(value)
+    ):
+        return value
+    return None
+
+
+class ConstraintCollector(object):
+
+    def __init__(self, name, constraints):
+        self.name = name
+        self.constraints = constraints
+
+    def is_argument(self, node):
+        return isinstance(node, ast.Name) and node.id == self.name
+
+    def is_length(self, node):
+        return (
+            isinstance(node, ast.Call) and
+            isinstance(node.func, ast.Name) and node.func.id == 'len' and
+            len(node.args) == 1 and not node.keywords and
+            self.is_argument(node.args[0])
+        )
+
+    def remainder_modulus(self, node):
+        if (
+            isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mod) and
+            self.is_argument(node.left)
+        ):
+            modulus = literal_number(node.right)
+            if isinstance(modulus, integer_types) and modulus > 0:
+                return modulus
+
+    def collect(self, node):
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            # Anything we don't understand in an and just makes our
+            # constraints looser than they could be, which is fine.
+            for value in node.values:
+                self.collect(value)
+        elif isinstance(node, ast.Compare):
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                self.collect_comparison(left, op, right)
+                left = right
+
+    def collect_comparison(self, left, op, right):
+        if type(op) not in OPERATORS:
+            return
+        op = OPERATORS[type(op)]
+        value = literal_number(right)
+        if value is None:
+            value = literal_number(left)
+            if value is None:
+                return
+            left = right
+            op = FLIPPED[op]
+        if self.is_argument(left):
+            self.constraints.add_comparison(
+                self.constraints.value_bounds, op, value)
+        elif self.is_length(left):
+            self.constraints.add_comparison(
+                self.constraints.size_bounds, op, value)
+        elif op == '==' and isinstance(value, integer_types):
+            modulus = self.remainder_modulus(left)
+            if (
+                modulus is not None and 0 <= value < modulus and
+                self.constraints.modulus is None
+            ):
+                self.constraints.modulus = modulus
+                self.constraints.remainder = value
+
+
+def constraints_for(predicate):
+    """Returns a Constraints object describing what we can tell about the
+    values which satisfy predicate just by looking at its source, or None if
+    we can't tell anything."""
+    if not isinstance(predicate, types.FunctionType):
+        return None
+    if predicate.__name__ != '<lambda>':
+        return None
+    try:
+        argspec = inspect.getargspec(predicate)
+    except ValueError:
+        # e.g. keyword only arguments on Python 3
+        return None
+    if (
+        len(argspec.args) != 1 or argspec.varargs or argspec.keywords or
+        argspec.defaults
+    ):
+        return None
+    if predicate.__globals__.get('len', len) is not len:
+        return None
+    try:
+        tree = ast.parse(extract_lambda_source(predicate))
+    except SyntaxError:
+        return None
+    lambda_ast = tree.body[0].value
+    if not isinstance(lambda_ast, ast.Lambda):
+        return None
+    name = args_for_lambda_ast(lambda_ast)[0]
+    constraints = Constraints()
+    ConstraintCollector(name, constraints).collect(lambda_ast.body)
+    if not constraints:
+        return None
+    return constraints
+
+
+def narrow(strategy, predicate):
+    """Returns a strategy which generates every value of strategy that might
+    satisfy predicate, hopefully with fewer values that don't."""
+    constraints = constraints_for(predicate)
+    if constraints is None:
+        return strategy
+    narrowed = strategy.narrowed(constraints)
+    if narrowed is None:
+        return strategy
+    return narrowed
+
+
+def narrowed_integers(constraints, lower=None, upper=None, average_size=None):
+    """Returns a strategy for integers between lower and upper (either of
+    which may be None for no bound) which satisfy constraints, or None if
+    there are no such integers.
+
+    If average_size is not None it is kept for a result with a lower bound
+    but no upper one, as it would be for integers(min_value=lower).
+
+    """
+    from hypothesis.strategies import integers
+    from hypothesis.searchstrategy.numbers import IntegersFromStrategy
+
+    def integers_between(lower, upper, average_size):
+        if (
+            average_size is not None and lower is not None and
+            upper is None
+        ):
+            return IntegersFromStrategy(lower, average_size=average_size)
+        return integers(min_value=lower, max_value=upper)
+    low, high = constraints.integer_bounds()
+    if low is not None:
+        lower = low if lower is None else max(lower, low)
+    if high is not None:
+        upper = high if upper is None else min(upper, high)
+    if lower is not None and upper is not None and lower > upper:
+        return None
+    modulus = constraints.modulus
+    if modulus is None:
+        return integers_between(lower, upper, average_size)
+    remainder = constraints.remainder
+    if lower is not None:
+        lower = -((remainder - lower) // modulus)
+    if upper is not None:
+        upper = (upper - remainder) // modulus
+    if lower is not None and upper is not None and lower > upper:
+        return None
+    if average_size is not None:
+        # Multiples of modulus are that much bigger than what we draw.
+        average_size /= modulus
+    return integers_between(lower, upper, average_size).map(
+        lambda x: x * modulus + remainder
+    )
+
+
+def narrowed_floats(constraints, lower=None, upper=None):
+    """Returns a strategy for floats between lower and upper (either of which
+    may be None for no bound) which satisfy constraints, or None if there are
+    no such floats or constraints say nothing about them."""
+    from hypothesis.strategies import floats
+    low, high = constraints.float_bounds()
+    if low is None and high is None:
+        return None
+    if low is not None:
+        lower = low if lower is None else max(lower, low)
+    if high is not None:
+        upper = high if upper is None else min(upper, high)
+    if lower is not None and upper is not None and lower >= upper:
+        # floats can't generate both zeroes if asked for a single value.
+        if lower > upper or lower == 0:
+            return None
+    return floats(min_value=lower, max_value=upper)
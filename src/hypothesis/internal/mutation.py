@@ -0,0 +1,154 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Small perturbations of basic data, used to generate variants of examples
+we already know about.
+
+Unlike the functions in hypothesis.strategytests, which are designed to
+produce invalid data, these try to produce something which is still valid
+for the strategy the data came from: Every mutation preserves the type of
+the value it is applied to, so the result will usually survive from_basic.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from hypothesis.internal.compat import hrange, hunichr, text_type, \
+    integer_types
+from hypothesis.utils.extmethod import ExtMethod
+
+# Basic data may only contain integers which fit in 64 bits, so we never
+# mutate an integer to something outside this range.
+MAX_BASIC_INT = 2 ** 63 - 1
+MIN_BASIC_INT = -(2 ** 63)
+
+mutate_value = ExtMethod()
+
+
+def mutate_basic(basic, random, max_mutations=3):
+    """Apply between one and max_mutations random type preserving
+    mutations to basic and return the result. basic is not modified.
+
+    Each mutation is applied to a node chosen uniformly from anywhere in
+    the data, so that deeply nested values (e.g. the characters of a string
+    inside the arguments to a test) are as likely to change as the fixed
+    shape containers around them.
+
+    """
+    for _ in hrange(random.randint(1, max_mutations)):
+        basic = mutate_node(basic, random.randint(0, count_nodes(basic) - 1),
+                            random)
+    return basic
+
+
+def count_nodes(basic):
+    if isinstance(basic, list):
+        return 1 + sum(count_nodes(child) for child in basic)
+    return 1
+
+
+def mutate_node(basic, index, random):
+    """Return a copy of basic with the node at position index in a pre-order
+    traversal replaced by a mutation of it."""
+    if index == 0:
+        return mutate_value(basic, random)
+    index -= 1
+    result = list(basic)
+    for i, child in enumerate(result):
+        size = count_nodes(child)
+        if index < size:
+            result[i] = mutate_node(child, index, random)
+            break
+        index -= size
+    return result
+
+
+@mutate_value.extend(object)
+def mutate_anything(value, random):
+    return value
+
+
+@mutate_value.extend(bool)
+def mutate_bool(value, random):
+    return not value
+
+
+def mutate_int(value, random):
+    s = random.randint(0, 6)
+    if s == 0:
+        result = -value
+    elif s == 1:
+        result = value + random.choice((-1, 1))
+    elif s == 2:
+        result = value * 2
+    elif s == 3:
+        result = value // 2
+    elif s == 4:
+        result = 0
+    elif s == 5:
+        result = value + random.randint(-16, 16)
+    else:
+        result = value + random.randint(-256, 256)
+    if MIN_BASIC_INT <= result <= MAX_BASIC_INT:
+        return result
+    return value
+
+for t in integer_types:
+    mutate_value.extend(t)(mutate_int)
+
+
+@mutate_value.extend(text_type)
+def mutate_text(value, random):
+    characters = list(value)
+    s = random.randint(0, 3)
+    if not characters or s == 0:
+        i = random.randint(0, len(characters))
+        if characters and random.randint(0, 1):
+            c = random.choice(characters)
+        else:
+            c = random.choice('0aA \n\x00é☃')
+        characters.insert(i, c)
+    else:
+        i = random.randint(0, len(characters) - 1)
+        if s == 1:
+            del characters[i]
+        elif s == 2:
+            characters[i] = mutate_character(characters[i], random)
+        else:
+            characters.insert(i, characters[i])
+    return ''.join(characters)
+
+
+def mutate_character(c, random):
+    return hunichr(ord(c) ^ (1 << random.randint(0, 7)))
+
+
+@mutate_value.extend(list)
+def mutate_list(value, random):
+    value = list(value)
+    if not value:
+        return value
+    i = random.randint(0, len(value) - 1)
+    s = random.randint(0, 2)
+    if s == 0:
+        del value[i]
+    elif s == 1:
+        value.insert(i, value[i])
+    else:
+        j = random.randint(0, len(value) - 1)
+        value[i], value[j] = value[j], value[i]
+    return value
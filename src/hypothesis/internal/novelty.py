@@ -0,0 +1,71 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""A cheap measure of how structurally different pieces of basic data are,
+used to decide which passing examples are interesting enough to keep.
+
+The features of some basic data are a set of small tuples describing, for
+each node in it, how deep it is, what type it is and roughly how big it is.
+Two examples with the same features look much the same to us, and an
+example with a feature that nothing we have seen so far has is novel.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import math
+
+from hypothesis.internal.compat import text_type, integer_types
+
+
+def structural_features(basic):
+    """Return the set of features of this basic data."""
+    features = set()
+    stack = [(0, basic)]
+    while stack:
+        depth, value = stack.pop()
+        features.add((depth,) + describe(value))
+        if isinstance(value, list):
+            for child in value:
+                stack.append((depth + 1, child))
+    return features
+
+
+def magnitude(n):
+    """Bucket a number by the number of binary digits in its integer part,
+    ignoring its sign."""
+    n = abs(int(n))
+    if not n:
+        return 0
+    # This is n.bit_length(), which Python 2.6 doesn't have.
+    return len(bin(n)) - 2
+
+
+def describe(value):
+    if value is None:
+        return ('none',)
+    if isinstance(value, bool):
+        return ('bool', value)
+    if isinstance(value, integer_types):
+        return ('int', value < 0, magnitude(value))
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return ('float', repr(value))
+        return ('float', value < 0, magnitude(value))
+    if isinstance(value, (list, text_type)):
+        return (type(value).__name__, magnitude(len(value)))
+    return (type(value).__name__,)
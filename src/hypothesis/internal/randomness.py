@@ -0,0 +1,360 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Cheaper sources of randomness for the generation hot path.
+
+Generating an example makes a very large number of small requests for
+randomness. The ones that go straight to the Mersenne Twister in C
+(random.random(), random.getrandbits()) are about as cheap as a Python call
+can be, but random.randint, random.choice and friends go through several
+layers of Python on top of that, which costs several times as much.
+
+We also make a lot of Randoms from seeds that we store in templates, and
+seeding a Mersenne Twister costs more than many of the draws we then make
+from it, so for those there is a generator which is nearly free to create.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import os
+import binascii
+from bisect import bisect
+from random import Random
+
+from hypothesis.internal.compat import hrange, text_type, integer_types
+
+# Up to this many possible values we pick one with int(random() * n). That
+# isn't exactly uniform: random() has 2 ** 53 equally likely results, which
+# can't be shared out evenly between n values, so each value's probability is
+# off by up to n / 2 ** 53 of itself, which is at most one part in two
+# million here. Above this the bias grows quickly (and past 2 ** 53 some
+# values become impossible), so we rejection sample from getrandbits instead.
+MAX_FLOAT_RANGE = 2 ** 32
+
+
+def randbelow(random, n):
+    """Returns an integer drawn uniformly from 0 <= x < n, for n >= 1.
+
+    This draws just enough bits to cover n and tries again if the result is
+    too big, which happens less than half the time.
+
+    """
+    # This is (n - 1).bit_length(), which Python 2.6 doesn't have.
+    k = len(bin(n - 1)) - 2
+    getrandbits = random.getrandbits
+    result = getrandbits(k)
+    while result >= n:
+        result = getrandbits(k)
+    return result
+
+
+class FastRandom(Random):
+
+    """A Random which serves randint and choice calls with a single call to
+    random() where that's close enough to uniform, and by rejection sampling
+    from getrandbits() otherwise, rather than going through randrange.
+
+    It produces a different sequence of values from Random for the same
+    seed, but it is always the same sequence for the same seed (on both
+    Python 2 and 3, unlike Random), so anything seeded from a derandomized or
+    saved seed stays reproducible.
+
+    """
+
+    def randint(self, a, b):
+        n = b - a + 1
+        if 0 < n <= MAX_FLOAT_RANGE:
+            return a + int(self.random() * n)
+        if n > 0:
+            return a + randbelow(self, n)
+        return Random.randint(self, a, b)
+
+    def choice(self, seq):
+        n = len(seq)
+        if 0 < n <= MAX_FLOAT_RANGE:
+            return seq[int(self.random() * n)]
+        if n > 0:
+            return seq[randbelow(self, n)]
+        return Random.choice(self, seq)
+
+
+MASK64 = (1 << 64) - 1
+
+
+def _new_seeds_random():
+    try:
+        return Random.__new__(Random, 1).random() == Random(1).random()
+    except TypeError:  # pragma: no cover
+        return False
+
+# On some Pythons Random.__new__ seeds the generator and then __init__ seeds
+# it all over again, so we can halve the cost of creating a seeded Random by
+# skipping __init__ (which does nothing else but set gauss_next).
+if _new_seeds_random():
+    def seeded_twister(seed):
+        result = Random.__new__(Random, seed)
+        result.gauss_next = None
+        return result
+else:  # pragma: no cover
+    seeded_twister = Random
+
+
+def seed_to_int(seed):
+    if seed is None:
+        return int(binascii.hexlify(os.urandom(8)), 16)
+    if isinstance(seed, text_type):
+        seed = seed.encode('utf-8')
+    if isinstance(seed, bytes):
+        return int(binascii.hexlify(seed), 16) if seed else 0
+    if isinstance(seed, integer_types):
+        return abs(seed)
+    return abs(hash(seed))
+
+
+def splitmix64(state):
+    """Returns the output of the SplitMix64 generator for state, which is a
+    64-bit integer that should be advanced by SPLITMIX_GAMMA between
+    calls."""
+    x = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+SPLITMIX_GAMMA = 0x9E3779B97F4A7C15
+
+# Seeding a twister costs about as much as six draws straight from the
+# SplitMix64 state (which have to be computed in Python), so a SplitRandom
+# makes this many draws itself before it pays for one. That way the many
+# SplitRandoms which only get asked for a handful of values never seed
+# anything, and the few which get asked for a lot cost at most about twice
+# what they would with the best choice made up front.
+DIRECT_DRAWS = 8
+
+
+class SplitRandom(object):
+
+    """A replacement for Random(seed) which is almost free to create.
+
+    Seeding a Mersenne Twister is expensive, and we create Randoms from
+    seeds in a lot of places where we then draw few values from them or
+    none at all. A SplitRandom just remembers a 64-bit SplitMix64 state and
+    computes its first few values of random(), getrandbits() and randint()
+    directly from that. Only if it keeps getting asked for values does it
+    seed a twister from its state (once, rather than the twice Random(seed)
+    does on some Pythons) and hand the rest of its draws over to that.
+
+    Calling split() returns an independent SplitRandom derived from this
+    one without seeding anything, so trees of generators are cheap too.
+
+    It isn't a subclass of Random, as creating one of those always seeds a
+    twister, but it supports the same methods. The values it produces for a
+    given seed are different from Random's but are always the same.
+
+    """
+
+    def __init__(self, seed=None):
+        if isinstance(seed, integer_types) and 0 <= seed <= MASK64:
+            # The common case, which we make as cheap as possible.
+            self.initial_seed = seed
+            self.state = seed
+            self.draws_left = DIRECT_DRAWS
+            self.twister = None
+            self.gauss_next = None
+        else:
+            self.seed(seed)
+
+    def __repr__(self):
+        return 'SplitRandom(%r)' % (self.initial_seed,)
+
+    def seed(self, seed=None):
+        self.initial_seed = seed
+        value = seed_to_int(seed)
+        state = 0
+        while value:
+            state ^= value & MASK64
+            value >>= 64
+        self.state = state
+        self.draws_left = DIRECT_DRAWS
+        self.twister = None
+        self.gauss_next = None
+        self.__dict__.pop('random', None)
+        self.__dict__.pop('getrandbits', None)
+
+    def getstate(self):
+        return (
+            self.state, self.draws_left,
+            self.twister.getstate() if self.twister is not None else None,
+            self.gauss_next,
+        )
+
+    def setstate(self, state):
+        self.seed(0)
+        self.state, self.draws_left, twister_state, self.gauss_next = state
+        if twister_state is not None:
+            twister = Random()
+            twister.setstate(twister_state)
+            self.use_twister(twister)
+
+    def __getstate__(self):
+        return (self.initial_seed, self.getstate())
+
+    def __setstate__(self, state):
+        self.seed(state[0])
+        self.setstate(state[1])
+
+    def next64(self):
+        # This is splitmix64 inlined, as it's called for nearly every value.
+        self.state = x = (self.state + SPLITMIX_GAMMA) & MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+        return x ^ (x >> 31)
+
+    def split(self):
+        """Returns a new SplitRandom seeded from this one."""
+        if self.twister is not None:
+            return SplitRandom(self.getrandbits(64))
+        return SplitRandom(self.next64())
+
+    def use_twister(self, twister):
+        self.twister = twister
+        # Binding these directly means that from now on calls to them go
+        # straight to C.
+        self.random = twister.random
+        self.getrandbits = twister.getrandbits
+
+    def random(self):
+        if not self.draws_left:
+            self.use_twister(seeded_twister(self.next64()))
+            return self.random()
+        self.draws_left -= 1
+        # The top 53 bits, which is all a double can hold.
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k):
+        if not self.draws_left:
+            self.use_twister(seeded_twister(self.next64()))
+            return self.getrandbits(k)
+        if k <= 0:
+            raise ValueError('number of bits must be greater than zero')
+        self.draws_left -= 1
+        result = self.next64()
+        bits = 64
+        while bits < k:
+            result = (result << 64) | self.next64()
+            bits += 64
+        return result >> (bits - k)
+
+    def randint(self, a, b):
+        n = b - a + 1
+        if 0 < n <= MAX_FLOAT_RANGE:
+            return a + int(self.random() * n)
+        if n > 0:
+            return a + randbelow(self, n)
+        return self.randrange(a, b + 1)
+
+    def choice(self, seq):
+        n = len(seq)
+        if not n:
+            raise IndexError('Cannot choose from an empty sequence')
+        if n <= MAX_FLOAT_RANGE:
+            return seq[int(self.random() * n)]
+        return seq[randbelow(self, n)]
+
+    def choices(self, population, weights=None, cum_weights=None, k=1):
+        # Random only has this from Python 3.6, where we use its version
+        # instead, but code written for that shouldn't break on older ones.
+        if cum_weights is None:
+            if weights is None:
+                return [self.choice(population) for _ in hrange(k)]
+            cum_weights = []
+            total = 0
+            for w in weights:
+                total += w
+                cum_weights.append(total)
+        elif weights is not None:
+            raise TypeError(
+                'Cannot specify both weights and cumulative weights')
+        if len(cum_weights) != len(population):
+            raise ValueError(
+                'The number of weights does not match the population')
+        total = cum_weights[-1]
+        return [
+            population[bisect(cum_weights, self.random() * total)]
+            for _ in hrange(k)
+        ]
+
+    def jumpahead(self, n):
+        """Change the state to one far away from the current one, as
+        Random.jumpahead does on Python 2."""
+        self.state = splitmix64((self.state ^ seed_to_int(n)) & MASK64)
+        self.draws_left = DIRECT_DRAWS
+        if self.twister is not None:
+            self.use_twister(seeded_twister(self.next64()))
+
+
+# Everything else Random does is written in Python in terms of random() and
+# getrandbits(), so we can just borrow it.
+for name in (
+    'randrange', 'shuffle', 'sample', 'choices', 'uniform', 'triangular',
+    'normalvariate', 'lognormvariate', 'expovariate', 'vonmisesvariate',
+    'gammavariate', 'gauss', 'betavariate', 'paretovariate', 'weibullvariate',
+    '_randbelow', '_randbelow_with_getrandbits',
+    '_randbelow_without_getrandbits',
+):
+    if name in vars(Random):
+        setattr(SplitRandom, name, vars(Random)[name])
+del name
+
+
+def example_seed(run_seed, index):
+    """Returns the seed for the index'th example of the run with run_seed.
+
+    This is the index'th output of a SplitMix64 generator seeded with
+    run_seed, which we can jump straight to, so the randomness for any one
+    example of a run doesn't depend on the examples before it. The example
+    also depends on the parameter it was drawn with, which this doesn't
+    determine.
+
+    """
+    return splitmix64((run_seed + (index + 1) * SPLITMIX_GAMMA) & MASK64)
+
+
+def random_for_example(run_seed, index):
+    """Returns a random to draw the index'th example of the run with run_seed
+    from.
+
+    We make one of these for every example, so it must be cheap: it's a
+    SplitRandom, so unless the example needs a lot of values it never seeds
+    a twister at all.
+
+    """
+    return SplitRandom(example_seed(run_seed, index))
+
+
+def randints(random, a, b, n):
+    """Returns a list of n integers drawn uniformly from a <= x <= b."""
+    span = b - a + 1
+    if span > MAX_FLOAT_RANGE:
+        return [a + randbelow(random, span) for _ in hrange(n)]
+    draw = random.random
+    return [a + int(draw() * span) for _ in hrange(n)]
+
+
+def randbits(random, k, n):
+    """Returns a list of n k-bit integers."""
+    draw = random.getrandbits
+    return [draw(k) for _ in hrange(n)]
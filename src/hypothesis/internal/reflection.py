@@ -27,6 +27,7 @@ import sys
 import types
 import hashlib
 import inspect
+import __future__
 from functools import wraps
 
 from hypothesis.settings import storage_directory
@@ -191,6 +192,33 @@ def find_offset(string, line, column):
     return current_line_offset + column
 
 
+FUTURE_FLAGS = 0
+for _feature in __future__.all_feature_names:
+    FUTURE_FLAGS |= getattr(__future__, _feature).compiler_flag
+
+
+def compiles_to_same_code(lambda_ast, code):
+    """Check whether compiling lambda_ast on its own would give exactly code.
+    This is used to tell apart several lambdas with the same arguments in the
+    same bit of source, so it's OK for it to be wrong when the lambda closes
+    over local variables (which compile differently here)."""
+    try:
+        compiled = compile(
+            ast.Expression(lambda_ast), '<lambda>', 'eval',
+            code.co_flags & FUTURE_FLAGS, True
+        )
+    except (SyntaxError, TypeError, ValueError):
+        return False
+    for const in compiled.co_consts:
+        if isinstance(const, types.CodeType):
+            return (
+                const.co_code == code.co_code and
+                const.co_names == code.co_names and
+                const.co_consts == code.co_consts
+            )
+    return False
+
+
 WHITESPACE = re.compile(r"\s+")
 PROBABLY_A_COMMENT = re.compile("""#[^'"]*$""")
 
@@ -227,6 +255,11 @@ def extract_lambda_source(f):
         l for l in all_lambdas
         if args_for_lambda_ast(l) == args
     ]
+    if len(aligned_lambdas) > 1:
+        aligned_lambdas = [
+            l for l in aligned_lambdas
+            if compiles_to_same_code(l, f.__code__)
+        ]
     if len(aligned_lambdas) != 1:
         return if_confused
     lambda_ast = aligned_lambdas[0]
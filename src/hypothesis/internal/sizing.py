@@ -0,0 +1,103 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Controls on how large the examples we draw get.
+
+Collections pick their sizes independently of each other, so nesting them
+multiplies their sizes: lists(lists(lists(integers()))) can easily produce
+millions of integers. To stop that, while the engine draws an example it sets
+up a SizeBudget shared by everything drawn for that example, and collections
+ask it for permission before adding each element. Once the budget is spent
+they only produce as many elements as they must.
+
+Separately, simple bugs usually show up on small examples, so there's no point
+paying for big ones until we've tried plenty of small ones. The engine sets a
+size scale between 0 and 1 which grows over the course of a run, and
+strategies multiply the size related parts of their parameters by it.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from hypothesis.utils.dynamicvariables import DynamicVariable
+
+
+class SizeBudget(object):
+
+    """A number of elements which may still be added to collections in the
+    example currently being drawn."""
+
+    def __init__(self, remaining):
+        self.remaining = remaining
+
+    def __repr__(self):
+        return 'SizeBudget(%r)' % (self.remaining,)
+
+    def claim(self, wanted, minimum=0):
+        """Ask for wanted elements, of which at least minimum are required.
+
+        Returns the number granted, which is wanted if there's enough
+        budget left and otherwise as many as are left (but never less than
+        minimum).
+
+        """
+        granted = max(minimum, min(wanted, self.remaining))
+        self.remaining -= granted
+        return granted
+
+
+current_budget = DynamicVariable(None)
+
+
+def size_budget(size):
+    """A context manager in which everything drawn shares a budget of size
+    elements. If size is None there is no limit."""
+    if size is None:
+        return current_budget.with_value(None)
+    return current_budget.with_value(SizeBudget(size))
+
+
+def claim_size(wanted, minimum=0):
+    """Returns how many of wanted elements a collection may draw, given that
+    it needs at least minimum of them."""
+    budget = current_budget.value
+    if budget is None:
+        return wanted
+    return budget.claim(wanted, minimum)
+
+
+current_scale = DynamicVariable(1.0)
+
+
+def size_scale(scale):
+    """A context manager in which parameters are drawn scaled down by scale,
+    which should be between 0 and 1."""
+    return current_scale.with_value(scale)
+
+
+def scaled(size):
+    """Returns size scaled down for the current point in the run."""
+    return size * current_scale.value
+
+
+def scale_for(example_number, ramp_length):
+    """The scale at which to draw the example_number'th example (counting
+    from 1) of a run which grows to full size over its first ramp_length
+    examples."""
+    if ramp_length <= 0:
+        return 1.0
+    return min(1.0, example_number / ramp_length)
@@ -0,0 +1,111 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Lightweight branch coverage for guiding example generation towards code
+that has not been run yet."""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import os
+import sys
+
+import hypothesis
+from hypothesis.internal.reflection import eval_directory
+
+
+def ignored_directories():
+    directories = [os.path.dirname(os.path.abspath(hypothesis.__file__))]
+    # Where we put the source we generate and import at runtime.
+    directories.append(os.path.abspath(eval_directory()))
+    for path in standard_library_paths():
+        if path:
+            directories.append(os.path.abspath(path))
+    return tuple(directory + os.sep for directory in directories)
+
+
+def standard_library_paths():
+    try:
+        import sysconfig
+    except ImportError:  # pragma: no cover
+        # Python 2.6 only has the distutils version.
+        from distutils import sysconfig
+        return [
+            sysconfig.get_python_lib(standard_lib=True),
+            sysconfig.get_python_lib(standard_lib=True, plat_specific=True),
+        ]
+    return [sysconfig.get_path('stdlib'), sysconfig.get_path('platstdlib')]
+
+
+class BranchCollector(object):
+
+    """A context manager which records the branches taken in any code that
+    runs in the current thread while it is active, as a set of triples
+    (filename, previous line, line) in self.branches. Code in Hypothesis
+    itself, in the standard library and compiled at runtime is not
+    traced.
+
+    This uses sys.settrace, so it replaces any other tracer (e.g. coverage or
+    a debugger) while it is active, and it will slow down the code it
+    traces considerably.
+
+    """
+
+    def __init__(self):
+        self.branches = set()
+        self.ignored = ignored_directories()
+        self.traced_files = {}
+        self.previous_tracer = None
+
+    def should_trace(self, filename):
+        try:
+            return self.traced_files[filename]
+        except KeyError:
+            # Names like <string> are for code compiled at runtime, which is
+            # almost always ours rather than the code under test.
+            result = not (
+                filename.startswith('<') or
+                os.path.abspath(filename).startswith(self.ignored)
+            )
+            self.traced_files[filename] = result
+            return result
+
+    def __enter__(self):
+        self.branches = set()
+        self.previous_tracer = sys.gettrace()
+        sys.settrace(self.trace_calls)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        sys.settrace(self.previous_tracer)
+        self.previous_tracer = None
+
+    def trace_calls(self, frame, event, arg):
+        if event != 'call':
+            return None
+        filename = frame.f_code.co_filename
+        if not self.should_trace(filename):
+            return None
+        branches = self.branches
+        previous = [-frame.f_code.co_firstlineno]
+
+        def trace_lines(frame, event, arg):
+            if event == 'line':
+                line = frame.f_lineno
+                branches.add((filename, previous[0], line))
+                previous[0] = line
+            return trace_lines
+        return trace_lines
@@ -17,11 +17,15 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import struct
 import hashlib
 import collections
+from decimal import Decimal
+from fractions import Fraction
 
 import marshal
-from hypothesis.internal.compat import text_type, binary_type
+from hypothesis.internal.compat import text_type, binary_type, \
+    integer_types
 
 
 def flatten(o):
@@ -74,3 +78,98 @@ class Tracker(object):
         else:
             self.contents.add(k)
             return 1
+
+
+SCALAR_TYPES = (type(None), bool, float, complex, text_type, binary_type) + \
+    integer_types
+
+
+def value_tracking_key(value):
+    """Returns a key such that two values with the same key are equal, of the
+    same types all the way down, and will behave identically when passed to a
+    test, or None if value contains anything we can't be sure of that for
+    (e.g. arbitrary objects, which may have identity or hidden state)."""
+    flattened = []
+    try:
+        flatten_value(value, flattened)
+    except ValueError:
+        return None
+    return object_to_tracking_key(flattened)
+
+
+def flatten_value(value, result):
+    t = type(value)
+    if t in SCALAR_TYPES:
+        result.append(t.__name__)
+        if t is float:
+            # So that we can tell 0.0 and -0.0 apart and nan is equal to nan.
+            result.append(float_to_bytes(value))
+        elif t is complex:
+            result.append(float_to_bytes(value.real))
+            result.append(float_to_bytes(value.imag))
+        else:
+            result.append(value)
+    elif t in (Decimal, Fraction):
+        result.append(t.__name__)
+        result.append(text_type(value))
+    elif t in (list, tuple) or (
+        isinstance(value, tuple) and hasattr(value, '_fields')
+    ):
+        result.append(t.__name__)
+        result.append(len(value))
+        for x in value:
+            flatten_value(x, result)
+    elif t in (dict, set, frozenset):
+        # Iteration order is arbitrary, so we sort the keys of the elements
+        # instead of the elements themselves.
+        if t is dict:
+            items = [(k, v) for k, v in value.items()]
+        else:
+            items = list(value)
+        result.append(t.__name__)
+        result.append(len(value))
+        result.extend(sorted(
+            object_to_tracking_key(flatten_value(x, []))
+            for x in items
+        ))
+    else:
+        raise ValueError('Cannot track %r' % (value,))
+    return result
+
+
+def float_to_bytes(x):
+    return struct.pack(b'!d', x)
+
+
+class ValueTracker(Tracker):
+
+    """A Tracker for templates which also treats a template as a duplicate if
+    it reifies to a value which some earlier template reified to.
+
+    values is a function which takes a template and returns the value to
+    compare. Values which value_tracking_key can't handle are never
+    considered duplicates.
+
+    """
+
+    def __init__(self, values):
+        super(ValueTracker, self).__init__()
+        self.values = values
+        self.value_keys = set()
+
+    def track(self, x):
+        result = super(ValueTracker, self).track(x)
+        if result > 1:
+            return result
+        try:
+            key = value_tracking_key(self.values(x))
+        except Exception:
+            # If producing the value fails then we leave it to running the
+            # test to find that out and report it properly.
+            return result
+        if key is None:
+            return result
+        if key in self.value_keys:
+            return 2
+        self.value_keys.add(key)
+        return result
@@ -19,11 +19,11 @@ from __future__ import division, print_function, absolute_import, \
 
 import hashlib
 from copy import deepcopy
-from random import Random
 from weakref import WeakKeyDictionary
 
 from hypothesis.settings import Settings
-from hypothesis.internal.compat import hrange, integer_types
+from hypothesis.internal.compat import integer_types
+from hypothesis.internal.randomness import randbits, seeded_twister
 
 from .strategies import SearchStrategy, strategy, check_length, \
     check_data_type
@@ -201,10 +201,7 @@ class BasicSearchStrategy(SearchStrategy):
             up = random.getrandbits(64)
         else:
             up = 0
-        template_choices = tuple(
-            random.getrandbits(64)
-            for _ in hrange(10)
-        )
+        template_choices = tuple(randbits(random, 64, 10))
         return (up, template_choices)
 
     def draw_template(self, random, parameter):
@@ -222,7 +219,7 @@ class BasicSearchStrategy(SearchStrategy):
         random_seed = random.getrandbits(64)
         reified = self.reify(template)
         for i, simpler in enumerate(
-            self.user_simplify(Random(random_seed), reified)
+            self.user_simplify(seeded_twister(random_seed), reified)
         ):
             new_template = Simplified(
                 source=template, seed=random_seed, iteration=i
@@ -241,14 +238,14 @@ class BasicSearchStrategy(SearchStrategy):
                 parameter = None
             else:
                 parameter = self.user_parameter(
-                    Random(template.parameter_seed))
+                    seeded_twister(template.parameter_seed))
             result = self.user_generate(
-                Random(template.template_seed), parameter)
+                seeded_twister(template.template_seed), parameter)
         else:
             assert isinstance(template, Simplified)
             result = self.reify(template.source)
             for i, value in enumerate(  # pragma: no branch
-                self.user_simplify(Random(template.seed), result)
+                self.user_simplify(seeded_twister(template.seed), result)
             ):
                 if i == template.iteration:
                     result = value
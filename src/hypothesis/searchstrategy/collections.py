@@ -18,6 +18,7 @@ from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
 from random import Random
+from itertools import product, combinations
 from collections import namedtuple
 
 import hypothesis.internal.distributions as dist
@@ -25,9 +26,11 @@ from hypothesis.settings import Settings
 from hypothesis.utils.show import show
 from hypothesis.utils.size import clamp
 from hypothesis.internal.compat import hrange
+from hypothesis.internal.sizing import scaled, claim_size
 from hypothesis.searchstrategy.strategies import EFFECTIVELY_INFINITE, \
-    BadData, SearchStrategy, MappedSearchStrategy, check_type, \
-    infinitish, check_length, check_data_type, one_of_strategies
+    BadData, NotInvertible, SearchStrategy, MappedSearchStrategy, \
+    check_type, infinitish, check_length, checked_type, \
+    check_data_type, checked_elements, one_of_strategies
 
 try:
     from collections import OrderedDict
@@ -96,6 +99,38 @@ class TupleStrategy(SearchStrategy):
             for g, v in zip(es, pv)
         ])
 
+    def draw_value(self, random, pv):
+        es = self.element_strategies
+        return self.newtuple([
+            g.draw_value(random, v)
+            for g, v in zip(es, pv)
+        ])
+
+    def newtuple_source(self, plan, elements):
+        if self.tuple_type == tuple:
+            if len(elements) == 1:
+                return '(%s,)' % tuple(elements)
+            return '(%s)' % (', '.join(elements),)
+        return plan.call(self.tuple_type, *elements)
+
+    def draw_template_source(self, plan, random, parameter):
+        return self.newtuple_source(plan, [
+            plan.draw_template(e, random, '%s[%d]' % (parameter, i))
+            for i, e in enumerate(self.element_strategies)
+        ])
+
+    def draw_value_source(self, plan, random, parameter):
+        return self.newtuple_source(plan, [
+            plan.draw_value(e, random, '%s[%d]' % (parameter, i))
+            for i, e in enumerate(self.element_strategies)
+        ])
+
+    def reify_source(self, plan, template):
+        return self.newtuple_source(plan, [
+            plan.reify(e, '%s[%d]' % (template, i))
+            for i, e in enumerate(self.element_strategies)
+        ])
+
     def strictly_simpler(self, x, y):
         for i, (u, v) in enumerate(zip(x, y)):
             s = self.element_strategies[i]
@@ -138,6 +173,42 @@ class TupleStrategy(SearchStrategy):
             for f, v in zip(self.element_strategies, value)
         )
 
+    def to_basic_source(self, plan, template):
+        return '[%s]' % (', '.join(
+            plan.to_basic(e, '%s[%d]' % (template, i))
+            for i, e in enumerate(self.element_strategies)
+        ),)
+
+    def from_basic_source(self, plan, data):
+        # We need the checked data in several places, so we bind it to a
+        # name with a single element comprehension.
+        elements = plan.local()
+        return '[%s for %s in [%s]][0]' % (
+            self.newtuple_source(plan, [
+                plan.from_basic(e, '%s[%d]' % (elements, i))
+                for i, e in enumerate(self.element_strategies)
+            ]),
+            elements,
+            plan.call(
+                checked_elements, str(len(self.element_strategies)), data),
+        )
+
+    def all_templates(self):
+        if self.template_upper_bound >= EFFECTIVELY_INFINITE:
+            return None
+        children = [s.all_templates() for s in self.element_strategies]
+        if any(c is None for c in children):
+            return None
+        return (self.newtuple(t) for t in product(*children))
+
+    def template_for(self, value):
+        check_type(tuple, value, NotInvertible)
+        check_length(len(self.element_strategies), value, NotInvertible)
+        return self.newtuple([
+            f.template_for(v)
+            for f, v in zip(self.element_strategies, value)
+        ])
+
 
 class ListStrategy(SearchStrategy):
 
@@ -191,26 +262,66 @@ class ListStrategy(SearchStrategy):
             return None
         else:
             return self.Parameter(
-                average_length=random.expovariate(
-                    1.0 / self.average_length),
+                average_length=scaled(random.expovariate(
+                    1.0 / self.average_length)),
                 child_parameter=self.element_strategy.draw_parameter(random),
             )
 
-    def draw_template(self, random, pv):
-        if self.element_strategy is None:
-            return ()
-        length = clamp(
+    def draw_length(self, random, pv):
+        return claim_size(clamp(
             self.min_size,
             dist.geometric(random, 1.0 / (1 + pv.average_length)),
             self.max_size,
-        )
+        ), self.min_size)
+
+    def draw_template(self, random, pv):
+        if self.element_strategy is None:
+            return ()
         result = []
-        for _ in hrange(length):
+        for _ in hrange(self.draw_length(random, pv)):
             result.append(
                 self.element_strategy.draw_template(
                     random, pv.child_parameter))
         return tuple(result)
 
+    def draw_value(self, random, pv):
+        if self.element_strategy is None:
+            return []
+        draw = self.element_strategy.draw_value
+        child_parameter = pv.child_parameter
+        return [
+            draw(random, child_parameter)
+            for _ in hrange(self.draw_length(random, pv))
+        ]
+
+    def elements_source(self, plan, element, random, parameter):
+        return '[%s for _ in %s]' % (element, plan.call(
+            hrange, plan.call(self.draw_length, random, parameter)))
+
+    def draw_template_source(self, plan, random, parameter):
+        if self.element_strategy is None:
+            return '()'
+        return 'tuple(%s)' % (self.elements_source(
+            plan, plan.draw_template(
+                self.element_strategy, random,
+                parameter + '.child_parameter'),
+            random, parameter),)
+
+    def draw_value_source(self, plan, random, parameter):
+        if self.element_strategy is None:
+            return '[]'
+        return self.elements_source(
+            plan, plan.draw_value(
+                self.element_strategy, random, parameter + '.child_parameter'),
+            random, parameter)
+
+    def reify_source(self, plan, template):
+        if self.element_strategy is None:
+            return '[]'
+        element = plan.local()
+        return '[%s for %s in %s]' % (
+            plan.reify(self.element_strategy, element), element, template)
+
     def simplifiers(self, random, template):
         if not self.element_strategy:
             return
@@ -411,10 +522,10 @@ class ListStrategy(SearchStrategy):
             return []
         return list(map(self.element_strategy.to_basic, value))
 
-    def from_basic(self, value):
+    def checked_basic(self, value):
+        """Returns value if it's a list of an acceptable length to convert
+        to one of our templates, and raises BadData otherwise."""
         check_data_type(list, value)
-        if self.element_strategy is None:
-            return ()
         if len(value) < (self.min_size or 0):
             raise BadData('List too short. len(%r)=%d < self.min_size=%d' % (
                 value, len(value), self.min_size
@@ -423,7 +534,71 @@ class ListStrategy(SearchStrategy):
             raise BadData('List too long. len(%r)=%d > self.min_size=%d' % (
                 value, len(value), self.max_size
             ))
-        return tuple(map(self.element_strategy.from_basic, value))
+        return value
+
+    def from_basic(self, value):
+        if self.element_strategy is None:
+            check_data_type(list, value)
+            return ()
+        return tuple(map(
+            self.element_strategy.from_basic, self.checked_basic(value)))
+
+    def to_basic_source(self, plan, template):
+        if self.element_strategy is None:
+            return plan.call(self.to_basic, template)
+        element = plan.local()
+        return '[%s for %s in %s]' % (
+            plan.to_basic(self.element_strategy, element), element,
+            plan.call(checked_type, plan.name_for(tuple), template))
+
+    def from_basic_source(self, plan, data):
+        if self.element_strategy is None:
+            return plan.call(self.from_basic, data)
+        element = plan.local()
+        return 'tuple([%s for %s in %s])' % (
+            plan.from_basic(self.element_strategy, element), element,
+            plan.call(self.checked_basic, data))
+
+    def all_templates(self):
+        if self.element_strategy is None:
+            return ((),)
+        return None
+
+    def narrowed(self, constraints):
+        if self.element_strategy is None:
+            return None
+        lower, upper = constraints.integer_size_bounds()
+        min_size = self.min_size
+        max_size = self.max_size
+        if max_size is None:
+            max_size = float('inf')
+        if lower is not None:
+            min_size = max(min_size, lower)
+        if upper is not None:
+            max_size = min(max_size, upper)
+        if min_size > max_size:
+            return None
+        if max_size <= 0:
+            return ListStrategy(())
+        average_length = self.average_length
+        if average_length < min_size:
+            average_length += min_size
+        average_length = min(average_length, max_size)
+        return ListStrategy(
+            (self.element_strategy,), average_length=average_length,
+            min_size=min_size, max_size=max_size,
+        )
+
+    def template_for(self, value):
+        check_type((list, tuple), value, NotInvertible)
+        if len(value) < self.min_size or (
+            self.max_size is not None and len(value) > self.max_size
+        ):
+            raise NotInvertible('Length of %r not in [%r, %r]' % (
+                value, self.min_size, self.max_size))
+        if self.element_strategy is None:
+            return ()
+        return tuple(map(self.element_strategy.template_for, value))
 
 
 class SingleElementListStrategy(MappedSearchStrategy):
@@ -461,6 +636,12 @@ class SingleElementListStrategy(MappedSearchStrategy):
     def new_element(self):
         return self.element_strategy.reify(self.base_template)
 
+    def unpack(self, value):
+        check_type(list, value, NotInvertible)
+        for element in value:
+            self.element_strategy.template_for(element)
+        return len(value)
+
 
 class SetStrategy(SearchStrategy):
 
@@ -535,6 +716,14 @@ class SetStrategy(SearchStrategy):
         return self.convert_template(
             (self.list_strategy.draw_template(random, pv)))
 
+    def draw_value(self, random, pv):
+        result = set()
+        for x in self.list_strategy.draw_value(random, pv):
+            if self.max_size is not None and len(result) >= self.max_size:
+                break
+            result.add(x)
+        return result
+
     def strictly_simpler(self, x, y):
         return self.list_strategy.strictly_simpler(x, y)
 
@@ -558,6 +747,28 @@ class SetStrategy(SearchStrategy):
         check_data_type(list, value)
         return self.convert_template(self.list_strategy.from_basic(value))
 
+    def all_templates(self):
+        # The order of elements in a template doesn't change the set it
+        # reifies to, so one template for each combination of distinct
+        # element templates is enough.
+        elements = self.list_strategy.element_strategy
+        if elements is None:
+            return ((),)
+        if self.template_upper_bound >= EFFECTIVELY_INFINITE:
+            return None
+        element_templates = elements.all_templates()
+        if element_templates is None:
+            return None
+        element_templates = list(element_templates)
+        max_size = len(element_templates)
+        if self.max_size is not None:
+            max_size = min(max_size, self.max_size)
+        return (
+            combination
+            for k in hrange(max_size + 1)
+            for combination in combinations(element_templates, k)
+        )
+
 
 class FrozenSetStrategy(MappedSearchStrategy):
 
@@ -611,6 +822,32 @@ class FixedKeysDictStrategy(MappedSearchStrategy):
     def pack(self, value):
         return self.dict_type(zip(self.keys, value))
 
+    def dict_source(self, plan, values):
+        items = [(plan.name_for(k), v) for k, v in zip(self.keys, values)]
+        if self.dict_type is dict:
+            return '{%s}' % (', '.join('%s: %s' % item for item in items),)
+        return plan.call(self.dict_type, '(%s)' % (
+            ''.join('(%s, %s), ' % item for item in items),))
+
+    def draw_value_source(self, plan, random, parameter):
+        return self.dict_source(plan, [
+            plan.draw_value(e, random, '%s[%d]' % (parameter, i))
+            for i, e in enumerate(self.mapped_strategy.element_strategies)
+        ])
+
+    def reify_source(self, plan, template):
+        return self.dict_source(plan, [
+            plan.reify(e, '%s[%d]' % (template, i))
+            for i, e in enumerate(self.mapped_strategy.element_strategies)
+        ])
+
+    def unpack(self, value):
+        check_type(dict, value, NotInvertible)
+        if set(value) != set(self.keys):
+            raise NotInvertible('Expected keys %r but got %r' % (
+                self.keys, tuple(value)))
+        return tuple(value[k] for k in self.keys)
+
 
 Settings.define_setting(
     'average_list_length',
@@ -21,8 +21,9 @@ import hypothesis.internal.distributions as dist
 from hypothesis.types import RandomWithSeed
 from hypothesis.internal.compat import hrange, integer_types
 from hypothesis.internal.chooser import chooser
-from hypothesis.searchstrategy.strategies import BadData, SearchStrategy, \
-    MappedSearchStrategy, check_type, check_data_type
+from hypothesis.internal.randomness import randints
+from hypothesis.searchstrategy.strategies import BadData, NotInvertible, \
+    SearchStrategy, MappedSearchStrategy, check_type, check_data_type
 
 
 class BoolStrategy(SearchStrategy):
@@ -58,6 +59,13 @@ class BoolStrategy(SearchStrategy):
         check_data_type(int, value)
         return bool(value)
 
+    def all_templates(self):
+        return (False, True)
+
+    def template_for(self, value):
+        check_type(bool, value, NotInvertible)
+        return value
+
 
 class JustStrategy(SearchStrategy):
 
@@ -83,6 +91,9 @@ class JustStrategy(SearchStrategy):
         assert template is None
         return self.value
 
+    def draw_value(self, random, pv):
+        return self.value
+
     def to_basic(self, template):
         return None
 
@@ -91,6 +102,17 @@ class JustStrategy(SearchStrategy):
             raise BadData('Expected None but got %r' % (repr(data,)))
         return None
 
+    def all_templates(self):
+        return (None,)
+
+    def narrowed(self, constraints):
+        return self
+
+    def template_for(self, value):
+        if value != self.value:
+            raise NotInvertible('Expected %r but got %r' % (self.value, value))
+        return None
+
 
 class RandomStrategy(MappedSearchStrategy):
 
@@ -147,10 +169,19 @@ class SampledFromStrategy(SearchStrategy):
 
     def draw_parameter(self, random):
         n = len(self.elements)
-        return chooser(random.getrandbits(8) + 1 for _ in hrange(n))
+        return chooser(randints(random, 1, 256, n))
 
     def draw_template(self, random, pv):
         return pv.choose(random)
 
     def reify(self, template):
         return self.elements[template]
+
+    def all_templates(self):
+        return hrange(len(self.elements))
+
+    def template_for(self, value):
+        for i, element in enumerate(self.elements):
+            if element == value:
+                return i
+        raise NotInvertible('%r is not one of %r' % (value, self.elements))
@@ -22,6 +22,7 @@ from collections import namedtuple
 from hypothesis import Settings
 from hypothesis.strategies import lists, tuples
 from hypothesis.internal.compat import hrange
+from hypothesis.internal.sizing import scaled, claim_size
 from hypothesis.internal.distributions import geometric, uniform_float
 from hypothesis.searchstrategy.strategies import BadData, SearchStrategy, \
     strategy, check_length, check_data_type
@@ -62,17 +63,25 @@ class NAryTreeStrategy(SearchStrategy):
             lists(tuples(self.branch_key_strategy, self)))
 
     def draw_parameter(self, random):
+        # Every node has geometric(random, branch_factor) children, which is
+        # 1 / branch_factor - 1 of them on average. Rather than scale the
+        # branch factor itself, we pick that average (between 1/99 and 1/3)
+        # and scale it down with the rest of the example, then turn it back
+        # into a branch factor. At scale 0 the average is 0, so the branch
+        # factor is 1, for which geometric always returns 0 and every tree
+        # is a single leaf.
         return self.Parameter(
             leaf_parameter=self.leaf_strategy.draw_parameter(random),
             branch_key_parameter=self.branch_key_strategy.draw_parameter(
                 random),
             branch_label_parameter=self.branch_label_strategy.draw_parameter(
                 random),
-            branch_factor=uniform_float(random, 0.75, 0.99),
+            branch_factor=1.0 / (1.0 + scaled(
+                1.0 / uniform_float(random, 0.75, 0.99) - 1.0)),
         )
 
     def draw_template(self, random, pv):
-        n_children = geometric(random, pv.branch_factor)
+        n_children = claim_size(geometric(random, pv.branch_factor))
         if not n_children:
             return Leaf(self.leaf_strategy.draw_template(
                 random, pv.leaf_parameter
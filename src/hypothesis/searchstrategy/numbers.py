@@ -25,9 +25,12 @@ from collections import namedtuple
 import hypothesis.internal.distributions as dist
 from hypothesis.utils.size import clamp
 from hypothesis.internal.compat import hrange, text_type, integer_types
+from hypothesis.internal.filtering import narrowed_floats, \
+    narrowed_integers
 from hypothesis.searchstrategy.misc import SampledFromStrategy
-from hypothesis.searchstrategy.strategies import BadData, SearchStrategy, \
-    MappedSearchStrategy, check_type, infinitish, check_data_type
+from hypothesis.searchstrategy.strategies import EFFECTIVELY_INFINITE, \
+    BadData, NotInvertible, SearchStrategy, MappedSearchStrategy, \
+    check_type, infinitish, check_data_type
 
 
 def integer_or_bad(data):
@@ -38,6 +41,22 @@ def integer_or_bad(data):
         raise BadData('Invalid integer %r' % (data,))
 
 
+def integer_or_not_invertible(value, lower=None, upper=None):
+    check_type(integer_types, value, NotInvertible)
+    if isinstance(value, bool):
+        raise NotInvertible('Expected an integer but got %r' % (value,))
+    if (
+        (lower is not None and value < lower) or
+        (upper is not None and value > upper)
+    ):
+        raise NotInvertible('Value %d out of range [%s, %s]' % (
+            value,
+            '-infinity' if lower is None else lower,
+            'infinity' if upper is None else upper,
+        ))
+    return value
+
+
 class IntStrategy(SearchStrategy):
 
     """A generic strategy for integer types that provides the basic methods
@@ -47,6 +66,9 @@ class IntStrategy(SearchStrategy):
 
     """
 
+    def narrowed(self, constraints):
+        return narrowed_integers(constraints)
+
     def from_basic(self, data):
         return integer_or_bad(data)
 
@@ -64,6 +86,9 @@ class IntStrategy(SearchStrategy):
     def reify(self, template):
         return int(template)
 
+    def template_for(self, value):
+        return integer_or_not_invertible(value)
+
     def strictly_simpler(self, x, y):
         if y < 0:
             return x > y
@@ -109,7 +134,9 @@ class IntStrategy(SearchStrategy):
 
 class IntegersFromStrategy(SearchStrategy):
 
-    def __init__(self, lower_bound, average_size=1000.0):
+    default_average_size = 1000.0
+
+    def __init__(self, lower_bound, average_size=default_average_size):
         super(IntegersFromStrategy, self).__init__()
         self.lower_bound = lower_bound
         self.average_size = average_size
@@ -176,6 +203,22 @@ class IntegersFromStrategy(SearchStrategy):
     def to_basic(self, template):
         return text_type(template)
 
+    def narrowed(self, constraints):
+        if (
+            self.average_size != self.default_average_size and
+            constraints.integer_bounds()[1] is not None
+        ):
+            # We'd have to narrow to a bounded range, which would lose the
+            # average_size we were asked for.
+            return None
+        return narrowed_integers(
+            constraints, lower=self.lower_bound,
+            average_size=self.average_size,
+        )
+
+    def template_for(self, value):
+        return integer_or_not_invertible(value, lower=self.lower_bound)
+
 
 class RandomGeometricIntStrategy(IntStrategy):
 
@@ -269,6 +312,17 @@ class BoundedIntStrategy(SearchStrategy):
     def reify(self, value):
         return value
 
+    def narrowed(self, constraints):
+        return narrowed_integers(constraints, self.start, self.end)
+
+    def all_templates(self):
+        if self.end - self.start >= EFFECTIVELY_INFINITE:
+            return None
+        return hrange(self.start, self.end + 1)
+
+    def template_for(self, value):
+        return integer_or_not_invertible(value, self.start, self.end)
+
     def draw_template(self, random, parameter):
         return random.choice(parameter)
 
@@ -437,6 +491,9 @@ class WrapperFloatStrategy(FloatStrategy):
     def __repr__(self):
         return 'WrapperFloatStrategy(%r)' % (self.sub_strategy,)
 
+    def narrowed(self, constraints):
+        return narrowed_floats(constraints)
+
     def draw_parameter(self, random):
         return self.sub_strategy.draw_parameter(random)
 
@@ -444,6 +501,9 @@ class WrapperFloatStrategy(FloatStrategy):
         return self.sub_strategy.reify(
             self.sub_strategy.draw_template(random, pv))
 
+    def draw_value(self, random, pv):
+        return self.sub_strategy.draw_value(random, pv)
+
 
 class JustIntFloats(FloatStrategy):
 
@@ -514,6 +574,10 @@ class FixedBoundedFloatStrategy(FloatStrategy):
             self.lower_bound, self.upper_bound,
         )
 
+    def narrowed(self, constraints):
+        return narrowed_floats(
+            constraints, self.lower_bound, self.upper_bound)
+
     def draw_parameter(self, random):
         return self.Parameter(
             cut=random.random(),
@@ -632,6 +696,12 @@ class FloatsFromBase(FloatStrategy):
         self.base = base
         self.sign = sign
 
+    def narrowed(self, constraints):
+        if self.sign > 0:
+            return narrowed_floats(constraints, lower=self.base)
+        else:
+            return narrowed_floats(constraints, upper=self.base)
+
     def draw_parameter(self, random):
         return random.gammavariate(2, 50)
 
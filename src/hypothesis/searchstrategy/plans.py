@@ -0,0 +1,194 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Compiling a tree of strategies into flat functions for drawing, reifying
+and serializing its examples.
+
+Drawing or reifying an example of e.g. the tuples(tuples(...),
+fixed_dictionaries(...)) strategy that given builds goes through a method
+call for every node in the tree, most of which just pull a template apart,
+call their children and build a new tuple out of the results. Converting
+it to and from basic data for the database is the same story, with some
+validation along the way. A plan replaces all of those with a single
+generated function which does the same thing in one expression, so only
+the strategies at the leaves get called.
+
+Strategies take part by implementing draw_template_source,
+draw_value_source, reify_source, to_basic_source and from_basic_source,
+which return a Python expression for the result of the corresponding
+method in terms of expressions for its arguments. Anything which doesn't
+know how to do that is just called.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from hypothesis.internal.reflection import source_exec_as_module
+from hypothesis.searchstrategy.strategies import SearchStrategy, \
+    MappedSearchStrategy
+
+# Expressions for deeply nested strategies would eventually be too much for
+# the parser, so past this depth we stop inlining and call the strategy.
+MAX_PLAN_DEPTH = 20
+
+PLAN_SCRIPT = """
+def accept(arguments):
+    %(unpack)s
+
+    def draw_template(random, parameter):
+        return %(draw_template)s
+
+    def draw_value(random, parameter):
+        return %(draw_value)s
+
+    def reify(template):
+        return %(reify)s
+
+    def to_basic(template):
+        return %(to_basic)s
+
+    def from_basic(data):
+        return %(from_basic)s
+
+    return draw_template, draw_value, reify, to_basic, from_basic
+""".strip() + '\n'
+
+
+def defining_class(cls, name):
+    for c in cls.__mro__:
+        if name in c.__dict__:
+            return c
+
+
+def has_source(strategy, method):
+    """Can we use strategy's source for method in place of calling it?
+
+    Only if the source was written for the method it would be replacing,
+    so a subclass which overrides a method without also overriding its
+    source gets called as normal. The defaults on SearchStrategy just call
+    the method anyway, so they don't count.
+
+    """
+    cls = type(strategy)
+    source_class = defining_class(cls, method + '_source')
+    return source_class not in (None, SearchStrategy) and issubclass(
+        source_class, defining_class(cls, method))
+
+
+class PlanBuilder(object):
+
+    """Accumulates the expressions for a plan and the objects they need to
+    refer to, which get passed to the generated module's accept function."""
+
+    def __init__(self):
+        self.arguments = []
+        self.locals = 0
+        self.depth = 0
+        self.inlined = False
+
+    def name_for(self, value):
+        """Returns a name by which the plan can refer to value."""
+        self.arguments.append(value)
+        return 'f%d' % (len(self.arguments) - 1,)
+
+    def call(self, f, *arguments):
+        return '%s(%s)' % (self.name_for(f), ', '.join(arguments))
+
+    def local(self):
+        """Returns a new name for a comprehension variable."""
+        self.locals += 1
+        return 'x%d' % (self.locals,)
+
+    def source(self, strategy, method, *arguments):
+        if self.depth >= MAX_PLAN_DEPTH or not has_source(strategy, method):
+            return self.call(getattr(strategy, method), *arguments)
+        self.inlined = True
+        self.depth += 1
+        try:
+            return getattr(strategy, method + '_source')(self, *arguments)
+        finally:
+            self.depth -= 1
+
+    def draw_template(self, strategy, random, parameter):
+        return self.source(strategy, 'draw_template', random, parameter)
+
+    def draw_value(self, strategy, random, parameter):
+        return self.source(strategy, 'draw_value', random, parameter)
+
+    def reify(self, strategy, template):
+        return self.source(strategy, 'reify', template)
+
+    def to_basic(self, strategy, template):
+        return self.source(strategy, 'to_basic', template)
+
+    def from_basic(self, strategy, data):
+        return self.source(strategy, 'from_basic', data)
+
+
+class CompiledStrategy(MappedSearchStrategy):
+
+    """A strategy which behaves exactly like the one it wraps, but draws,
+    reifies and converts to and from basic data using a plan compiled from
+    it."""
+
+    def __init__(
+        self, strategy, draw_template, draw_value, reify, to_basic,
+        from_basic,
+    ):
+        super(CompiledStrategy, self).__init__(strategy=strategy)
+        # These are looked up on every example, so we store the generated
+        # functions directly rather than calling them from methods.
+        self.draw_template = draw_template
+        self.draw_value = draw_value
+        self.reify = reify
+        self.to_basic = to_basic
+        self.from_basic = from_basic
+
+    def __repr__(self):
+        return repr(self.mapped_strategy)
+
+    def pack(self, value):
+        return value
+
+    def unpack(self, value):
+        return value
+
+
+def compiled(strategy):
+    """Returns a strategy equivalent to strategy which uses a compiled plan
+    for its examples, or strategy itself if there's nothing to gain from
+    compiling it."""
+    builder = PlanBuilder()
+    expressions = {
+        'draw_template': builder.draw_template(
+            strategy, 'random', 'parameter'),
+        'draw_value': builder.draw_value(strategy, 'random', 'parameter'),
+        'reify': builder.reify(strategy, 'template'),
+        'to_basic': builder.to_basic(strategy, 'template'),
+        'from_basic': builder.from_basic(strategy, 'data'),
+    }
+    if not builder.inlined:
+        return strategy
+    if builder.arguments:
+        # The trailing comma means a single name still unpacks a tuple.
+        expressions['unpack'] = '%s= arguments' % (''.join(
+            'f%d, ' % (i,) for i in range(len(builder.arguments))),)
+    else:
+        expressions['unpack'] = 'pass'
+    module = source_exec_as_module(PLAN_SCRIPT % expressions)
+    return CompiledStrategy(
+        strategy, *module.accept(tuple(builder.arguments)))
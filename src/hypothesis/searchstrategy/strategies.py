@@ -21,13 +21,16 @@ from random import Random
 from collections import namedtuple
 
 from hypothesis.errors import BadData, NoExamples, WrongFormat, \
-    UnsatisfiedAssumption
+    NotInvertible, UnsatisfiedAssumption
 from hypothesis.control import assume
 from hypothesis.settings import Settings
 from hypothesis.deprecation import note_deprecation
 from hypothesis.internal.compat import hrange, integer_types
 from hypothesis.utils.extmethod import ExtMethod
 from hypothesis.internal.chooser import chooser
+from hypothesis.internal.sizing import size_scale, current_scale
+from hypothesis.internal.randomness import randints, SplitRandom, \
+    random_for_example
 from hypothesis.utils.conventions import not_set
 
 
@@ -93,6 +96,22 @@ def check_length(l, value, e=BadData):
         ))
 
 
+def checked_type(typ, value):
+    """check_type as an expression: returns value if it has the right
+    type."""
+    check_type(typ, value)
+    return value
+
+
+def checked_elements(n, data):
+    """Returns the n elements of data as a list, raising BadData if it
+    doesn't have n elements."""
+    check_length(n, data)
+    if type(data) is not list:
+        data = list(data)
+    return data
+
+
 def one_of_strategies(xs):
     """Helper function for unioning multiple strategies."""
     xs = tuple(xs)
@@ -196,6 +215,13 @@ class SearchStrategy(object):
         This method is part of the public API.
 
         """
+        if type(self) in (MappedSearchStrategy, FilteredStrategy):
+            # Rather than wrapping another wrapper, which would add a layer
+            # of calls to everything we do with it, we add pack to the end
+            # of its pipeline.
+            return MappedSearchStrategy(
+                pack=self.pipeline().then(pack), strategy=self.mapped_strategy
+            )
         return MappedSearchStrategy(
             pack=pack, strategy=self
         )
@@ -221,9 +247,22 @@ class SearchStrategy(object):
         This method is part of the public API.
 
         """
+        from hypothesis.internal.filtering import narrow
+        if type(self) is FilteredStrategy:
+            # Both conditions see the same values, so we can check them
+            # together and use the new one to narrow what they get.
+            return FilteredStrategy(
+                condition=conjunction(self.condition, condition),
+                strategy=narrow(self.mapped_strategy, condition),
+            )
+        if type(self) is MappedSearchStrategy:
+            return MappedSearchStrategy(
+                pack=self.pipeline().then(condition, is_filter=True),
+                strategy=self.mapped_strategy,
+            )
         return FilteredStrategy(
             condition=condition,
-            strategy=self,
+            strategy=narrow(self, condition),
         )
 
     def __or__(self, other):
@@ -244,13 +283,22 @@ class SearchStrategy(object):
 
     def draw_parameter(self, random):
         """Produce a random valid parameter for this strategy, using only data
-        from the provided random number generator."""
+        from the provided random number generator.
+
+        As with draw_template, that may be a SplitRandom.
+
+        """
         raise NotImplementedError(  # pragma: no cover
             '%s.draw_parameter()' % (self.__class__.__name__))
 
     def draw_template(self, random, parameter_value):
         """Given this Random and this parameter value, produce a random valid
-        template for this strategy."""
+        template for this strategy.
+
+        random supports all the methods of Random, but may be a cheaper
+        SplitRandom rather than an actual instance of it.
+
+        """
         raise NotImplementedError(  # pragma: no cover
             '%s.draw_template()' % (self.__class__.__name__))
 
@@ -260,6 +308,17 @@ class SearchStrategy(object):
         raise NotImplementedError(  # pragma: no cover
             '%s.reify()' % (self.__class__.__name__))
 
+    def draw_value(self, random, parameter_value):
+        """Produce a value distributed exactly as reify(draw_template(random,
+        parameter_value)) would be.
+
+        This is used when we don't need the template (e.g. because we won't
+        be simplifying or saving it), so strategies which can produce values
+        more cheaply without building a template first should override it.
+
+        """
+        return self.reify(self.draw_template(random, parameter_value))
+
     def to_basic(self, template):
         """Convert a template value for this strategy into basic data.
 
@@ -285,6 +344,66 @@ class SearchStrategy(object):
         raise NotImplementedError(  # pragma: no cover
             '%s.from_basic()' % (self.__class__.__name__))
 
+    def template_for(self, value):
+        """Given a value that this strategy could have produced, return a
+        template which reifies to it, raising NotInvertible if there is no
+        such template or this strategy cannot find it.
+
+        This is used to turn values from outside Hypothesis into examples
+        that can be saved to the database. Strategies need not support it.
+
+        """
+        raise NotInvertible('%r cannot convert values back to templates' % (
+            self,
+        ))
+
+    def all_templates(self):
+        """Return an iterable over every template for this strategy (or
+        at least enough that between them they reify to every value it can
+        produce), or None if this strategy does not know how to list its
+        templates.
+
+        Only strategies with a finite template_upper_bound should support
+        this, and then only produce at most that many templates.
+
+        """
+        return None
+
+    def narrowed(self, constraints):
+        """Return a strategy which generates every value of this strategy
+        that satisfies constraints (from hypothesis.internal.filtering) and
+        hopefully few that don't, or None if this strategy doesn't know how
+        to do that or nothing satisfies them."""
+        return None
+
+    def draw_template_source(self, plan, random, parameter):
+        """Return a Python expression which evaluates to the result of
+        draw_template on the random and parameter that the expressions
+        random and parameter evaluate to.
+
+        This is how a strategy takes part in compiled plans (see
+        hypothesis.searchstrategy.plans). It should only be overridden
+        alongside draw_template, and by default just calls it.
+
+        """
+        return plan.call(self.draw_template, random, parameter)
+
+    def draw_value_source(self, plan, random, parameter):
+        """As draw_template_source, but for draw_value."""
+        return plan.call(self.draw_value, random, parameter)
+
+    def reify_source(self, plan, template):
+        """As draw_template_source, but for reify."""
+        return plan.call(self.reify, template)
+
+    def to_basic_source(self, plan, template):
+        """As draw_template_source, but for to_basic."""
+        return plan.call(self.to_basic, template)
+
+    def from_basic_source(self, plan, data):
+        """As draw_template_source, but for from_basic."""
+        return plan.call(self.from_basic, data)
+
     # Gory implementation details
 
     #: Provide an upper bound on the number of available templates.
@@ -408,6 +527,50 @@ class SearchStrategy(object):
         return iter(())
 
 
+LAZY_UNION_SIZE = 16
+
+
+class LazyParameters(object):
+
+    """A sequence of parameters for a list of strategies, each of which is
+    only drawn the first time it is asked for.
+
+    Each parameter is drawn from its own random derived from a seed taken
+    from the random we were created with, and at the size scale that was in
+    effect then, so which of them get drawn and in what order doesn't
+    change what they are.
+
+    """
+
+    def __init__(self, strategies, random):
+        self.strategies = strategies
+        self.seed = random.getrandbits(64)
+        self.scale = current_scale.value
+        self.parameters = [not_set] * len(strategies)
+
+    def __repr__(self):
+        return 'LazyParameters(%r)' % (self.parameters,)
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def __getitem__(self, i):
+        result = self.parameters[i]
+        if result is not_set:
+            random = random_for_example(self.seed, i)
+            if current_scale.value == self.scale:
+                result = self.strategies[i].draw_parameter(random)
+            else:
+                with size_scale(self.scale):
+                    result = self.strategies[i].draw_parameter(random)
+            self.parameters[i] = result
+        return result
+
+    def __iter__(self):
+        for i in hrange(len(self)):
+            yield self[i]
+
+
 class OneOfStrategy(SearchStrategy):
 
     """Implements a union of strategies. Given a number of strategies this
@@ -453,11 +616,19 @@ class OneOfStrategy(SearchStrategy):
 
     def draw_parameter(self, random):
         n = len(self.element_strategies)
-        return self.Parameter(
-            chooser=chooser(
-                random.getrandbits(8) + 1 for _ in hrange(n)),
-            child_parameters=[
+        branch_chooser = chooser(randints(random, 1, 256, n))
+        # Each parameter only gets a handful of templates drawn from it, so
+        # for wide unions most children are never used and it's cheaper to
+        # only draw their parameters when they are. For narrow ones the
+        # bookkeeping costs more than it saves.
+        if n > LAZY_UNION_SIZE:
+            child_parameters = LazyParameters(self.element_strategies, random)
+        else:
+            child_parameters = [
                 s.draw_parameter(random) for s in self.element_strategies]
+        return self.Parameter(
+            chooser=branch_chooser,
+            child_parameters=child_parameters,
         )
 
     def draw_template(self, random, pv):
@@ -467,6 +638,11 @@ class OneOfStrategy(SearchStrategy):
             self.element_strategies[child].draw_template(
                 random, pv.child_parameters[child]))
 
+    def draw_value(self, random, pv):
+        child = pv.chooser.choose(random)
+        return self.element_strategies[child].draw_value(
+            random, pv.child_parameters[child])
+
     def element_simplifier(self, s, simplifier):
         def accept(random, template):
             if template[0] != s:
@@ -489,6 +665,12 @@ class OneOfStrategy(SearchStrategy):
         i, value = template
         return [i, self.element_strategies[i].to_basic(value)]
 
+    def to_basic_source(self, plan, template):
+        converters = plan.name_for(tuple(
+            s.to_basic for s in self.element_strategies))
+        return '[%s[0], %s[%s[0]](%s[1])]' % (
+            template, converters, template, template)
+
     def from_basic(self, data):
         check_data_type(list, data)
         check_length(2, data)
@@ -503,6 +685,100 @@ class OneOfStrategy(SearchStrategy):
 
         return (i, self.element_strategies[i].from_basic(value))
 
+    def all_templates(self):
+        children = [s.all_templates() for s in self.element_strategies]
+        if any(c is None for c in children):
+            return None
+        return [
+            (i, template)
+            for i, templates in enumerate(children)
+            for template in templates
+        ]
+
+    def narrowed(self, constraints):
+        strategies = []
+        seen = set()
+        for s in self.element_strategies:
+            s = s.narrowed(constraints)
+            if s is None:
+                return None
+            # Different strategies for the same values often narrow to the
+            # same strategy, which we'd rather not double up on.
+            if repr(s) not in seen:
+                seen.add(repr(s))
+                strategies.append(s)
+        return one_of_strategies(strategies)
+
+    def template_for(self, value):
+        for i, s in enumerate(self.element_strategies):
+            try:
+                return (i, s.template_for(value))
+            except NotInvertible:
+                pass
+        raise NotInvertible('No strategy in %r could have produced %r' % (
+            self, value
+        ))
+
+
+class Pipeline(object):
+
+    """A function which passes its argument through a sequence of steps in
+    turn. Each step is a pair (f, is_filter): maps replace the value with
+    f(value), while filters leave it alone but reject it as an unsatisfied
+    assumption if f(value) is falsey."""
+
+    def __init__(self, steps):
+        self.steps = tuple(steps)
+
+    @property
+    def __name__(self):
+        return '.'.join(
+            '%s(%s)' % (
+                'filter' if is_filter else 'map',
+                getattr(f, '__name__', type(f).__name__),
+            )
+            for f, is_filter in self.steps
+        )
+
+    def __repr__(self):
+        return 'Pipeline(%r)' % (self.steps,)
+
+    def __call__(self, value):
+        for f, is_filter in self.steps:
+            if is_filter:
+                if not f(value):
+                    raise UnsatisfiedAssumption()
+            else:
+                value = f(value)
+        return value
+
+    def then(self, f, is_filter=False):
+        return Pipeline(self.steps + ((f, is_filter),))
+
+
+class Conjunction(object):
+
+    """A predicate which is true of the values that all of a sequence of
+    predicates are true of."""
+
+    def __init__(self, conditions):
+        self.conditions = tuple(conditions)
+
+    def __repr__(self):
+        return 'Conjunction(%r)' % (self.conditions,)
+
+    def __call__(self, value):
+        for condition in self.conditions:
+            if not condition(value):
+                return False
+        return True
+
+
+def conjunction(first, second):
+    if isinstance(first, Conjunction):
+        return Conjunction(first.conditions + (second,))
+    return Conjunction((first, second))
+
 
 class MappedSearchStrategy(SearchStrategy):
 
@@ -540,6 +816,25 @@ class MappedSearchStrategy(SearchStrategy):
     def reify(self, value):
         return self.pack(self.mapped_strategy.reify(value))
 
+    def draw_value(self, random, pv):
+        return self.pack(self.mapped_strategy.draw_value(random, pv))
+
+    def draw_template_source(self, plan, random, parameter):
+        return plan.draw_template(self.mapped_strategy, random, parameter)
+
+    def draw_value_source(self, plan, random, parameter):
+        return plan.call(self.pack, plan.draw_value(
+            self.mapped_strategy, random, parameter))
+
+    def reify_source(self, plan, template):
+        return plan.call(self.pack, plan.reify(self.mapped_strategy, template))
+
+    def to_basic_source(self, plan, template):
+        return plan.to_basic(self.mapped_strategy, template)
+
+    def from_basic_source(self, plan, data):
+        return plan.from_basic(self.mapped_strategy, data)
+
     def simplifiers(self, random, template):
         return self.mapped_strategy.simplifiers(random, template)
 
@@ -552,6 +847,29 @@ class MappedSearchStrategy(SearchStrategy):
     def from_basic(self, data):
         return self.mapped_strategy.from_basic(data)
 
+    def all_templates(self):
+        return self.mapped_strategy.all_templates()
+
+    def unpack(self, value):
+        """Take a value output by pack and return a value of the underlying
+        mapped_strategy that packs to it, raising NotInvertible if there is
+        no such value.
+
+        An arbitrary pack function can't be undone, so by default this
+        always raises.
+
+        """
+        raise NotInvertible('%r cannot unpack values' % (self,))
+
+    def template_for(self, value):
+        return self.mapped_strategy.template_for(self.unpack(value))
+
+    def pipeline(self):
+        """Returns pack as a Pipeline."""
+        if isinstance(self.pack, Pipeline):
+            return self.pack
+        return Pipeline(((self.pack, False),))
+
 
 class FilteredStrategy(MappedSearchStrategy):
 
@@ -559,10 +877,24 @@ class FilteredStrategy(MappedSearchStrategy):
         super(FilteredStrategy, self).__init__(strategy=strategy)
         self.condition = condition
 
+    def pipeline(self):
+        if isinstance(self.condition, Conjunction):
+            conditions = self.condition.conditions
+        else:
+            conditions = (self.condition,)
+        return Pipeline((c, True) for c in conditions)
+
     def pack(self, value):
         assume(self.condition(value))
         return value
 
+    def unpack(self, value):
+        if not self.condition(value):
+            raise NotInvertible('%r does not satisfy the filter for %r' % (
+                value, self
+            ))
+        return value
+
 
 def tupleize(data):
     if isinstance(data, list):
@@ -665,8 +997,8 @@ class FlatMapStrategy(SearchStrategy):
                 pass
         if template.target_data == not_set:
             target_template = target_strategy.draw_template(
-                Random(template.target_template_seed),
-                target_strategy.draw_parameter(Random(
+                SplitRandom(template.target_template_seed),
+                target_strategy.draw_parameter(SplitRandom(
                     template.target_parameter_seed))
             )
         template.target_data = target_strategy.to_basic(target_template)
@@ -17,11 +17,10 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
-from random import Random
-
 from hypothesis.types import Stream
 from hypothesis.utils.show import show
 from hypothesis.internal.compat import hrange, integer_types
+from hypothesis.internal.randomness import SplitRandom
 from hypothesis.searchstrategy.strategies import SearchStrategy, \
     check_length, check_data_type
 
@@ -89,9 +88,10 @@ class StreamStrategy(SearchStrategy):
         return self.new_template(random.getrandbits(64), parameter)
 
     def new_template(self, seed, parameter_seed):
-        parameter = self.source_strategy.draw_parameter(Random(parameter_seed))
+        parameter = self.source_strategy.draw_parameter(
+            SplitRandom(parameter_seed))
 
-        random = Random(seed)
+        random = SplitRandom(seed)
 
         def templates():
             while True:
@@ -21,10 +21,12 @@ import sys
 import unicodedata
 
 import hypothesis.internal.distributions as dist
+from hypothesis.internal.sizing import scaled
 from hypothesis.internal.compat import hrange, hunichr, text_type, \
     binary_type
-from hypothesis.searchstrategy.strategies import SearchStrategy, \
-    MappedSearchStrategy, check_length, check_data_type
+from hypothesis.searchstrategy.strategies import NotInvertible, \
+    SearchStrategy, MappedSearchStrategy, check_type, check_length, \
+    check_data_type
 
 
 class OneCharStringStrategy(SearchStrategy):
@@ -37,7 +39,7 @@ class OneCharStringStrategy(SearchStrategy):
     zero_point = ord('0')
 
     def draw_parameter(self, random):
-        alphabet_size = 1 + dist.geometric(random, 0.1)
+        alphabet_size = 1 + int(scaled(dist.geometric(random, 0.1)))
         alphabet = []
         while len(alphabet) < alphabet_size:
             if random.randint(0, 10):
@@ -110,6 +112,13 @@ class OneCharStringStrategy(SearchStrategy):
         check_length(1, data)
         return data
 
+    def template_for(self, value):
+        check_type(text_type, value, NotInvertible)
+        check_length(1, value, NotInvertible)
+        if not self.is_good(value):
+            raise NotInvertible('Invalid character %r' % (value,))
+        return value
+
 
 class StringStrategy(MappedSearchStrategy):
 
@@ -124,9 +133,19 @@ class StringStrategy(MappedSearchStrategy):
     def __repr__(self):
         return 'StringStrategy()'
 
+    def narrowed(self, constraints):
+        narrowed = self.mapped_strategy.narrowed(constraints)
+        if narrowed is None:
+            return None
+        return StringStrategy(narrowed)
+
     def pack(self, ls):
         return ''.join(ls)
 
+    def unpack(self, value):
+        check_type(text_type, value, NotInvertible)
+        return list(value)
+
 
 class BinaryStringStrategy(MappedSearchStrategy):
 
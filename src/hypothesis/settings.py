@@ -133,7 +133,10 @@ class Settings(object):
     details of the data that is generated.
 
     Default values are picked up from the Settings.default object and
-    changes made there will be picked up in newly created Settings.
+    changes made there will be picked up in newly created Settings. If a
+    parent Settings is passed in, defaults are taken from that instead
+    (including its database), so Settings(parent, timeout=10) is a copy of
+    parent with a different timeout.
 
     """
 
@@ -148,14 +151,17 @@ class Settings(object):
 
     def __init__(
             self,
+            parent=None,
             **kwargs
     ):
         for setting in all_settings.values():
             value = kwargs.pop(setting.name, not_set)
             if value == not_set:
-                value = getattr(Settings.default, setting.name)
+                value = getattr(parent or Settings.default, setting.name)
             setattr(self, setting.name, value)
         self._database = kwargs.pop('database', not_set)
+        if self._database is not_set and parent is not None:
+            self._database = parent._database
         if kwargs:
             raise InvalidArgument(
                 'Invalid arguments %s' % (', '.join(kwargs),))
@@ -292,6 +298,10 @@ Settings.define_setting(
 Once this many successful shrinks have been performed, Hypothesis will assume
 something has gone a bit wrong and give up rather than continuing to try to
 shrink the example.
+
+If this is 0 and there is no database, Hypothesis will generate values for
+your test directly rather than keeping track of how it made them, which is
+much faster but means it may run your test on the same value more than once.
 """
 )
 
@@ -343,6 +353,64 @@ in which case no storage will be used.
 """
 )
 
+Settings.define_setting(
+    'max_corpus_size',
+    default=0,
+    description="""
+If this is positive, Hypothesis will keep up to this many structurally novel
+passing examples for each test in the database alongside the failing ones,
+and replay them on later runs so that it gets back to hard to reach inputs
+quickly. If this is 0 only failing examples are saved.
+"""
+)
+
+Settings.define_setting(
+    'coverage_guided',
+    default=False,
+    description="""
+If this is True, Hypothesis will trace which branches of your code each
+example runs and steer generation towards examples which run code that no
+previous example did. This uses sys.settrace, so it makes tests much slower
+and doesn't play well with coverage tools or debuggers while the examples run.
+"""
+)
+
+Settings.define_setting(
+    'size_budget',
+    default=10000,
+    description="""
+The total number of elements that all the collections (lists, sets, text,
+trees, etc.) in a single example may have between them. Once an example has
+used this up, any further collections in it are as small as they're allowed
+to be. This stops nested collections from producing enormous examples. Set it
+to None for no limit.
+"""
+)
+
+Settings.define_setting(
+    'size_ramp',
+    default=0.5,
+    description="""
+The fraction of max_examples over which the examples we generate grow from
+small to their full size. Simple bugs tend to show up on small examples, which
+are also much cheaper to generate and run, so it's worth trying those first.
+Set it to 0 to generate full size examples from the start.
+"""
+)
+
+Settings.define_setting(
+    'deduplicate_values',
+    default=False,
+    description="""
+If this is True, Hypothesis will skip running your test on a value equal to
+one it has already run it on in the same run, and not count it towards
+max_examples. This only applies to values built out of None, booleans,
+numbers, strings, lists, tuples, dicts and sets: anything else is always run.
+It costs an extra reify of each example, so it's only worth it if many
+examples produce the same values (e.g. because of map or sampled_from).
+"""
+)
+
 
 class Verbosity(object):
 
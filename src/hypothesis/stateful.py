@@ -28,7 +28,6 @@ from __future__ import division, print_function, absolute_import, \
 
 import inspect
 import traceback
-from random import Random
 from unittest import TestCase
 from collections import namedtuple
 
@@ -38,6 +37,7 @@ from hypothesis.errors import Flaky, NoSuchExample, InvalidDefinition, \
 from hypothesis.settings import Settings, Verbosity
 from hypothesis.reporting import report, verbose_report, current_verbosity
 from hypothesis.internal.compat import hrange, integer_types
+from hypothesis.internal.randomness import SplitRandom
 from hypothesis.searchstrategy.misc import JustStrategy, \
     SampledFromStrategy
 from hypothesis.searchstrategy.strategies import BadData, SearchStrategy, \
@@ -201,7 +201,7 @@ GenericStateMachine.find_breaking_runner = classmethod(find_breaking_runner)
 
 
 def seeds(starting, n_steps):
-    random = Random(starting)
+    random = SplitRandom(starting)
 
     result = []
     for _ in hrange(n_steps):
@@ -278,11 +278,11 @@ class StateMachineRunner(object):
                 else:
                     data = []
                 if not template_set:
-                    parameter = strategy.draw_parameter(Random(
+                    parameter = strategy.draw_parameter(SplitRandom(
                         self.parameter_seed
                     ))
                     template = strategy.draw_template(
-                        Random(self.templates[i]), parameter)
+                        SplitRandom(self.templates[i]), parameter)
                     data.append(strategy.to_basic(template))
 
                 new_record = (
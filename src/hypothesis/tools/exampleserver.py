@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""This is a reference implementation of the service that HTTPBackend talks
+to, storing everything in a single SQLite database file. It allows a team or
+a CI fleet to share one example database over the network.
+
+Run it with:
+
+    python -m hypothesis.tools.exampleserver --port 8000 examples.db
+
+and point your tests at it with:
+
+    ExampleDatabase(backend=HTTPBackend('http://yourhost:8000'))
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import json
+
+from hypothesis.database.backend import SQLiteBackend
+
+try:
+    from urllib.parse import unquote
+    from socketserver import ThreadingMixIn
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:  # pragma: no cover
+    from urllib import unquote
+    from SocketServer import ThreadingMixIn
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+
+class BadRequest(Exception):
+    pass
+
+
+class ExampleRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:  # pragma: no cover
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+    def read_body(self):
+        try:
+            length = int(self.headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            raise BadRequest('Missing or invalid Content-Length')
+        if length < 0:
+            raise BadRequest('Negative Content-Length')
+        try:
+            body = json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            raise BadRequest('Body is not valid JSON')
+        if not isinstance(body, list):
+            raise BadRequest('Body should be a list')
+        return body
+
+    def respond(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def key(self):
+        if not self.path.startswith('/keys/'):
+            return None
+        key = unquote(str(self.path[len('/keys/'):]))
+        if not isinstance(key, type('')):  # pragma: no cover
+            key = key.decode('utf-8')
+        return key
+
+    def dispatch(self, handle):
+        """Call handle with a backend for this request.
+
+        SQLite connections may only be used from the thread that created
+        them, so each request gets its own backend, which is closed
+        afterwards so that handler threads don't leak connections.
+
+        """
+        backend = SQLiteBackend(self.server.database_path)
+        try:
+            handle(backend)
+        except BadRequest as e:
+            # We may not have read all of the body, so the connection can't
+            # be reused for another request.
+            self.close_connection = True
+            self.respond(400, str(e))
+        finally:
+            backend.close()
+
+    def do_GET(self):
+        self.dispatch(self.get)
+
+    def do_POST(self):
+        self.dispatch(self.post)
+
+    def do_DELETE(self):
+        self.dispatch(self.delete)
+
+    def get(self, backend):
+        key = self.key()
+        if key is None:
+            self.respond(404, None)
+        else:
+            self.respond(200, backend.fetch(key))
+
+    def post(self, backend):
+        body = self.read_body()
+        if self.path == '/fetch':
+            self.respond(200, dict(
+                (key, backend.fetch(key)) for key in body
+            ))
+            return
+        key = self.key()
+        if key is None:
+            self.respond(404, None)
+            return
+        for value in body:
+            backend.save(key, value)
+        self.respond(200, None)
+
+    def delete(self, backend):
+        body = self.read_body()
+        key = self.key()
+        if key is None:
+            self.respond(404, None)
+            return
+        for value in body:
+            backend.delete(key, value)
+        self.respond(200, None)
+
+
+class ExampleServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, path, quiet=False):
+        HTTPServer.__init__(self, address, ExampleRequestHandler)
+        self.database_path = path
+        self.quiet = quiet
+
+
+def main():  # pragma: no cover
+    # argparse is new in Python 2.7, but this module is also imported by
+    # anything that uses the server on 2.6.
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Serve a Hypothesis example database over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('database')
+    args = parser.parse_args()
+    server = ExampleServer((args.host, args.port), args.database)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
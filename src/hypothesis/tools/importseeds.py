@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""Saves values from outside Hypothesis (e.g. payloads captured in
+production) to the example database, so that a test tries them before
+anything it generates itself:
+
+    python -m hypothesis.tools.importseeds tests.test_api.test_parse seeds.json
+
+The file contains either a JSON array or a Python literal list or tuple of
+values. If the test has a single generated argument each value is used for
+that argument, otherwise each value must be a dict mapping the names of the
+generated arguments to values.
+
+You can also save values for an arbitrary strategy under an arbitrary key
+(e.g. for use with find) with:
+
+    python -m hypothesis.tools.importseeds \\
+        --strategy mypackage.strategies.payloads --key payloads seeds.json
+
+Values which the strategy could not have generated are skipped. Only the
+strategies which know how to convert values back into templates (integers,
+booleans, text, lists, tuples, fixed_dictionaries, sampled_from, just and
+one_of and filter on top of those) are supported.
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import io
+import ast
+import sys
+import json
+
+from hypothesis.core import given_strategy, template_for_arguments
+from hypothesis.errors import NotInvertible, InvalidArgument
+from hypothesis.settings import Settings
+from hypothesis.tools.keepshrinking import load_test, import_module
+from hypothesis.searchstrategy.strategies import strategy
+
+
+def load_values(path, format='json'):
+    """Read the list of values in the file at path, which is either JSON or a
+    Python literal."""
+    with io.open(path, encoding='utf-8') as f:
+        contents = f.read()
+    if format == 'json':
+        values = json.loads(contents)
+    elif format == 'python':
+        values = ast.literal_eval(contents)
+    else:
+        raise ValueError('Unknown format %r' % (format,))
+    if not isinstance(values, (list, tuple)):
+        raise ValueError('Expected a list of values in %s but got %s' % (
+            path, type(values).__name__))
+    return list(values)
+
+
+def import_values(storage, search_strategy, values):
+    """Save every one of values that search_strategy could have produced to
+    storage.
+
+    Returns a list of the values that were skipped.
+
+    """
+    templates = []
+    skipped = []
+    for value in values:
+        try:
+            templates.append(search_strategy.template_for(value))
+        except NotInvertible:
+            skipped.append(value)
+    storage.save_many(templates, search_strategy)
+    return skipped
+
+
+def import_seeds(test, values):
+    """Save every one of values as an example for test, which must be
+    decorated with given, to its database.
+
+    Returns a list of the values that were skipped.
+
+    """
+    database = test.hypothesis_settings.database
+    if database is None:
+        raise ValueError('Cannot import seeds without a database')
+    storage = database.storage(test.hypothesis_database_key)
+    search_strategy = given_strategy(test)
+    names = list(test.hypothesis_argument_specifiers)
+    templates = []
+    skipped = []
+    for value in values:
+        if len(names) == 1:
+            arguments = {names[0]: value}
+        elif isinstance(value, dict):
+            arguments = value
+        else:
+            skipped.append(value)
+            continue
+        try:
+            templates.append(template_for_arguments(
+                test, arguments, search_strategy=search_strategy))
+        except (NotInvertible, InvalidArgument):
+            skipped.append(value)
+    storage.save_many(templates, search_strategy)
+    return skipped
+
+
+def load_object(name):
+    module, _, attribute = name.rpartition('.')
+    return getattr(import_module(module), attribute)
+
+
+def main():  # pragma: no cover
+    # argparse is new in Python 2.7, which we don't otherwise require.
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Save values to the example database for a test.')
+    parser.add_argument(
+        '--format', choices=('json', 'python'), default='json',
+        help='The format of the file of values.')
+    parser.add_argument(
+        '--strategy', default=None,
+        help='Dotted name of a strategy to use instead of a test.')
+    parser.add_argument(
+        '--key', default=None,
+        help='The database key to save under when using --strategy.')
+    parser.add_argument(
+        'test', nargs='?', default=None,
+        help='Dotted name of a test decorated with @given.')
+    parser.add_argument('values')
+    args = parser.parse_args()
+    sys.path.insert(0, '')
+    values = load_values(args.values, args.format)
+    if args.strategy is not None:
+        if args.key is None or args.test is not None:
+            parser.error('--strategy requires --key and no test')
+        storage = Settings.default.database.storage(args.key)
+        skipped = import_values(
+            storage, strategy(load_object(args.strategy)), values)
+    else:
+        if args.test is None:
+            parser.error('Either a test or --strategy is required')
+        skipped = import_seeds(load_test(args.test), values)
+    print('Saved %d values.' % (len(values) - len(skipped),))
+    for value in skipped:
+        print('Skipped %r' % (value,))
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+"""When a test decorated with @given runs out of time while simplifying a
+failing example, Hypothesis saves a checkpoint of how far it got in the
+example database and picks up from there on the next run. This command runs
+a single such test over and over until it has finished simplifying, so that
+you can get the minimal example without waiting on your whole test suite:
+
+    python -m hypothesis.tools.keepshrinking --timeout 60 tests.test_foo
+
+The test may be a module level function or a method on a test class (e.g.
+tests.TestFoo.test_foo), in which case the class will be
+instantiated with no arguments (or with the method name for a
+unittest.TestCase).
+
+"""
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import sys
+import unittest
+
+from hypothesis import Settings
+from hypothesis.database import checkpoint_key
+from hypothesis.reporting import silent, with_reporter
+
+
+class NotAHypothesisTest(Exception):
+    pass
+
+
+def import_module(name):
+    # We can't use importlib, which Python 2.6 doesn't have.
+    __import__(name)
+    return sys.modules[name]
+
+
+def load_test(name):
+    """Import the test with this dotted name, returning it as something we can
+    call with no arguments."""
+    parts = name.split('.')
+    for i in range(len(parts) - 1, 0, -1):
+        try:
+            target = import_module('.'.join(parts[:i]))
+        except ImportError:
+            continue
+        attributes = parts[i:]
+        break
+    else:
+        raise ValueError('Could not import any module for %r' % (name,))
+    owner = None
+    for attribute in attributes:
+        owner = target
+        target = getattr(target, attribute)
+    if isinstance(owner, type):
+        if issubclass(owner, unittest.TestCase):
+            instance = owner(attributes[-1])
+        else:
+            instance = owner()
+        target = getattr(instance, attributes[-1])
+    if not getattr(target, 'is_hypothesis_test', False):
+        raise NotAHypothesisTest('%s is not decorated with @given' % (name,))
+    return target
+
+
+def keep_shrinking(test, timeout=None, max_runs=100):
+    """Run test, which must be decorated with @given, until there is no
+    checkpoint left for it in its example database or it has been run
+    max_runs times. If timeout is not None, each run is limited to that
+    many seconds.
+
+    Returns True if shrinking finished.
+
+    """
+    # Attributes can't be set on a bound method, only on its function.
+    function = getattr(test, '__func__', test)
+    settings = function.hypothesis_settings
+    database = settings.database
+    if database is None:
+        raise ValueError('Cannot resume shrinking without a database')
+    key = checkpoint_key(test.hypothesis_database_key)
+    if timeout is not None:
+        function.hypothesis_settings = Settings(settings, timeout=timeout)
+    try:
+        for _ in range(max_runs):
+            database.clear_prefetched()
+            try:
+                with with_reporter(silent):
+                    test()
+            except Exception:
+                pass
+            else:
+                return True
+            if not database.fetch_data(key):
+                return True
+        return False
+    finally:
+        function.hypothesis_settings = settings
+
+
+def main():  # pragma: no cover
+    # argparse is new in Python 2.7, but we still support 2.6 everywhere
+    # outside this command.
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Continue simplifying the failing example for a test.')
+    parser.add_argument(
+        '--timeout', type=float, default=None,
+        help='Maximum number of seconds to spend on each run of the test.')
+    parser.add_argument(
+        '--max-runs', type=int, default=100,
+        help='Maximum number of times to run the test.')
+    parser.add_argument('test')
+    args = parser.parse_args()
+    sys.path.insert(0, '')
+    test = load_test(args.test)
+    if keep_shrinking(test, args.timeout, args.max_runs):
+        print('Finished simplifying. Running the test one last time:')
+        test()
+    else:
+        print('Gave up after %d runs without finishing simplifying.' % (
+            args.max_runs,
+        ))
+        sys.exit(1)
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
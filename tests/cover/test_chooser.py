@@ -20,8 +20,10 @@ from __future__ import division, print_function, absolute_import, \
 import random
 
 import pytest
+from hypothesis import given
 from hypothesis.errors import InvalidArgument
 from hypothesis.internal.chooser import chooser
+from hypothesis.strategies import lists, integers
 
 
 def test_cannot_choose_empty():
@@ -45,3 +47,45 @@ def test_cannot_choose_all_zero_weights():
 
 def test_can_choose_one():
     chooser([1]).choose(random) == 0
+
+
+class CountingRandom(random.Random):
+
+    def __init__(self, seed):
+        random.Random.__init__(self, seed)
+        self.calls = 0
+
+    def random(self):
+        self.calls += 1
+        return random.Random.random(self)
+
+
+def implied_probabilities(c):
+    n = len(c.probabilities)
+    result = [0.0] * n
+    for i in range(n):
+        result[i] += c.probabilities[i] / n
+        result[c.aliases[i]] += (1 - c.probabilities[i]) / n
+    return result
+
+
+@given(lists(integers(0, 255), min_size=1).filter(any))
+def test_alias_table_matches_weights(weights):
+    c = chooser(weights)
+    total = sum(weights)
+    for w, p in zip(weights, implied_probabilities(c)):
+        assert abs(w / total - p) < 1e-9
+
+
+def test_chooses_with_a_single_random_call():
+    rnd = CountingRandom(0)
+    c = chooser([1000] + [1] * 50)
+    for _ in range(100):
+        c.choose(rnd)
+    assert rnd.calls == 100
+
+
+def test_never_chooses_zero_weights():
+    rnd = random.Random(0)
+    c = chooser([0, 1, 0, 3, 0])
+    assert set(c.choose(rnd) for _ in range(1000)) == set([1, 3])
@@ -92,3 +92,56 @@ def test_settings_are_default_in_find():
     find(
         s.booleans(), lambda x: Settings.default is some_normal_settings,
         settings=some_normal_settings)
+
+
+def test_does_not_run_a_test_twice_on_the_same_value_if_asked():
+    seen = []
+
+    @given(s.integers(-1000, 1000).map(abs), settings=Settings(
+        deduplicate_values=True, max_examples=2000, max_iterations=5000,
+        database=None,
+    ))
+    def test_abs(x):
+        seen.append(x)
+
+    test_abs()
+    assert len(seen) == len(set(seen))
+    assert len(seen) > 900
+
+
+def test_deduplicates_values_for_test_methods():
+    class Tests(object):
+        @given(s.sampled_from([1, 1, 1, 2]), settings=Settings(
+            deduplicate_values=True, database=None))
+        def test_foo(self, x):
+            seen.append(x)
+
+    seen = []
+    Tests().test_foo()
+    assert sorted(seen) == [1, 2]
+
+
+def test_still_runs_duplicate_values_it_cannot_compare():
+    seen = []
+
+    @given(s.booleans().map(lambda b: object()), settings=Settings(
+        deduplicate_values=True, database=None))
+    def test_objects(x):
+        seen.append(x)
+
+    test_objects()
+    assert len(seen) == 2
+
+
+def test_find_can_deduplicate_values():
+    seen = []
+
+    def is_large(x):
+        seen.append(x)
+        return x >= 5
+
+    assert find(
+        s.integers(0, 20).map(lambda x: x // 2), is_large,
+        settings=Settings(deduplicate_values=True, database=None)
+    ) == 5
+    assert len(seen) == len(set(seen))
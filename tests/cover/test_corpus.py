@@ -0,0 +1,133 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import pytest
+from hypothesis import given, Settings
+from hypothesis.database import ExampleDatabase, corpus_key
+from hypothesis.strategies import lists, tuples, integers, \
+    fixed_dictionaries
+from hypothesis.internal.novelty import magnitude, structural_features
+
+
+def test_features_depend_on_structure_not_exact_values():
+    assert structural_features([1, [2, 'a']]) == \
+        structural_features([1, [3, 'b']])
+    assert structural_features([1, [2, 'a']]) != \
+        structural_features([1, [2, 'a', 'b', 'c']])
+    assert structural_features([1]) != structural_features([-1])
+    assert structural_features([1]) != structural_features([2 ** 40])
+
+
+@pytest.mark.parametrize('value', [
+    None, True, 1, 1.5, float('nan'), float('-inf'), '', [[], [[]]],
+])
+def test_features_of_atoms(value):
+    assert len(structural_features(value)) >= 1
+
+
+@pytest.mark.parametrize(('value', 'expected'), [
+    (0, 0), (1, 1), (-1, 1), (2, 2), (-3, 2), (255, 8), (-256, 9),
+    (2 ** 70, 71), (-(2 ** 70) + 1, 70), (0.5, 0), (-2.5, 2),
+])
+def test_magnitude_counts_binary_digits(value, expected):
+    assert magnitude(value) == expected
+
+
+def test_features_of_zero_and_negative_integers():
+    assert structural_features(0) == set([(0, 'int', False, 0)])
+    assert structural_features(-5) == set([(0, 'int', True, 3)])
+    assert structural_features(-5) != structural_features(5)
+
+
+def save(storage, strat, basic, max_size):
+    return storage.save_to_corpus(strat.from_basic(basic), strat, max_size)
+
+
+def test_only_saves_novel_examples_to_the_corpus():
+    strat = lists(integers())
+    storage = ExampleDatabase().storage('foo')
+    assert save(storage, strat, [[0, '1']], 10)
+    assert not save(storage, strat, [[0, '1']], 10)
+    assert not save(storage, strat, [[0, '2']], 10)
+    assert save(storage, strat, [[0, '1'], [0, '2']], 10)
+    assert len(list(storage.fetch_corpus(strat))) == 2
+
+
+def test_evicts_the_least_novel_entries():
+    strat = lists(integers())
+    storage = ExampleDatabase().storage('foo')
+    save(storage, strat, [[0, '1']], 2)
+    save(storage, strat, [[0, '1'], [0, '1']], 2)
+    save(storage, strat, [[0, '1048576']], 2)
+    corpus = [strat.reify(t) for t in storage.fetch_corpus(strat)]
+    assert sorted(corpus) == [[1, 1], [1048576]]
+
+
+def test_ignores_invalid_corpus_entries():
+    database = ExampleDatabase()
+    storage = database.storage('foo')
+    database.backend.save(storage.corpus_key, '[1]')
+    database.backend.save(storage.corpus_key, '[[1], "a"]')
+    database.backend.save(storage.corpus_key, '["a", 1]')
+    assert list(storage.fetch_corpus(lists(integers()))) == []
+
+
+def corpus_of(database, test):
+    return database.backend.fetch(corpus_key(test.hypothesis_database_key))
+
+
+def test_does_not_keep_a_corpus_by_default():
+    database = ExampleDatabase()
+
+    @given(lists(integers()), settings=Settings(database=database))
+    def test_passes(xs):
+        pass
+
+    test_passes()
+    assert corpus_of(database, test_passes) == []
+
+
+def test_keeps_a_bounded_corpus_of_passing_examples():
+    database = ExampleDatabase()
+
+    @given(lists(integers()), settings=Settings(
+        database=database, max_corpus_size=5))
+    def test_passes(xs):
+        pass
+
+    test_passes()
+    assert 1 <= len(corpus_of(database, test_passes)) <= 5
+
+
+def test_replays_the_corpus():
+    database = ExampleDatabase()
+    seen = []
+
+    @given(integers(), settings=Settings(
+        database=database, max_corpus_size=5))
+    def test_not_magic(x):
+        seen.append(x)
+        assert x != 123456789
+
+    storage = database.storage(test_not_magic.hypothesis_database_key)
+    strat = tuples(tuples(), fixed_dictionaries({'x': integers()}))
+    save(storage, strat, [[], [[0, '123456789']]], 5)
+    with pytest.raises(AssertionError):
+        test_not_magic()
+    assert seen[0] == 123456789
@@ -0,0 +1,191 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import sys
+from random import Random
+
+import pytest
+from hypothesis import find, Settings
+from hypothesis.errors import NoSuchExample
+from hypothesis.strategies import lists, tuples, booleans, integers
+from hypothesis.internal.tracing import BranchCollector
+from hypothesis.searchstrategy.plans import compiled
+from hypothesis.internal.examplesource import ParameterSource
+
+
+def sign(x):
+    if x < 0:
+        return -1
+    elif x > 0:
+        return 1
+    return 0
+
+
+def branches_of(f, *args):
+    with BranchCollector() as collector:
+        f(*args)
+    return collector.branches
+
+
+def test_collects_different_branches_for_different_paths():
+    assert branches_of(sign, -1) != branches_of(sign, 1)
+    assert branches_of(sign, 1) == branches_of(sign, 2)
+    assert all(
+        filename == sign.__code__.co_filename
+        for filename, _, _ in branches_of(sign, 0)
+    )
+
+
+def test_does_not_trace_hypothesis_itself():
+    assert branches_of(integers().example) == set()
+
+
+def test_does_not_trace_code_hypothesis_generates():
+    strat = compiled(lists(integers()))
+    template = strat.draw_and_produce(Random(0))
+    assert branches_of(strat.reify, template) == set()
+
+
+def test_restores_the_previous_tracer():
+    def tracer(frame, event, arg):
+        return None
+
+    original = sys.gettrace()
+    sys.settrace(tracer)
+    try:
+        branches_of(sign, 1)
+        assert sys.gettrace() is tracer
+    finally:
+        sys.settrace(original)
+
+
+def test_cannot_mark_good_before_starting():
+    source = ParameterSource(random=Random(), strategy=booleans())
+    with pytest.raises(ValueError):
+        source.mark_good()
+
+
+def test_marking_good_extends_the_life_of_a_parameter():
+    source = ParameterSource(
+        random=Random(), strategy=booleans(), max_tries=2)
+    parameter = source.pick_a_parameter()
+    for _ in range(10):
+        source.mark_good()
+        assert source.pick_a_parameter() is parameter
+
+
+def test_goes_back_to_good_seeds():
+    source = ParameterSource(
+        random=Random(0), strategy=booleans(), max_tries=1)
+    source.pick_a_parameter()
+    good_seed = source.current_seed
+    source.mark_good()
+    seeds = []
+    for _ in range(100):
+        source.pick_a_parameter()
+        source.pick_a_parameter()
+        seeds.append(source.current_seed)
+    assert 20 <= seeds.count(good_seed) <= 80
+
+
+def is_fuzz(s):
+    if len(s) >= 4:
+        if s[0] == 'f':
+            if s[1] == 'u':
+                if s[2] == 'z':
+                    if s[3] == 'z':
+                        return True
+    return False
+
+
+def test_each_level_of_nested_branches_is_new_coverage():
+    # This is what coverage guidance relies on to work its way into is_fuzz:
+    # each example which gets one letter further runs code none of the
+    # examples before it did.
+    coverage = set()
+    for s in ('', 'aaaa', 'faaa', 'fuaa', 'fuza', 'fuzz'):
+        branches = branches_of(is_fuzz, s)
+        assert not branches.issubset(coverage)
+        coverage.update(branches)
+
+
+def test_examples_on_an_already_covered_path_are_not_new_coverage():
+    coverage = branches_of(is_fuzz, 'fuaa')
+    for s in ('fubb', 'fuvwxyz', 'fu\u2603a'):
+        assert branches_of(is_fuzz, s).issubset(coverage)
+
+
+def test_finds_examples_with_coverage_guidance():
+    assert find(
+        integers(), lambda x: sign(x) == 1,
+        settings=Settings(coverage_guided=True, database=None),
+    ) == 1
+
+
+def alternates(xs):
+    if xs[0]:
+        if not xs[1]:
+            if xs[2]:
+                if not xs[3]:
+                    if xs[4]:
+                        if not xs[5]:
+                            if xs[6]:
+                                if not xs[7]:
+                                    if xs[8]:
+                                        if not xs[9]:
+                                            if xs[10]:
+                                                if not xs[11]:
+                                                    if xs[12]:
+                                                        if not xs[13]:
+                                                            if xs[14]:
+                                                                if not xs[15]:
+                                                                    return True
+    return False
+
+
+def count_calls_to_find(coverage_guided):
+    calls = [0]
+
+    def condition(xs):
+        calls[0] += 1
+        return alternates(xs)
+
+    settings = Settings(
+        coverage_guided=coverage_guided, max_examples=5000,
+        max_iterations=10000, max_shrinks=0, database=None, timeout=-1,
+    )
+    try:
+        find(
+            tuples(*[booleans()] * 16), condition,
+            settings=settings, random=Random(6),
+        )
+    except NoSuchExample:
+        return None
+    return calls[0]
+
+
+def test_coverage_guidance_finds_deeply_nested_branches():
+    # A random tuple only matches alternates one time in 2 ** 16, so without
+    # guidance the budget below is nowhere near enough. With guidance every
+    # extra level matched is new coverage and gets mutated further, which
+    # with this seed reaches the return True in under a thousand calls.
+    assert count_calls_to_find(coverage_guided=False) is None
+    guided = count_calls_to_find(coverage_guided=True)
+    assert guided is not None
+    assert guided <= 2000
@@ -22,11 +22,14 @@ import time
 import pytest
 import hypothesis.settings as hs
 from hypothesis import given, assume, strategy
+from hypothesis.core import prefetch_examples
 from hypothesis.errors import Timeout, Unsatisfiable
-from hypothesis.database import ExampleDatabase
+from hypothesis.database import ExampleDatabase, corpus_key, \
+    metadata_key, checkpoint_key, parameters_key
 from hypothesis.strategies import text, integers
 from hypothesis.internal.compat import hrange, text_type, integer_types
-from hypothesis.database.backend import Backend, SQLiteBackend
+from hypothesis.database.backend import Backend, SQLiteBackend, \
+    LayeredBackend
 from hypothesis.database.formats import Format, JSONFormat
 
 
@@ -256,3 +259,208 @@ def test_can_handle_more_than_max_iterations_in_db():
         assert len(seen) == 2
     finally:
         db.close()
+
+
+def test_replays_failures_from_a_read_only_tier():
+    shared = ExampleDatabase()
+    local = ExampleDatabase(backend=LayeredBackend(
+        SQLiteBackend(), read_only=[shared.backend]
+    ))
+    try:
+        @given(integers(), settings=hs.Settings(database=shared))
+        def test_shared(x):
+            assert x < 1000
+        with pytest.raises(AssertionError):
+            test_shared()
+
+        seen = []
+
+        @given(integers(), settings=hs.Settings(database=local))
+        def test_shared(x):
+            seen.append(x)
+            assert x < 1000
+        with pytest.raises(AssertionError):
+            test_shared()
+        assert seen[0] == 1000
+        assert list(local.backend.writable.keys())
+    finally:
+        local.close()
+
+
+def test_prefetched_storage_does_not_touch_the_backend():
+    database = ExampleDatabase()
+    strat = text()
+    database.storage('foo').save(('a',), strat)
+    database.prefetch(['foo', 'bar'])
+    database.backend.save('foo', '["b"]')
+    assert list(database.storage('foo').fetch(strat)) == [('a',)]
+    database.storage('foo').save(('c',), strat)
+    database.storage('bar').save(('d',), strat)
+    assert list(database.storage('foo').fetch(strat)) == [('c',), ('a',)]
+    assert list(database.storage('bar').fetch(strat)) == [('d',)]
+    database.clear_prefetched()
+    assert sorted(database.storage('foo').fetch(strat)) == [
+        ('a',), ('b',), ('c',)]
+
+
+def test_prefetch_examples_loads_keys_for_given_tests():
+    database = ExampleDatabase()
+
+    @given(integers(), settings=hs.Settings(database=database))
+    def test_is_prefetched(x):
+        pass
+
+    @given(integers(), settings=hs.Settings(database=None))
+    def test_has_no_database(x):
+        pass
+
+    def test_is_not_given():
+        pass
+
+    key = test_is_prefetched.hypothesis_database_key
+    database.backend.save(key, '[1]')
+    prefetch_examples([test_is_prefetched, test_has_no_database,
+                       test_is_not_given, None])
+    assert sorted(database.prefetched) == sorted([
+        key, checkpoint_key(key), metadata_key(key, '[1]'),
+        parameters_key(key), corpus_key(key),
+    ])
+
+
+def test_replays_most_recent_failures_first():
+    database = ExampleDatabase()
+    strat = text()
+    for s in ['aaa', 'b', 'cc']:
+        database.storage('foo').save(tuple(s), strat)
+        time.sleep(0.01)
+    assert list(database.storage('foo').fetch(strat)) == [
+        ('c', 'c'), ('b',), ('a', 'a', 'a')]
+    database.storage('foo').save(('b',), strat)
+    assert list(database.storage('foo').fetch(strat)) == [
+        ('b',), ('c', 'c'), ('a', 'a', 'a')]
+
+
+def test_replays_smallest_first_without_failure_history():
+    database = ExampleDatabase()
+    strat = text()
+    for s in ['aaa', 'b', 'cc']:
+        database.backend.save('foo', JSONFormat().serialize_basic(
+            strat.to_basic(tuple(s))))
+    assert list(database.storage('foo').fetch(strat)) == [
+        ('b',), ('c', 'c'), ('a', 'a', 'a')]
+
+
+def test_counts_failures_once_per_storage():
+    database = ExampleDatabase()
+    strat = text()
+    for _ in hrange(3):
+        storage = database.storage('foo')
+        storage.save(('a',), strat)
+        storage.record_failure(('a',), strat)
+        storage.save(('a',), strat)
+    _, failure_count = database.storage('foo').failure_history(('a',), strat)
+    assert failure_count == 3
+
+
+def test_recording_a_failure_does_not_save_the_example_again():
+    database = ExampleDatabase()
+    strat = text()
+    storage = database.storage('foo')
+    storage.save(('a',), strat)
+    data, = database.backend.fetch('foo')
+    database.backend.delete('foo', data)
+    database.storage('foo').record_failure(('a',), strat)
+    assert not list(database.backend.fetch('foo'))
+    _, failure_count = storage.failure_history(('a',), strat)
+    assert failure_count == 2
+
+
+def serialized(database, strat, value):
+    return database.format.serialize_basic(strat.to_basic(value))
+
+
+def test_saving_only_touches_the_metadata_of_the_saved_example():
+    database = ExampleDatabase()
+    strat = text()
+    storage = database.storage('foo')
+    storage.save(('a',), strat)
+    fetched = []
+    fetch_data = database.fetch_data
+
+    def recording_fetch_data(key):
+        fetched.append(key)
+        return fetch_data(key)
+    database.fetch_data = recording_fetch_data
+    storage.save(('b',), strat)
+    assert fetched == [
+        metadata_key('foo', serialized(database, strat, ('b',)))]
+
+
+def test_ignores_invalid_metadata():
+    database = ExampleDatabase()
+    strat = text()
+    storage = database.storage('foo')
+    storage.save(('a',), strat)
+    key = metadata_key('foo', serialized(database, strat, ('a',)))
+    for junk in ['[', '1', '["x", 1]', '[1, null]', '[1, 2, 3]']:
+        database.backend.save(key, junk)
+    assert list(storage.fetch(strat)) == [('a',)]
+    assert storage.failure_history(('a',), strat)[1] == 1
+
+
+def test_replays_the_most_recent_failure_first():
+    database = ExampleDatabase()
+    seen = []
+    try:
+        for limit in [300, 200, 100]:
+            @given(integers(), settings=hs.Settings(database=database))
+            def test_limit(x):
+                seen.append(x)
+                assert x < limit
+            with pytest.raises(AssertionError):
+                test_limit()
+            time.sleep(0.01)
+        seen = []
+        with pytest.raises(AssertionError):
+            test_limit()
+        assert seen[0] == 100
+    finally:
+        database.close()
+
+
+def test_keeps_a_bounded_number_of_parameter_seeds():
+    database = ExampleDatabase()
+    storage = database.storage('foo')
+    assert storage.max_parameter_seeds == 10
+    for i in hrange(15):
+        storage.save_parameter_seed(i, i / 20)
+        time.sleep(0.001)
+    storage.save_parameter_seed(10, 1.0)
+    seeds = storage.fetch_parameter_seeds()
+    assert [seed for seed, _ in seeds] == [10, 14, 13, 12, 11, 9, 8, 7, 6, 5]
+    assert seeds[:2] == [(10, 1.0), (14, 0.7)]
+    assert len(database.backend.fetch(storage.parameters_key)) == len(seeds)
+
+
+def test_ignores_invalid_parameter_seeds():
+    database = ExampleDatabase()
+    storage = database.storage('foo')
+    storage.save_parameter_seed(1, 0.5)
+    for junk in [
+        '[', '[1]', '["a", 1, 1]', '[1, null, 1]', '[1, 1, 2]', '[1, 1]',
+    ]:
+        database.backend.save(storage.parameters_key, junk)
+    assert storage.fetch_parameter_seeds() == [(1, 0.5)]
+
+
+def test_saves_the_seed_of_the_parameter_that_found_a_failure():
+    database = ExampleDatabase()
+
+    @given(integers(), settings=hs.Settings(database=database))
+    def test_small(x):
+        assert x < 1000
+
+    with pytest.raises(AssertionError):
+        test_small()
+    storage = database.storage(test_small.hypothesis_database_key)
+    assert len(storage.fetch_parameter_seeds()) == 1
@@ -17,11 +17,12 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+import pytest
 from hypothesis import given
 from tests.common import settings as small_settings
 from hypothesis.strategies import text, lists, tuples
-from hypothesis.internal.compat import PY26, hrange
-from hypothesis.database.backend import SQLiteBackend
+from hypothesis.internal.compat import PY26, hrange, text_type
+from hypothesis.database.backend import LayeredBackend, SQLiteBackend
 
 if PY26:
     alphabet = [chr(i) for i in hrange(128)]
@@ -82,3 +83,96 @@ def test_can_fetch_all_keys():
     backend.save('foo', 'baz')
     backend.save('boib', 'baz')
     assert len(list(backend.keys())) == 2
+
+
+class ObjectBackend(SQLiteBackend):
+
+    def data_type(self):
+        return object
+
+
+def layered(*shared_contents):
+    shared = []
+    for contents in shared_contents:
+        backend = SQLiteBackend(':memory:')
+        for key, value in contents:
+            backend.save(key, value)
+        shared.append(backend)
+    return LayeredBackend(SQLiteBackend(':memory:'), shared)
+
+
+def test_layered_backend_reads_from_every_tier_in_order():
+    backend = layered([('foo', 'b')], [('foo', 'c')])
+    backend.save('foo', 'a')
+    assert backend.fetch('foo') == ['a', 'b', 'c']
+
+
+def test_layered_backend_deduplicates_values():
+    backend = layered([('foo', 'a'), ('foo', 'b')], [('foo', 'b')])
+    backend.save('foo', 'a')
+    assert backend.fetch('foo') == ['a', 'b']
+
+
+def test_layered_backend_only_writes_to_writable_tier():
+    backend = layered([('foo', 'a')])
+    backend.save('foo', 'b')
+    backend.delete('foo', 'a')
+    assert backend.writable.fetch('foo') == ['b']
+    assert backend.read_only[0].fetch('foo') == ['a']
+    assert backend.fetch('foo') == ['b', 'a']
+
+
+def test_layered_backend_caches_read_only_tiers():
+    backend = layered([('foo', 'a')])
+    assert backend.fetch('foo') == ['a']
+    backend.read_only[0].save('foo', 'b')
+    assert backend.fetch('foo') == ['a']
+
+
+def test_layered_backend_rejects_inconsistent_data_types():
+    with pytest.raises(ValueError):
+        LayeredBackend(SQLiteBackend(':memory:'), [ObjectBackend()])
+
+
+def test_layered_backend_has_tiers_in_repr():
+    assert repr(layered([])) == (
+        'LayeredBackend(SQLiteBackend(:memory:), [SQLiteBackend(:memory:)])'
+    )
+
+
+def test_closing_layered_backend_closes_all_tiers():
+    backend = layered([('foo', 'a')])
+    backend.close()
+    backend.close()
+
+
+def test_fetch_many_returns_every_key():
+    backend = SQLiteBackend(':memory:')
+    backend.save('foo', 'a')
+    backend.save('foo', 'b')
+    backend.save('bar', 'c')
+    result = backend.fetch_many(['foo', 'bar', 'baz'])
+    assert sorted(result['foo']) == ['a', 'b']
+    assert result['bar'] == ['c']
+    assert result['baz'] == []
+
+
+def test_fetch_many_handles_more_keys_than_fit_in_one_query():
+    backend = SQLiteBackend(':memory:')
+    keys = [text_type(i) for i in hrange(backend.max_keys_per_query * 2 + 1)]
+    for key in keys:
+        backend.save(key, key)
+    result = backend.fetch_many(keys)
+    assert len(result) == len(keys)
+    for key in keys:
+        assert result[key] == [key]
+
+
+def test_layered_backend_fetch_many_agrees_with_fetch():
+    backend = layered([('foo', 'b'), ('bar', 'c')], [('foo', 'c')])
+    backend.save('foo', 'a')
+    backend.save('foo', 'b')
+    keys = ['foo', 'bar', 'baz']
+    assert backend.fetch_many(keys) == dict(
+        (key, backend.fetch(key)) for key in keys
+    )
@@ -44,3 +44,27 @@ def test_non_empty_of_10():
 def test_non_empty_with_explicit_activation_chance():
     assert len(dist.non_empty_subset(
         random, range(100), activation_chance=0.99)) > 2
+
+
+def test_non_empty_with_certain_activation_takes_everything():
+    assert dist.non_empty_subset(
+        random, range(5), activation_chance=1) == list(range(5))
+
+
+def test_non_empty_with_tiny_activation_chance_is_still_non_empty():
+    for _ in range(100):
+        assert len(dist.non_empty_subset(
+            random, range(3), activation_chance=1e-10)) == 1
+
+
+def test_non_empty_subsets_are_uniform_given_they_are_non_empty():
+    rnd = random.Random(0)
+    counts = {}
+    n = 7000
+    for _ in range(n):
+        subset = tuple(dist.non_empty_subset(
+            rnd, range(3), activation_chance=0.5))
+        counts[subset] = counts.get(subset, 0) + 1
+    assert len(counts) == 7
+    for count in counts.values():
+        assert 800 <= count <= 1200
@@ -0,0 +1,113 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+
+import pytest
+from hypothesis import find, given, assume, Settings
+from hypothesis.core import find_satisfying_value
+from hypothesis.errors import Unsatisfiable, NoSuchExample, \
+    UnsatisfiedAssumption
+from hypothesis.strategies import just, sets, text, lists, binary, floats, \
+    tuples, booleans, integers, frozensets, dictionaries, sampled_from, \
+    fixed_dictionaries
+
+fast = Settings(max_shrinks=0, database=None)
+
+
+@pytest.mark.parametrize('strat', [
+    integers(), floats(), text(), binary(), booleans(), just(1),
+    sampled_from(('a', 'b', 'c')),
+    lists(integers()), lists(booleans() | text()), lists(just(None)),
+    tuples(integers(), floats(), text()),
+    sets(integers()), frozensets(text()),
+    dictionaries(integers(), text()),
+    fixed_dictionaries({'a': integers(), 'b': lists(floats())}),
+    integers().map(lambda x: x * 2),
+    integers().filter(lambda x: x % 3 != 0),
+    integers().flatmap(lambda n: lists(just(n))),
+])
+def test_draws_the_same_values_as_reifying_templates(strat):
+    for i in range(100):
+        parameter = strat.draw_parameter(Random(i))
+        try:
+            expected = repr(strat.reify(strat.draw_template(
+                Random(i), parameter)))
+        except UnsatisfiedAssumption:
+            expected = UnsatisfiedAssumption
+        try:
+            value = repr(strat.draw_value(Random(i), parameter))
+        except UnsatisfiedAssumption:
+            value = UnsatisfiedAssumption
+        assert value == expected
+
+
+def test_finds_values_directly():
+    assert find_satisfying_value(
+        integers(), Random(0), lambda x: x > 100, fast) > 100
+
+
+def test_raises_no_such_example_without_any_duplicate_tracking():
+    calls = []
+
+    def condition(x):
+        calls.append(x)
+        return False
+
+    with pytest.raises(NoSuchExample):
+        find_satisfying_value(
+            booleans(), Random(0), condition,
+            Settings(max_shrinks=0, database=None, max_examples=50),
+        )
+    assert len(calls) == 50
+
+
+def test_raises_unsatisfiable_when_all_values_rejected():
+    def condition(x):
+        assume(False)
+
+    with pytest.raises(Unsatisfiable):
+        find_satisfying_value(integers(), Random(0), condition, fast)
+
+
+def test_given_without_shrinking_runs_values_directly():
+    seen = []
+
+    @given(lists(integers()), settings=fast)
+    def test_no_large_lists(xs):
+        seen.append(xs)
+        assert len(xs) < 10
+
+    with pytest.raises(AssertionError):
+        test_no_large_lists()
+    assert len(seen[-1]) >= 10
+
+
+def test_given_without_shrinking_still_checks_assumptions():
+    @given(integers(), settings=fast)
+    def test_nothing(x):
+        assume(False)
+
+    with pytest.raises(Unsatisfiable):
+        test_nothing()
+
+
+def test_find_without_shrinking_returns_the_first_value_found():
+    assert find(
+        integers(), lambda x: x > 1000, settings=fast) > 1000
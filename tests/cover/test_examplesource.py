@@ -21,8 +21,9 @@ import random
 from itertools import islice
 
 import pytest
-from hypothesis.strategies import integers
+from hypothesis.strategies import lists, integers, booleans
 from hypothesis.internal.compat import hrange
+from hypothesis.internal.sizing import size_scale
 from hypothesis.internal.examplesource import ParameterSource
 
 N_EXAMPLES = 25000
@@ -89,3 +90,35 @@ def test_errors_if_you_mark_bad_before_fetching():
     )
     with pytest.raises(ValueError):
         source.mark_bad()
+
+
+def test_tries_seeded_parameters_first():
+    strat = booleans()
+    seeds = [1, 2, 3]
+    source = ParameterSource(
+        random=random.Random(),
+        strategy=strat,
+        seeds=[(seed, 1.0) for seed in seeds],
+    )
+    for seed in seeds:
+        assert source.pick_a_parameter() == strat.draw_parameter(
+            random.Random(seed))
+        assert source.current_seed == seed
+        source.mark_bad()
+    source.pick_a_parameter()
+    assert source.current_seed not in seeds
+
+
+def test_replays_seeds_at_the_scale_they_were_drawn_at():
+    strat = lists(booleans())
+    with size_scale(0.1):
+        source = ParameterSource(random=random.Random(0), strategy=strat)
+        parameter = source.pick_a_parameter()
+    assert source.current_scale == 0.1
+    replay = ParameterSource(
+        random=random.Random(1), strategy=strat,
+        seeds=[(source.current_seed, source.current_scale)],
+    )
+    assert repr(replay.pick_a_parameter()) == repr(parameter)
+    assert repr(strat.draw_parameter(random.Random(source.current_seed))) != \
+        repr(parameter)
@@ -17,11 +17,16 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+from random import Random
+
 import pytest
 from hypothesis import Settings, given, assume
-from hypothesis.errors import Unsatisfiable
+from hypothesis.core import find_satisfying_template
+from hypothesis.errors import Unsatisfiable, DefinitelyNoSuchExample
 from hypothesis.database import ExampleDatabase
-from hypothesis.strategies import tuples, booleans
+from hypothesis.strategies import sets, just, lists, one_of, tuples, \
+    booleans, integers, sampled_from
+from hypothesis.internal.tracker import Tracker
 
 
 def test_finite_space_errors_if_all_unsatisfiable():
@@ -54,3 +59,79 @@ def test_finite_test_does_not_fail_if_example_comes_from_db():
     is_bad[0] = False
 
     is_not_bad()
+
+
+@pytest.mark.parametrize('strat', [
+    booleans(),
+    just(1),
+    sampled_from(range(10)),
+    integers(min_value=-5, max_value=5),
+    tuples(booleans(), integers(min_value=0, max_value=3)),
+    one_of(booleans(), sampled_from('abc'), just(None)),
+    integers(min_value=0, max_value=10).map(lambda x: x * 2),
+    sets(booleans()),
+    sets(sampled_from(range(4))),
+    lists(booleans(), max_size=0),
+])
+def test_enumerates_every_value_of_a_small_strategy(strat):
+    templates = list(strat.all_templates())
+    assert len(templates) <= strat.template_upper_bound
+    values = [strat.reify(t) for t in templates]
+    for _ in range(100):
+        assert strat.example() in values
+
+
+@pytest.mark.parametrize('strat', [
+    integers(),
+    lists(booleans()),
+    tuples(booleans(), integers()),
+    one_of(booleans(), integers()),
+    lists(tuples()),
+])
+def test_does_not_enumerate_infinite_strategies(strat):
+    assert strat.all_templates() is None
+
+
+def test_tries_each_template_exactly_once():
+    strat = tuples(integers(min_value=0, max_value=9), booleans())
+    calls = []
+
+    def condition(template):
+        calls.append(template)
+        return False
+
+    with pytest.raises(DefinitelyNoSuchExample):
+        find_satisfying_template(
+            strat, Random(0), condition, Tracker(),
+            Settings(max_examples=100, database=None),
+        )
+    assert len(calls) == 20
+    assert len(set(calls)) == 20
+
+
+def test_only_tries_each_set_once():
+    strat = sets(sampled_from(range(5)))
+    calls = []
+
+    def condition(template):
+        calls.append(strat.reify(template))
+        return False
+
+    with pytest.raises(DefinitelyNoSuchExample):
+        find_satisfying_template(
+            strat, Random(0), condition, Tracker(),
+            Settings(max_examples=1000, database=None),
+        )
+    assert len(calls) == 2 ** 5
+
+
+def test_given_runs_every_value_of_a_small_space():
+    seen = []
+
+    @given(integers(min_value=0, max_value=99), settings=Settings(
+        max_examples=100, database=None))
+    def test_a_small_space(x):
+        seen.append(x)
+
+    test_a_small_space()
+    assert sorted(seen) == list(range(100))
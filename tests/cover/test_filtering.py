@@ -18,8 +18,11 @@ from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
 import pytest
-from hypothesis import given
-from hypothesis.strategies import lists, integers
+from hypothesis import find, given, Settings
+from hypothesis.strategies import text, lists, floats, integers
+from hypothesis.internal.filtering import narrowed_floats, constraints_for
+from hypothesis.searchstrategy.numbers import BoundedIntStrategy, \
+    IntegersFromStrategy
 
 
 @pytest.mark.parametrize(('specifier', 'condition'), [
@@ -32,3 +35,105 @@ def test_filter_correctly(specifier, condition):
         assert condition(x)
 
     test_is_filtered()
+
+
+def test_filter_correctly_with_narrowed_strategies():
+    # These all get turned into strategies which mostly generate values that
+    # satisfy the filter, but the filter must still be applied.
+    cases = [
+        (integers(), lambda x: x > 1000),
+        (integers(), lambda x: 10 > x),
+        (integers(), lambda x: 0 <= x < 10 and x % 3 == 1),
+        (integers(), lambda x: x % 7 == 0),
+        (integers(min_value=5), lambda x: x < 100.5),
+        (integers(min_value=0, max_value=100), lambda x: x >= 50),
+        (floats(), lambda x: x >= 0.5),
+        (floats(), lambda x: -1 < x < 1),
+        (floats(min_value=0, max_value=10), lambda x: x <= 1),
+        (lists(integers()), lambda xs: len(xs) >= 3),
+        (lists(integers(), max_size=10), lambda xs: 5 <= len(xs)),
+        (text(), lambda s: len(s) > 5),
+    ]
+    for strat, condition in cases:
+        @given(strat.filter(condition), settings=Settings(max_examples=100))
+        def test_is_filtered(x):
+            assert condition(x)
+
+        test_is_filtered()
+
+
+def test_narrows_integers_to_the_filtered_range():
+    strat = integers().filter(lambda x: x > 1000).mapped_strategy
+    assert isinstance(strat, IntegersFromStrategy)
+    assert strat.lower_bound == 1001
+    strat = integers().filter(lambda x: -10 <= x <= 10.5).mapped_strategy
+    assert isinstance(strat, BoundedIntStrategy)
+    assert (strat.start, strat.end) == (-10, 10)
+
+
+def test_narrows_lengths_of_lists():
+    strat = lists(integers()).filter(lambda xs: len(xs) >= 3).mapped_strategy
+    assert strat.min_size == 3
+    strat = lists(integers()).filter(lambda xs: len(xs) == 0).mapped_strategy
+    assert strat.template_upper_bound == 1
+
+
+def test_narrowing_lists_keeps_their_average_size():
+    base = lists(integers(), average_size=50)
+    strat = base.filter(lambda xs: len(xs) >= 1).mapped_strategy
+    assert (strat.min_size, strat.average_length) == (1, 50)
+    base = text(average_size=50)
+    strat = base.filter(lambda s: len(s) <= 100).mapped_strategy
+    strat = strat.mapped_strategy
+    assert (strat.max_size, strat.average_length) == (100, 50)
+
+
+def test_narrowing_integers_keeps_their_average_size():
+    base = IntegersFromStrategy(0, average_size=5)
+    strat = base.filter(lambda x: x >= 3).mapped_strategy
+    assert isinstance(strat, IntegersFromStrategy)
+    assert (strat.lower_bound, strat.average_size) == (3, 5)
+    base = IntegersFromStrategy(0, average_size=50)
+    strat = base.filter(lambda x: x % 10 == 0).mapped_strategy
+    assert strat.mapped_strategy.average_size == 5
+
+
+def test_does_not_bound_integers_with_a_custom_average_size():
+    base = IntegersFromStrategy(0, average_size=5)
+    assert base.filter(lambda x: x < 1000).mapped_strategy is base
+    base = IntegersFromStrategy(0)
+    strat = base.filter(lambda x: x < 1000).mapped_strategy
+    assert isinstance(strat, BoundedIntStrategy)
+
+
+def test_can_find_values_that_would_be_hard_to_hit_by_chance():
+    assert find(
+        integers().filter(lambda x: x % 1000 == 999 and x > 1000000),
+        lambda x: True,
+    ) == 1000999
+    assert find(
+        lists(integers()).filter(lambda xs: len(xs) >= 100),
+        lambda xs: True,
+    ) == [0] * 100
+
+
+def test_does_not_narrow_filters_it_does_not_understand():
+    strat = integers()
+    assert strat.filter(lambda x: x != 3).mapped_strategy is strat
+    assert strat.filter(lambda x: x > 3 or x < -3).mapped_strategy is strat
+    assert strat.filter(bool).mapped_strategy is strat
+    bound = 3
+    assert strat.filter(lambda x: x > bound).mapped_strategy is strat
+
+
+def test_constraints_ignore_parts_of_an_and_they_do_not_understand():
+    constraints = constraints_for(lambda x: x > 1 and x != 5 and len(x) < 3)
+    assert constraints.integer_bounds() == (2, None)
+    assert constraints.integer_size_bounds() == (None, 2)
+
+
+def test_float_bounds_at_zero_allow_both_zeroes():
+    assert constraints_for(lambda x: x >= 0).float_bounds() == (-0.0, None)
+    assert str(constraints_for(lambda x: x >= 0).float_bounds()[0]) == '-0.0'
+    assert constraints_for(lambda x: x == 0) is not None
+    assert narrowed_floats(constraints_for(lambda x: x == 0)) is None
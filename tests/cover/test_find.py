@@ -24,7 +24,7 @@ import pytest
 from hypothesis import Settings, find
 from hypothesis.errors import Timeout, NoSuchExample, \
     DefinitelyNoSuchExample
-from hypothesis.strategies import lists, floats, booleans, integers, \
+from hypothesis.strategies import sets, lists, floats, booleans, integers, \
     streaming, dictionaries
 
 
@@ -70,6 +70,15 @@ def test_raises_more_specifically_when_exhausted():
         find(booleans(), lambda x: False)
 
 
+@pytest.mark.parametrize('strategy', [
+    sets(booleans()), sets(integers(0, 3)), sets(booleans(), max_size=1),
+])
+def test_raises_more_specifically_when_sets_are_exhausted(strategy):
+    with pytest.raises(DefinitelyNoSuchExample) as e:
+        find(strategy, lambda x: False)
+    assert 'lambda x:' in e.value.args[0]
+
+
 def test_condition_is_name():
     settings = Settings(
         max_examples=20,
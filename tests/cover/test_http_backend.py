@@ -0,0 +1,260 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import os
+import threading
+
+import pytest
+from hypothesis import given, Settings
+from hypothesis.database import ExampleDatabase
+from hypothesis.strategies import integers
+from hypothesis.database.backend import HTTPBackend, SQLiteBackend
+from hypothesis.tools.exampleserver import ExampleServer
+
+try:
+    from http.client import HTTPConnection
+except ImportError:  # pragma: no cover
+    from httplib import HTTPConnection
+
+
+@pytest.yield_fixture
+def server(tmpdir):
+    server = ExampleServer(
+        ('127.0.0.1', 0), str(tmpdir.join('server.db')), quiet=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url_of(server):
+    return 'http://127.0.0.1:%d' % (server.server_address[1],)
+
+
+@pytest.yield_fixture
+def backend(server, tmpdir):
+    backend = HTTPBackend(url_of(server), str(tmpdir.join('cache.db')))
+    yield backend
+    backend.close()
+
+
+def test_saves_are_visible_to_other_clients(server, backend, tmpdir):
+    backend.save('foo', 'bar')
+    backend.save('foo', 'baz')
+    backend.save('føø/?', 'bar')
+    backend.flush()
+    other = HTTPBackend(url_of(server), str(tmpdir.join('other.db')))
+    try:
+        values = other.fetch_many(['foo', 'føø/?'])
+        assert sorted(values['foo']) == ['bar', 'baz']
+        assert values['føø/?'] == ['bar']
+    finally:
+        other.close()
+
+
+def test_deletes_are_visible_to_other_clients(server, backend, tmpdir):
+    backend.save('foo', 'bar')
+    backend.save('foo', 'baz')
+    backend.delete('foo', 'bar')
+    backend.flush()
+    other = HTTPBackend(url_of(server), str(tmpdir.join('other.db')))
+    try:
+        assert other.fetch_many(['foo']) == {'foo': ['baz']}
+    finally:
+        other.close()
+
+
+def test_falls_back_to_the_cache_when_the_server_goes_away(server, tmpdir):
+    cache = str(tmpdir.join('cache.db'))
+    backend = HTTPBackend(url_of(server), cache)
+    backend.save('foo', 'bar')
+    backend.close()
+    server.shutdown()
+    server.server_close()
+    backend = HTTPBackend(url_of(server), cache)
+    try:
+        assert backend.fetch('foo') == ['bar']
+    finally:
+        backend.close()
+
+
+def test_prefetched_keys_do_not_hit_the_server(server, backend):
+    backend.save('foo', 'bar')
+    backend.flush()
+    backend.fresh_keys.clear()
+    assert backend.fetch_many(['foo', 'baz']) == {'foo': ['bar'], 'baz': []}
+    server.shutdown()
+    assert backend.fetch('foo') == ['bar']
+    assert backend.fetch('baz') == []
+
+
+def test_fetch_answers_from_the_cache_and_refreshes_in_the_background(
+    server, backend, tmpdir
+):
+    backend.save('foo', 'bar')
+    backend.flush()
+    other = HTTPBackend(url_of(server), str(tmpdir.join('other.db')))
+    try:
+        assert other.fetch('foo') == []
+        other.flush()
+        assert other.fetch('foo') == ['bar']
+    finally:
+        other.close()
+
+
+def test_fetch_does_not_wait_on_the_server(backend):
+    callers = []
+    request = backend.request
+
+    def recording_request(*args):
+        callers.append(threading.current_thread())
+        return request(*args)
+    backend.request = recording_request
+    backend.fetch('foo')
+    backend.flush()
+    assert callers
+    assert threading.current_thread() not in callers
+
+
+def test_refreshes_pick_up_deletions_from_elsewhere(server, backend, tmpdir):
+    backend.save('foo', 'bar')
+    backend.flush()
+    other = HTTPBackend(url_of(server), str(tmpdir.join('other.db')))
+    try:
+        assert other.fetch_many(['foo']) == {'foo': ['bar']}
+        backend.delete('foo', 'bar')
+        backend.flush()
+        other.fresh_keys.clear()
+        other.fetch('foo')
+        other.flush()
+        assert other.fetch('foo') == []
+    finally:
+        other.close()
+
+
+def test_refreshes_do_not_undo_unsent_changes(backend):
+    backend.save('foo', 'bar')
+    backend.save('foo', 'baz')
+    backend.delete('foo', 'bar')
+    backend.fresh_keys.clear()
+    assert backend.fetch_many(['foo']) == {'foo': ['baz']}
+
+
+def test_survives_bad_responses(backend):
+    request = backend.request
+
+    def bad_request(*args):
+        raise ValueError('Not JSON')
+    backend.request = bad_request
+    backend.save('foo', 'bar')
+    backend.fetch('baz')
+    backend.flush()
+    backend.request = request
+    backend.save('foo', 'baz')
+    backend.flush()
+    assert backend.flush_thread.is_alive()
+    assert sorted(backend.request('GET', '/keys/foo', None)) == ['baz']
+
+
+def test_reuses_connections(backend):
+    for _ in range(10):
+        backend.fresh_keys.clear()
+        backend.fetch('foo')
+    backend.flush()
+    assert len(backend.idle_connections) == 1
+
+
+def raw_request(server, method, path, body=None, headers=None):
+    connection = HTTPConnection('127.0.0.1', server.server_address[1])
+    try:
+        connection.putrequest(method, path)
+        for name, value in (headers or {}).items():
+            connection.putheader(name, value)
+        connection.endheaders()
+        if body is not None:
+            connection.send(body)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize(('body', 'headers'), [
+    (None, {}),
+    (None, {'Content-Length': 'lots'}),
+    (None, {'Content-Length': '-1'}),
+    (b'{"a', {'Content-Length': '3'}),
+    (b'{}', {'Content-Length': '2'}),
+])
+@pytest.mark.parametrize('method', ['POST', 'DELETE'])
+def test_server_rejects_bad_bodies(server, method, body, headers):
+    assert raw_request(server, method, '/keys/foo', body, headers) == 400
+    assert raw_request(
+        server, method, '/keys/foo', b'[]', {'Content-Length': '2'}) == 200
+
+
+def test_server_closes_its_connections(server, backend, monkeypatch):
+    import hypothesis.tools.exampleserver as exampleserver
+    opened = []
+    closed = []
+
+    class TrackedBackend(SQLiteBackend):
+
+        def __init__(self, path):
+            super(TrackedBackend, self).__init__(path)
+            opened.append(self)
+
+        def close(self):
+            closed.append(self)
+            super(TrackedBackend, self).close()
+
+    monkeypatch.setattr(exampleserver, 'SQLiteBackend', TrackedBackend)
+    backend.save('foo', 'bar')
+    backend.flush()
+    assert backend.fetch_many(['foo', 'bar']) == {'foo': ['bar'], 'bar': []}
+    assert opened
+    assert closed == opened
+
+
+def test_rejects_non_http_urls():
+    with pytest.raises(ValueError):
+        HTTPBackend('ftp://example.com/')
+
+
+def test_can_be_used_as_example_database(backend):
+    database = ExampleDatabase(backend=backend)
+    settings = Settings(database=database)
+    seen = []
+
+    @given(integers(), settings=settings)
+    def nope(x):
+        seen.append(x)
+        assert x < 1000
+
+    with pytest.raises(AssertionError):
+        nope()
+    seen[:] = []
+    backend.fresh_keys.clear()
+    with pytest.raises(AssertionError):
+        nope()
+    assert seen[0] == 1000
+    assert os.path.exists(backend.cache.path)
@@ -0,0 +1,114 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import pytest
+from hypothesis import find, given, Settings
+from hypothesis.database import ExampleDatabase
+from hypothesis.strategies import text, lists, integers
+from hypothesis.tools.importseeds import load_values, import_seeds, \
+    import_values
+
+
+def test_loads_json_values(tmpdir):
+    path = tmpdir.join('seeds.json')
+    path.write('[1, "a", [true, null]]')
+    assert load_values(str(path)) == [1, 'a', [True, None]]
+
+
+def test_loads_python_values(tmpdir):
+    path = tmpdir.join('seeds.py')
+    path.write('(1, "a", (True, None))')
+    assert load_values(str(path), 'python') == [1, 'a', (True, None)]
+
+
+def test_rejects_files_which_are_not_lists(tmpdir):
+    path = tmpdir.join('seeds.json')
+    path.write('{"a": 1}')
+    with pytest.raises(ValueError):
+        load_values(str(path))
+    with pytest.raises(ValueError):
+        load_values(str(path), 'yaml')
+
+
+def test_imported_seeds_are_tried_first():
+    seen = []
+
+    @given(text(), settings=Settings(database=ExampleDatabase()))
+    def test_not_magic(s):
+        seen.append(s)
+        assert s != 'some magic string'
+
+    assert import_seeds(test_not_magic, ['some magic string', 1]) == [1]
+    with pytest.raises(AssertionError):
+        test_not_magic()
+    assert seen[0] == 'some magic string'
+
+
+def test_seeds_for_several_arguments_are_dicts():
+    seen = []
+
+    @given(integers(), lists(integers()), settings=Settings(
+        database=ExampleDatabase()))
+    def test_not_magic(x, xs):
+        seen.append((x, xs))
+        assert x not in xs
+
+    skipped = import_seeds(test_not_magic, [
+        {'x': 1, 'xs': [2, 1]}, {'x': 1}, [1, [1]],
+    ])
+    assert skipped == [{'x': 1}, [1, [1]]]
+    with pytest.raises(AssertionError):
+        test_not_magic()
+    assert seen[0] == (1, [2, 1])
+
+
+class SeedsForMethods(object):
+
+    @given(integers(), settings=Settings(database=ExampleDatabase()))
+    def test_not_magic(self, x):
+        assert x != 123456789
+
+
+def test_can_import_seeds_for_methods():
+    test = SeedsForMethods().test_not_magic
+    import_seeds(test, [123456789])
+    with pytest.raises(AssertionError):
+        test()
+
+
+def test_import_seeds_requires_a_database():
+    @given(integers(), settings=Settings(database=None))
+    def test_foo(x):
+        pass
+
+    with pytest.raises(ValueError):
+        import_seeds(test_foo, [1])
+
+
+def test_can_import_values_for_a_strategy():
+    database = ExampleDatabase()
+    strat = lists(integers())
+    assert import_values(database.storage('foo'), strat, [
+        [10 ** 6, 1], 'a',
+    ]) == ['a']
+    assert find(
+        strat, lambda xs: 10 ** 6 in xs,
+        settings=Settings(database=database, max_examples=1, max_shrinks=0),
+        storage=database.storage('foo'),
+    ) == [10 ** 6, 1]
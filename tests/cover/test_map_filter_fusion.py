@@ -0,0 +1,132 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+
+import pytest
+from hypothesis import find, given
+from hypothesis.errors import NotInvertible, UnsatisfiedAssumption
+from hypothesis.strategies import text, lists, integers
+from hypothesis.searchstrategy.strategies import FilteredStrategy, \
+    MappedSearchStrategy
+
+
+def draw_values(strategy, n=100):
+    random = Random(0)
+    result = []
+    for _ in range(n):
+        try:
+            result.append(strategy.reify(strategy.draw_and_produce(random)))
+        except UnsatisfiedAssumption:
+            pass
+    return result
+
+
+def test_consecutive_maps_are_a_single_wrapper():
+    base = integers()
+    strat = base.map(lambda x: x + 1).map(lambda x: x * 2).map(str)
+    assert type(strat) is MappedSearchStrategy
+    assert strat.mapped_strategy is base
+    for value in draw_values(strat):
+        assert int(value) % 2 == 0
+
+
+def test_maps_apply_in_order():
+    strat = integers().map(lambda x: [x]).map(lambda x: x + x).map(len)
+    assert set(draw_values(strat)) == set([2])
+
+
+def test_mixed_chains_are_a_single_wrapper():
+    base = integers()
+    strat = base.map(abs).map(lambda x: x * 3).filter(
+        lambda x: x % 2 == 0).map(lambda x: x // 3)
+    assert strat.mapped_strategy is base
+    values = draw_values(strat)
+    assert values
+    for x in values:
+        assert x >= 0
+        assert x % 2 == 0
+
+
+def test_filters_in_a_chain_reject_values():
+    strat = integers().map(abs).filter(lambda x: x < 0)
+    template = strat.draw_and_produce(Random(0))
+    with pytest.raises(UnsatisfiedAssumption):
+        strat.reify(template)
+
+
+def test_consecutive_filters_are_a_single_filter():
+    def even(x):
+        return x % 2 == 0
+
+    def divisible_by_three(x):
+        return x % 3 == 0
+
+    base = integers()
+    strat = base.filter(even).filter(divisible_by_three).filter(bool)
+    assert type(strat) is FilteredStrategy
+    assert strat.mapped_strategy is base
+    values = draw_values(strat, 300)
+    assert values
+    for x in values:
+        assert x % 6 == 0
+        assert x != 0
+
+
+def test_fused_filters_can_still_convert_values_to_templates():
+    strat = lists(integers()).filter(bool).filter(lambda x: len(x) > 1)
+    assert strat.reify(strat.template_for([1, 2])) == [1, 2]
+    with pytest.raises(NotInvertible):
+        strat.template_for([1])
+
+
+def test_later_filters_narrow_the_base_strategy():
+    in_range = lambda x: 0 < x < 10  # noqa
+    strat = integers().filter(lambda x: x % 7 != 3).filter(in_range)
+    values = draw_values(strat)
+    assert len(values) >= 80
+    assert all(0 < x < 10 and x % 7 != 3 for x in values)
+
+
+def test_does_not_fuse_into_subclasses_of_mapped_strategies():
+    base = text()
+    strat = base.map(len)
+    assert strat.mapped_strategy is base
+
+
+def test_repr_shows_every_step():
+    def double(x):
+        return x * 2
+
+    def positive(x):
+        return x > 0
+    strat = integers().map(double).filter(positive).map(str)
+    assert 'map(double).filter(positive).map(str)' in repr(strat)
+
+
+def test_find_works_through_a_fused_chain():
+    assert find(
+        integers().map(abs).filter(lambda x: x > 10).map(lambda x: x * 2),
+        lambda x: x % 4 == 0
+    ) == 24
+
+
+@given(integers().filter(lambda x: x > 0).map(str).map(len))
+def test_given_works_through_a_fused_chain(n):
+    assert n >= 1
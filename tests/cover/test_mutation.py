@@ -0,0 +1,111 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+
+import pytest
+from hypothesis import given, Settings
+from hypothesis.database import ExampleDatabase
+from hypothesis.strategies import text, lists, tuples, integers, \
+    fixed_dictionaries
+from hypothesis.internal.compat import hrange, text_type, integer_types
+from hypothesis.internal.mutation import MAX_BASIC_INT, MIN_BASIC_INT, \
+    mutate_basic
+
+
+def same_shape(x, y):
+    if isinstance(x, list):
+        return isinstance(y, list) and all(
+            same_shape(x[0], v) for v in y
+        ) if x else isinstance(y, list)
+    if isinstance(x, bool):
+        return isinstance(y, bool)
+    if isinstance(x, integer_types):
+        return isinstance(y, integer_types) and not isinstance(y, bool)
+    return type(x) == type(y)
+
+
+@pytest.mark.parametrize('basic', [
+    0, -1, MAX_BASIC_INT, MIN_BASIC_INT, True, None, '', 'hello', '☃',
+    [], [1, 2, 3], [[1], [2, 3]], ['a', 'b'],
+])
+def test_mutations_preserve_types(basic):
+    random = Random(0)
+    for _ in hrange(200):
+        assert same_shape(basic, mutate_basic(basic, random))
+
+
+def test_mutated_integers_fit_in_64_bits():
+    random = Random(0)
+    for value in (MAX_BASIC_INT, MIN_BASIC_INT):
+        for _ in hrange(200):
+            assert MIN_BASIC_INT <= mutate_basic(value, random) <= \
+                MAX_BASIC_INT
+
+
+def test_does_not_modify_its_argument():
+    random = Random(0)
+    basic = [[1, 2], [3]]
+    for _ in hrange(100):
+        mutate_basic(basic, random)
+    assert basic == [[1, 2], [3]]
+
+
+def test_mutation_produces_different_values():
+    random = Random(0)
+    results = set(
+        text_type(mutate_basic('hello', random)) for _ in hrange(100))
+    assert len(results) > 10
+
+
+def test_finds_variants_of_stored_examples_quickly():
+    database = ExampleDatabase()
+    seen = []
+
+    def is_bad(s):
+        return s.startswith('hello') and s != 'hello world'
+
+    @given(text(), settings=Settings(database=database), random=Random(0))
+    def test_no_hello(s):
+        seen.append(s)
+        assert not is_bad(s)
+
+    # This is the strategy that given uses for the arguments to test_no_hello
+    strat = tuples(tuples(), fixed_dictionaries({'s': text()}))
+    template = ((), (tuple('hello world'),))
+    database.storage(test_no_hello.hypothesis_database_key).save(
+        template, strat)
+    with pytest.raises(AssertionError):
+        test_no_hello()
+    assert seen[0] == 'hello world'
+    first_failure = min(i for i, s in enumerate(seen) if is_bad(s))
+    assert first_failure <= 20
+
+
+def test_mutating_stored_examples_of_nested_strategies():
+    database = ExampleDatabase()
+    for limit in hrange(3, 6):
+        @given(
+            lists(tuples(integers(), text())),
+            settings=Settings(database=database))
+        def test_short(xs):
+            assert len(xs) < limit
+
+        with pytest.raises(AssertionError):
+            test_short()
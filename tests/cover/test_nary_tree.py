@@ -17,9 +17,12 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
+from random import Random
+
 from hypothesis import Settings, given
 from hypothesis.strategies import booleans, integers
 from hypothesis.internal.debug import minimal
+from hypothesis.internal.sizing import size_scale
 from hypothesis.searchstrategy.narytree import Leaf, Branch, n_ary_tree
 
 
@@ -70,3 +73,23 @@ def test_serializes_arbitrary_trees(tree):
     strat = n_ary_tree(booleans(), booleans(), booleans())
 
     assert strat.from_basic(strat.to_basic(tree)) == tree
+
+
+def draw_trees(scale, n=200):
+    strat = n_ary_tree(integers(), integers(), integers())
+    random = Random(0)
+    trees = []
+    for _ in range(n):
+        with size_scale(scale):
+            parameter = strat.draw_parameter(random)
+        trees.append(strat.reify(strat.draw_template(random, parameter)))
+    return trees
+
+
+def test_only_draws_leaves_at_scale_zero():
+    for tree in draw_trees(0.0):
+        assert isinstance(tree, Leaf)
+
+
+def test_draws_branches_at_full_scale():
+    assert any(isinstance(tree, Branch) for tree in draw_trees(1.0))
@@ -19,7 +19,9 @@ from __future__ import division, print_function, absolute_import, \
 
 from random import Random
 
-from hypothesis.strategies import lists, one_of, booleans
+from hypothesis.strategies import just, lists, one_of, booleans, integers
+from hypothesis.searchstrategy.strategies import LAZY_UNION_SIZE, \
+    SearchStrategy, LazyParameters
 
 
 def test_can_apply_simplifiers_to_other_types():
@@ -32,3 +34,78 @@ def test_can_apply_simplifiers_to_other_types():
             break
     for simplify in s.simplifiers(r, template1):
         assert list(simplify(r, template2)) == []
+
+
+class CountingStrategy(SearchStrategy):
+
+    def __init__(self, calls):
+        super(CountingStrategy, self).__init__()
+        self.calls = calls
+
+    def draw_parameter(self, random):
+        self.calls.append(self)
+        return random.getrandbits(64)
+
+    def draw_template(self, random, parameter):
+        return parameter
+
+    def reify(self, template):
+        return template
+
+
+def test_lazy_parameters_are_only_drawn_when_asked_for():
+    calls = []
+    strategies = [CountingStrategy(calls) for _ in range(5)]
+    parameters = LazyParameters(strategies, Random(0))
+    assert calls == []
+    parameters[3]
+    parameters[3]
+    assert calls == [strategies[3]]
+
+
+def test_lazy_parameters_do_not_depend_on_the_order_they_are_drawn_in():
+    strategies = [CountingStrategy([]) for _ in range(5)]
+    forwards = LazyParameters(strategies, Random(0))
+    backwards = LazyParameters(strategies, Random(0))
+    for i in reversed(range(5)):
+        backwards[i]
+    assert list(forwards) == list(backwards)
+    assert len(set(forwards)) == 5
+
+
+def test_wide_unions_only_draw_parameters_for_branches_they_use():
+    calls = []
+    strategy = one_of(*[
+        CountingStrategy(calls) for _ in range(LAZY_UNION_SIZE * 4)])
+    random = Random(0)
+    parameter = strategy.draw_parameter(random)
+    assert calls == []
+    for _ in range(5):
+        strategy.draw_template(random, parameter)
+    assert 1 <= len(calls) <= 5
+
+
+def test_narrow_unions_draw_all_parameters_up_front():
+    calls = []
+    strategy = one_of(CountingStrategy(calls), CountingStrategy(calls))
+    strategy.draw_parameter(Random(0))
+    assert len(calls) == 2
+
+
+def test_wide_unions_can_produce_every_branch():
+    strategy = one_of(*[just(i) for i in range(LAZY_UNION_SIZE * 2)])
+    seen = set()
+    random = Random(0)
+    for _ in range(2000):
+        seen.add(strategy.reify(strategy.draw_and_produce(random)))
+    assert seen == set(range(LAZY_UNION_SIZE * 2))
+
+
+def test_wide_unions_of_integers_respect_their_bounds():
+    strategy = one_of(*[
+        integers(min_value=i, max_value=i + 1)
+        for i in range(0, LAZY_UNION_SIZE * 4, 2)])
+    random = Random(0)
+    for _ in range(100):
+        value = strategy.reify(strategy.draw_and_produce(random))
+        assert 0 <= value < LAZY_UNION_SIZE * 4
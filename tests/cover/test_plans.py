@@ -0,0 +1,161 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+from collections import OrderedDict, namedtuple
+
+import pytest
+from hypothesis import given
+from hypothesis.errors import BadData, UnsatisfiedAssumption
+from hypothesis.database import ExampleDatabase
+from hypothesis.strategies import just, sets, text, lists, builds, \
+    floats, tuples, booleans, integers, fixed_dictionaries
+from hypothesis.searchstrategy.plans import MAX_PLAN_DEPTH, compiled
+from hypothesis.searchstrategy.strategies import MappedSearchStrategy
+
+Pair = namedtuple('Pair', ('left', 'right'))
+
+
+class DoublingStrategy(MappedSearchStrategy):
+
+    def __init__(self, strategy):
+        super(DoublingStrategy, self).__init__(strategy=strategy)
+
+    def pack(self, value):
+        return value
+
+    def reify(self, template):
+        return 2 * self.mapped_strategy.reify(template)
+
+
+def nested_tuples(depth):
+    result = integers()
+    for _ in range(depth):
+        result = tuples(result, booleans())
+    return result
+
+
+STRATEGIES = [
+    tuples(tuples(integers(), text()), fixed_dictionaries({
+        'a': lists(integers()), 'b': booleans()})),
+    tuples(tuples(), fixed_dictionaries({})),
+    tuples(integers()),
+    lists(lists(integers().map(lambda x: x * 2))),
+    lists(tuples()),
+    fixed_dictionaries(OrderedDict([('b', integers()), ('a', just(1))])),
+    fixed_dictionaries(dict(('k%d' % (i,), booleans()) for i in range(300))),
+    builds(Pair, integers(), floats()),
+    tuples(integers().filter(lambda x: x % 2 == 0), sets(booleans())),
+    tuples(DoublingStrategy(integers()), text()),
+    nested_tuples(MAX_PLAN_DEPTH * 3),
+]
+
+
+def attempt(f, *args):
+    try:
+        return repr(f(*args))
+    except UnsatisfiedAssumption:
+        return UnsatisfiedAssumption
+
+
+@pytest.mark.parametrize('strat', STRATEGIES, ids=repr)
+def test_compiled_strategies_behave_exactly_like_the_original(strat):
+    plan = compiled(strat)
+    assert plan is not strat
+    assert repr(plan) == repr(strat)
+    for i in range(50):
+        parameter = strat.draw_parameter(Random(i))
+        template = strat.draw_template(Random(i), parameter)
+        assert repr(plan.draw_template(Random(i), parameter)) == repr(
+            template)
+        assert attempt(plan.reify, template) == attempt(strat.reify, template)
+        assert attempt(plan.draw_value, Random(i), parameter) == attempt(
+            strat.draw_value, Random(i), parameter)
+
+
+@pytest.mark.parametrize('strat', STRATEGIES, ids=repr)
+def test_compiled_strategies_serialize_exactly_like_the_original(strat):
+    plan = compiled(strat)
+    random = Random(0)
+    for _ in range(50):
+        template = strat.draw_and_produce(random)
+        basic = strat.to_basic(template)
+        assert plan.to_basic(template) == basic
+        assert repr(plan.from_basic(basic)) == repr(strat.from_basic(basic))
+
+
+def bad_data_result(f, data):
+    try:
+        return repr(f(data))
+    except BadData:
+        return BadData
+
+
+@pytest.mark.parametrize('data', [
+    None, 1, 'ab', [], {}, {'a': 1, 'b': 2}, [[[]], {}],
+    [[[], 'x'], [1, []]], [[[['1', 2]], ''], [0, ['1']]],
+    [[[['1', 0]], ''], [0, []]], [[[['1', 0]], ''], [0, [1]]],
+    [[[['1', 0]], ''], [0, ['1'] * 6]], [[[], ''], [0, ['1']], 3],
+])
+def test_compiled_strategies_reject_bad_data_like_the_original(data):
+    strat = tuples(
+        tuples(lists(tuples(integers(), booleans())), text()),
+        tuples(floats(), lists(integers(), min_size=1, max_size=5)),
+    )
+    assert bad_data_result(compiled(strat).from_basic, data) == \
+        bad_data_result(strat.from_basic, data)
+
+
+def test_compiled_strategies_round_trip_through_the_database():
+    strat = tuples(lists(integers()), fixed_dictionaries({'a': text()}))
+    plan = compiled(strat)
+    storage = ExampleDatabase().storage('compiled')
+    random = Random(0)
+    templates = [strat.draw_and_produce(random) for _ in range(10)]
+    for template in templates:
+        storage.save(template, plan)
+    assert sorted(map(repr, storage.fetch(plan))) == sorted(
+        set(map(repr, templates)))
+
+
+def test_does_not_compile_strategies_with_nothing_to_inline():
+    strat = booleans()
+    assert compiled(strat) is strat
+
+
+def test_overriding_a_method_without_its_source_is_respected():
+    strat = compiled(tuples(DoublingStrategy(just(3))))
+    assert strat.reify(strat.draw_and_produce(Random(0))) == (6,)
+
+
+def test_compiled_strategies_still_serialize_and_simplify():
+    strat = compiled(tuples(integers(), text()))
+    template = strat.template_for((10, 'hello'))
+    assert strat.from_basic(strat.to_basic(template)) == template
+    assert any(
+        True
+        for simplify in strat.simplifiers(Random(0), template)
+        for _ in simplify(Random(0), template)
+    )
+
+
+@given(xs=lists(integers()), x=fixed_dictionaries({'a': booleans()}))
+def test_given_works_with_a_compiled_strategy(xs, x):
+    assert isinstance(xs, list)
+    assert list(x) == ['a']
@@ -0,0 +1,371 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import pickle
+from random import Random
+
+import pytest
+from hypothesis import find, given, Settings
+from hypothesis.core import find_satisfying_template
+from hypothesis.errors import NoSuchExample
+from hypothesis.database import ExampleDatabase
+from hypothesis.strategies import basic, integers
+from hypothesis.internal.tracker import Tracker
+from hypothesis.internal.randomness import DIRECT_DRAWS, FastRandom, \
+    SplitRandom, randbits, randints, randbelow, example_seed, \
+    random_for_example
+from hypothesis.searchstrategy.strategies import SearchStrategy
+
+
+def test_fast_random_is_reproducible_from_its_seed():
+    def draws(random):
+        return [
+            random.randint(0, 10), random.choice('abcdef'),
+            random.random(), random.getrandbits(64),
+            random.randint(0, 2 ** 100),
+        ]
+    assert draws(FastRandom(1)) == draws(FastRandom(1))
+    assert draws(FastRandom(1)) != draws(FastRandom(2))
+
+
+@given(integers(), integers(0, 2 ** 70))
+def test_randint_stays_in_range(lower, span):
+    random = FastRandom(span)
+    for _ in range(10):
+        assert lower <= random.randint(lower, lower + span) <= lower + span
+
+
+def test_randint_hits_every_value():
+    random = FastRandom(0)
+    assert set(random.randint(-2, 2) for _ in range(200)) == set(
+        range(-2, 3))
+
+
+def test_randint_rejects_empty_ranges():
+    with pytest.raises(ValueError):
+        FastRandom(0).randint(1, 0)
+
+
+class ScriptedBits(object):
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.requests = []
+
+    def getrandbits(self, k):
+        self.requests.append(k)
+        return self.values.pop(0)
+
+
+def test_randbelow_retries_values_out_of_range():
+    random = ScriptedBits([7, 5, 3])
+    assert randbelow(random, 5) == 3
+    assert random.requests == [3, 3, 3]
+
+
+def test_randbelow_draws_just_enough_bits():
+    random = ScriptedBits([0, 0])
+    randbelow(random, 2 ** 40)
+    randbelow(random, 2 ** 40 + 1)
+    assert random.requests == [40, 41]
+
+
+@pytest.mark.parametrize('random', [FastRandom(0), SplitRandom(0)])
+def test_randint_over_huge_ranges_uses_every_bit(random):
+    # int(random() * 2 ** 100) would always be a multiple of 2 ** 47.
+    values = [random.randint(0, 2 ** 100 - 1) for _ in range(20)]
+    assert any(v % 2 for v in values)
+    assert all(0 <= v < 2 ** 100 for v in values)
+
+
+def test_randint_over_ranges_just_past_the_fast_path():
+    random = FastRandom(0)
+    span = 3 * 2 ** 40
+    values = [random.randint(0, span - 1) for _ in range(3000)]
+    assert all(0 <= v < span for v in values)
+    # Each third of the range should get about 1000 of them.
+    thirds = [0, 0, 0]
+    for v in values:
+        thirds[v // 2 ** 40] += 1
+    assert min(thirds) > 800
+
+
+def test_choice_picks_from_the_sequence():
+    random = FastRandom(0)
+    assert set(random.choice('abc') for _ in range(100)) == set('abc')
+
+
+def test_choice_of_empty_sequence_errors():
+    with pytest.raises(IndexError):
+        FastRandom(0).choice([])
+
+
+def test_bulk_randints_are_in_range():
+    for random in (Random(0), FastRandom(0)):
+        values = randints(random, 1, 256, 1000)
+        assert len(values) == 1000
+        assert min(values) >= 1
+        assert max(values) <= 256
+
+
+def test_bulk_randints_over_huge_ranges():
+    values = randints(FastRandom(0), 0, 2 ** 100, 10)
+    assert all(0 <= v <= 2 ** 100 for v in values)
+    assert len(set(values)) == 10
+    assert any(v % 2 for v in values)
+
+
+def test_bulk_bits_have_the_right_size():
+    values = randbits(FastRandom(0), 8, 100)
+    assert len(values) == 100
+    assert all(0 <= v < 256 for v in values)
+
+
+def split_random_draws(random):
+    return [
+        random.randint(0, 10), random.choice('abcdef'), random.random(),
+        random.getrandbits(64), random.randint(0, 2 ** 100),
+        random.expovariate(1.0), random.gauss(0, 1),
+        random.sample(range(10), 3),
+    ]
+
+
+@pytest.mark.parametrize(
+    'seed', [0, 1, 2 ** 64 - 1, 2 ** 100, -5, b'abc', 'x'])
+def test_split_random_is_reproducible_from_its_seed(seed):
+    assert split_random_draws(SplitRandom(seed)) == split_random_draws(
+        SplitRandom(seed))
+
+
+def test_different_seeds_give_different_values():
+    assert len(set(SplitRandom(i).random() for i in range(100))) == 100
+
+
+def test_split_random_does_not_seed_a_twister_for_a_few_draws():
+    random = SplitRandom(0)
+    random.split()
+    random.random()
+    random.getrandbits(64)
+    random.randint(0, 10)
+    assert random.twister is None
+
+
+def test_split_random_seeds_a_twister_once_it_is_drawn_from_a_lot():
+    random = SplitRandom(0)
+    values = [random.random() for _ in range(DIRECT_DRAWS + 1)]
+    assert random.twister is not None
+    assert len(set(values)) == len(values)
+    assert all(0 <= v < 1 for v in values)
+
+
+def test_split_random_children_do_not_seed_a_twister():
+    parent = SplitRandom(0)
+    for _ in range(100):
+        child = parent.split()
+        child.random()
+        assert child.twister is None
+    assert parent.twister is None
+
+
+@pytest.mark.parametrize('k', [1, 8, 53, 63, 64, 65, 128, 200])
+def test_split_random_getrandbits_has_the_right_size(k):
+    random = SplitRandom(0)
+    values = [random.getrandbits(k) for _ in range(DIRECT_DRAWS * 2)]
+    assert all(0 <= v < 2 ** k for v in values)
+    if k >= 8:
+        assert max(values) >= 2 ** (k - 8)
+
+
+def test_split_random_getrandbits_rejects_no_bits():
+    with pytest.raises(ValueError):
+        SplitRandom(0).getrandbits(0)
+
+
+def test_splits_are_reproducible_and_independent():
+    parent = SplitRandom(0)
+    children = [parent.split() for _ in range(10)]
+    again = SplitRandom(0)
+    assert [c.random() for c in children] == [
+        again.split().random() for _ in range(10)]
+    assert len(set(c.getrandbits(64) for c in children)) == 10
+
+
+def test_split_after_use_is_reproducible():
+    def child(random):
+        random.random()
+        return random.split().random()
+    assert child(SplitRandom(3)) == child(SplitRandom(3))
+
+
+@pytest.mark.parametrize('n_draws', [0, 1, DIRECT_DRAWS, 100])
+def test_split_random_state_round_trips(n_draws):
+    random = SplitRandom(7)
+    for _ in range(n_draws):
+        random.random()
+    state = random.getstate()
+    values = [random.random() for _ in range(5)]
+    random.setstate(state)
+    assert values == [random.random() for _ in range(5)]
+
+
+def test_split_random_can_be_pickled():
+    random = SplitRandom(7)
+    random.random()
+    copy = pickle.loads(pickle.dumps(random))
+    assert [copy.random() for _ in range(5)] == [
+        random.random() for _ in range(5)]
+
+
+def test_split_random_choice_of_empty_sequence_errors():
+    with pytest.raises(IndexError):
+        SplitRandom(0).choice([])
+
+
+def test_split_random_shuffles():
+    xs = list(range(100))
+    SplitRandom(0).shuffle(xs)
+    assert sorted(xs) == list(range(100))
+    assert xs != list(range(100))
+
+
+def test_split_random_chooses_with_and_without_weights():
+    random = SplitRandom(0)
+    assert set(random.choices('abc', k=100)) == set('abc')
+    assert set(random.choices('abc', weights=[0, 1, 0], k=10)) == set('b')
+    assert set(random.choices('abc', cum_weights=[1, 1, 1], k=10)) == \
+        set('a')
+
+
+def test_split_random_choices_rejects_bad_weights():
+    with pytest.raises(TypeError):
+        SplitRandom(0).choices('ab', weights=[1, 1], cum_weights=[1, 2])
+    with pytest.raises(ValueError):
+        SplitRandom(0).choices('ab', weights=[1])
+
+
+@pytest.mark.parametrize('n_draws', [0, DIRECT_DRAWS + 1])
+def test_split_random_jumps_ahead_reproducibly(n_draws):
+    def jumped(n):
+        random = SplitRandom(0)
+        for _ in range(n_draws):
+            random.random()
+        random.jumpahead(n)
+        return [random.random() for _ in range(3)]
+    assert jumped(1) == jumped(1)
+    assert jumped(1) != jumped(2)
+
+
+def test_basic_strategies_get_real_randoms():
+    seen = []
+
+    def generate(random, parameter):
+        seen.append(random)
+        return 0
+
+    strat = basic(generate=generate, simplify=lambda random, x: iter(()))
+    strat.reify(strat.draw_and_produce(SplitRandom(0)))
+    assert seen
+    assert all(isinstance(random, Random) for random in seen)
+
+
+def test_example_seeds_are_distinct_and_reproducible():
+    seeds = [example_seed(0, i) for i in range(1000)]
+    assert len(set(seeds)) == 1000
+    assert seeds == [example_seed(0, i) for i in range(1000)]
+    assert example_seed(0, 1) != example_seed(1, 1)
+
+
+def test_example_seeds_are_a_split_mix_stream():
+    random = SplitRandom(12345)
+    assert [random.next64() for _ in range(10)] == [
+        example_seed(12345, i) for i in range(10)]
+
+
+def test_small_examples_do_not_seed_a_twister():
+    strategy = integers()
+    random = Random(0)
+    randoms = [random_for_example(0, i) for i in range(100)]
+    for r in randoms:
+        strategy.draw_template(r, strategy.draw_parameter(random))
+    assert all(r.twister is None for r in randoms)
+
+
+class SeedStrategy(SearchStrategy):
+
+    def draw_parameter(self, random):
+        return None
+
+    def draw_template(self, random, parameter):
+        return random.getrandbits(64)
+
+    def reify(self, template):
+        return template
+
+    def to_basic(self, template):
+        return template
+
+    def from_basic(self, data):
+        return data
+
+
+@pytest.mark.parametrize('max_shrinks', [0, 10])
+def test_examples_can_be_regenerated_from_their_index(max_shrinks):
+    strategy = SeedStrategy()
+    seen = []
+
+    def condition(x):
+        seen.append(x)
+        return False
+
+    settings = Settings(
+        max_examples=50, max_shrinks=max_shrinks, database=None)
+    with pytest.raises(NoSuchExample):
+        find(strategy, condition, settings=settings, random=Random(0))
+    run_seed = Random(0).getrandbits(64)
+    for index in (50, 1, 20):
+        assert seen[index - 1] == strategy.draw_template(
+            random_for_example(run_seed, index), None)
+
+
+def test_example_indices_do_not_count_replayed_examples():
+    strategy = SeedStrategy()
+    database = ExampleDatabase()
+    storage = database.storage('test_example_indices')
+    for i in range(5):
+        storage.save(i, strategy)
+    seen = []
+
+    def condition(x):
+        seen.append(x)
+        return False
+
+    settings = Settings(max_examples=200, max_shrinks=0, database=database)
+    with pytest.raises(NoSuchExample):
+        find_satisfying_template(
+            strategy, Random(0), condition, Tracker(), settings,
+            storage=storage,
+        )
+    run_seed = Random(0).getrandbits(64)
+    generated = [
+        strategy.draw_template(random_for_example(run_seed, index), None)
+        for index in range(1, 11)
+    ]
+    assert sorted(seen[:5]) == list(range(5))
+    assert [x for x in seen if x in generated] == generated
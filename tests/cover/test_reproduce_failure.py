@@ -0,0 +1,111 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import re
+
+import pytest
+from hypothesis import given, Settings, reproduce_failure
+from hypothesis.core import decode_failure, encode_failure
+from hypothesis.errors import DidNotReproduce, InvalidArgument
+from tests.common.utils import capture_out
+from hypothesis.strategies import text, lists, booleans, integers
+
+
+@given(lists(integers() | text() | booleans()))
+def test_encoding_round_trips(data):
+    assert decode_failure(encode_failure(data)) == data
+
+
+def failing_blob():
+    @given(lists(integers()), settings=Settings(database=None))
+    def test_sum_is_small(xs):
+        assert sum(xs) < 100
+
+    with capture_out() as out:
+        with pytest.raises(AssertionError):
+            test_sum_is_small()
+    match = re.search(r"@reproduce_failure\('([^']+)'\)", out.getvalue())
+    assert match is not None
+    return match.group(1)
+
+
+def test_failures_print_a_blob_which_reproduces_them():
+    blob = failing_blob()
+    calls = []
+
+    @reproduce_failure(blob)
+    @given(lists(integers()))
+    def test_sum_is_small(xs):
+        calls.append(xs)
+        assert sum(xs) < 100
+
+    with capture_out():
+        with pytest.raises(AssertionError):
+            test_sum_is_small()
+    assert len(calls) == 1
+    assert sum(calls[0]) >= 100
+
+
+def test_can_reproduce_from_inside_given():
+    blob = failing_blob()
+    calls = []
+
+    @given(lists(integers()))
+    @reproduce_failure(blob)
+    def test_sum_is_small(xs):
+        calls.append(xs)
+        assert sum(xs) < 100
+
+    with capture_out():
+        with pytest.raises(AssertionError):
+            test_sum_is_small()
+    assert len(calls) == 1
+    assert sum(calls[0]) >= 100
+
+
+def test_errors_if_the_test_now_passes():
+    @reproduce_failure(failing_blob())
+    @given(lists(integers()))
+    def test_passes(xs):
+        pass
+
+    with capture_out():
+        with pytest.raises(DidNotReproduce):
+            test_passes()
+
+
+def test_errors_on_garbage():
+    @reproduce_failure('not a blob')
+    @given(integers())
+    def test_passes(x):
+        pass
+
+    with pytest.raises(InvalidArgument):
+        test_passes()
+
+
+def test_errors_if_blob_does_not_match_arguments():
+    @reproduce_failure(encode_failure([[], {}]))
+    @given(integers())
+    def test_passes(x):
+        pass
+
+    with pytest.raises(InvalidArgument):
+        test_passes()
@@ -19,6 +19,7 @@ from __future__ import division, print_function, absolute_import, \
 
 import pytest
 from hypothesis.errors import InvalidArgument
+from hypothesis.database import ExampleDatabase
 from hypothesis.settings import Settings, Verbosity
 
 TEST_DESCRIPTION = 'This is a setting just for these tests'
@@ -127,3 +128,14 @@ def test_can_set_verbosity():
     Settings(verbosity=Verbosity.quiet)
     Settings(verbosity=Verbosity.normal)
     Settings(verbosity=Verbosity.verbose)
+
+
+def test_can_copy_settings_from_a_parent():
+    database = ExampleDatabase()
+    parent = Settings(max_examples=7, database=database)
+    child = Settings(parent, timeout=3)
+    assert child.max_examples == 7
+    assert child.timeout == 3
+    assert child.database is database
+    assert parent.timeout != 3
+    assert Settings(parent, database=None).database is None
@@ -0,0 +1,251 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+
+import pytest
+import hypothesis.core as core
+from hypothesis import find, given, Settings, Verbosity
+from hypothesis.database import ExampleDatabase
+from hypothesis.reporting import with_reporter
+from hypothesis.strategies import text, lists, integers
+from hypothesis.internal.tracker import Tracker
+from hypothesis.tools.keepshrinking import NotAHypothesisTest, load_test, \
+    keep_shrinking
+
+
+def checkpoints(database):
+    return [
+        value
+        for key in database.backend.keys()
+        if key.endswith(':checkpoint')
+        for value in database.backend.fetch(key)
+    ]
+
+
+def test_saves_a_checkpoint_when_shrinking_is_cut_short():
+    database = ExampleDatabase()
+    find(
+        integers(), lambda x: x >= 1000,
+        settings=Settings(database=database, max_shrinks=1))
+    assert len(checkpoints(database)) == 1
+
+
+def test_clears_checkpoint_when_shrinking_finishes():
+    database = ExampleDatabase()
+    condition = lambda x: x >= 1000  # noqa
+    find(
+        integers(), condition,
+        settings=Settings(database=database, max_shrinks=1))
+    messages = []
+    with with_reporter(messages.append):
+        assert find(
+            integers(), condition,
+            settings=Settings(
+                database=database, verbosity=Verbosity.debug)
+        ) == 1000
+    assert any('Resuming' in m for m in messages)
+    assert checkpoints(database) == []
+
+
+def test_does_not_resume_from_checkpoint_for_a_different_example():
+    database = ExampleDatabase()
+    strat = integers()
+    storage = database.storage('foo')
+    storage.save_checkpoint(strat.draw_and_produce(Random(1)), strat, [
+        3, True, []
+    ])
+    assert storage.fetch_checkpoint(
+        strat.draw_and_produce(Random(2)), strat) is None
+
+
+@pytest.mark.parametrize('state', [
+    None, 1, [], [0, True, []], [1, 1, []], [1, True, ['a']], [1, True, 'a'],
+    [1, True, [-1]], [1, True, [True]],
+])
+def test_ignores_invalid_shrink_states(state):
+    assert core.load_shrink_state(state) is None
+
+
+def test_resuming_skips_exhausted_passes():
+    strat = lists(text())
+    random = Random(0)
+    template = strat.draw_and_produce(random)
+    while not strat.reify(template):
+        template = strat.draw_and_produce(random)
+    passes = list(range(len(list(strat.simplifiers(random, template)))))
+    applied = []
+
+    def condition(t):
+        applied.append(t)
+        return False
+
+    list(core.simplify_template_such_that(
+        strat, random, template, condition, Tracker(), Settings(), 0,
+        resume_from=core.ShrinkState(5, False, passes),
+    ))
+    assert applied == []
+
+
+class PassRecorder(object):
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.applied = []
+
+    def simplifiers(self, random, template):
+        for simplify in self.strategy.simplifiers(random, template):
+            yield self.recording(simplify)
+
+    def recording(self, simplify):
+        def accept(random, template):
+            self.applied.append(simplify.__name__)
+            return simplify(random, template)
+        accept.__name__ = simplify.__name__
+        return accept
+
+
+def test_repeated_passes_in_a_round_are_all_run():
+    strat = lists(integers())
+    recorder = PassRecorder(strat)
+
+    def condition(t):
+        x = strat.reify(t)
+        return len(x) >= 5 and sum(x) > 1000
+
+    template = strat.template_for([0, 1000, 7, 0, 5, 3])
+    list(core.simplify_template_such_that(
+        recorder, Random(0), template, condition, Tracker(), Settings(), 0,
+    ))
+    # ListStrategy applies the simplifier for each index on its way forwards
+    # and again on its way back, so within a round each of them runs twice.
+    for_index = [
+        name for name in recorder.applied
+        if name.startswith('simplifier_for_index')
+    ]
+    assert for_index
+    rounds = recorder.applied.count(recorder.applied[0])
+    assert len(for_index) >= 2 * rounds
+
+
+def test_resuming_only_skips_passes_in_the_resumed_round():
+    strat = lists(integers())
+    template = strat.template_for([1, 2, 3])
+    applied = []
+
+    def condition(t):
+        applied.append(t)
+        return False
+
+    n = len(list(strat.simplifiers(Random(0), template)))
+    list(core.simplify_template_such_that(
+        strat, Random(0), template, condition, Tracker(), Settings(), 0,
+        resume_from=core.ShrinkState(1, True, list(range(n))),
+    ))
+    assert applied
+
+
+def test_checkpoints_periodically(monkeypatch):
+    monkeypatch.setattr(core, 'CHECKPOINT_INTERVAL', 0)
+    states = []
+    strat = lists(integers())
+    random = Random(0)
+    template = strat.draw_and_produce(random)
+    list(core.simplify_template_such_that(
+        strat, random, template, lambda t: True, Tracker(), Settings(), 0,
+        checkpoint=lambda t, state: states.append(state),
+    ))
+    assert len(states) > 1
+    assert states[-1] is None
+    assert all(state is not None for state in states[:-1])
+
+
+@given(integers(), settings=Settings(
+    database=ExampleDatabase(), max_shrinks=1))
+def fails_for_large_numbers(x):
+    assert x < 1000
+
+
+class FailsForLargeNumbers(object):
+    fails_for_large_numbers = staticmethod(fails_for_large_numbers)
+
+
+def test_keep_shrinking_finishes_simplifying():
+    with pytest.raises(AssertionError):
+        fails_for_large_numbers()
+    settings = fails_for_large_numbers.hypothesis_settings
+    assert checkpoints(settings.database)
+    settings.max_shrinks = 2000
+    try:
+        assert keep_shrinking(fails_for_large_numbers, timeout=5)
+    finally:
+        settings.max_shrinks = 1
+    assert checkpoints(settings.database) == []
+
+
+def test_keep_shrinking_requires_a_database():
+    @given(integers(), settings=Settings(database=None))
+    def test_foo(x):
+        pass
+
+    with pytest.raises(ValueError):
+        keep_shrinking(test_foo)
+
+
+def test_keep_shrinking_stops_when_test_passes():
+    @given(integers(), settings=Settings(database=ExampleDatabase()))
+    def test_foo(x):
+        pass
+
+    assert keep_shrinking(test_foo)
+
+
+def test_keep_shrinking_does_not_change_the_test_settings():
+    class TestFoo(object):
+        @given(integers(), settings=Settings(database=ExampleDatabase()))
+        def test_foo(self, x):
+            seen.append(Settings.default.timeout)
+            assert x < 10
+
+    seen = []
+    test = TestFoo().test_foo
+    settings = test.hypothesis_settings
+    timeout = settings.timeout
+    keep_shrinking(test, timeout=timeout + 1)
+    assert test.hypothesis_settings is settings
+    assert settings.timeout == timeout
+    assert timeout + 1 in seen
+
+
+def test_load_test_finds_functions_and_methods():
+    assert load_test(__name__ + '.fails_for_large_numbers') is \
+        fails_for_large_numbers
+    assert load_test(
+        __name__ + '.FailsForLargeNumbers.fails_for_large_numbers'
+    ) is fails_for_large_numbers
+
+
+def test_load_test_rejects_non_hypothesis_tests():
+    with pytest.raises(NotAHypothesisTest):
+        load_test(__name__ + '.checkpoints')
+
+
+def test_load_test_rejects_unimportable_names():
+    with pytest.raises(ValueError):
+        load_test('nosuchmodule.test_foo')
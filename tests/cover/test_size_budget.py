@@ -0,0 +1,116 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+
+from hypothesis import given, Settings
+from hypothesis.strategies import text, lists, booleans, integers
+from hypothesis.internal.sizing import SizeBudget, claim_size, size_budget
+from hypothesis.searchstrategy.narytree import Leaf, Branch, n_ary_tree
+
+
+def total_size(x):
+    if isinstance(x, list):
+        return len(x) + sum(map(total_size, x))
+    return 0
+
+
+def tree_size(tree):
+    if isinstance(tree, Leaf):
+        return 0
+    assert isinstance(tree, Branch)
+    return len(tree.keyed_children) + sum(
+        tree_size(child) for _, child in tree.keyed_children
+    )
+
+
+def test_claims_as_much_as_is_left():
+    budget = SizeBudget(10)
+    assert budget.claim(4) == 4
+    assert budget.claim(10) == 6
+    assert budget.claim(3) == 0
+    assert budget.claim(3, 2) == 2
+
+
+def test_unlimited_outside_a_budget():
+    assert claim_size(10 ** 6) == 10 ** 6
+    with size_budget(None):
+        assert claim_size(10 ** 6) == 10 ** 6
+
+
+def test_budgets_do_not_leak_out():
+    with size_budget(5):
+        assert claim_size(10) == 5
+        with size_budget(None):
+            assert claim_size(10) == 10
+        assert claim_size(10) == 0
+    assert claim_size(10) == 10
+
+
+def test_nested_lists_share_the_budget():
+    strat = lists(lists(lists(integers(), average_size=50), average_size=50),
+                  average_size=50)
+    random = Random(0)
+    for _ in range(20):
+        with size_budget(1000):
+            value = strat.reify(strat.draw_and_produce(random))
+        assert total_size(value) <= 1000
+
+
+def test_min_size_is_respected_even_when_the_budget_is_spent():
+    strat = lists(text(min_size=3), min_size=5, average_size=100)
+    random = Random(0)
+    for _ in range(20):
+        with size_budget(0):
+            value = strat.reify(strat.draw_and_produce(random))
+        assert len(value) >= 5
+        assert all(len(x) >= 3 for x in value)
+
+
+def test_trees_share_the_budget():
+    strat = n_ary_tree(booleans(), booleans(), booleans())
+    random = Random(0)
+    for _ in range(20):
+        with size_budget(200):
+            tree = strat.reify(strat.draw_and_produce(random))
+        assert tree_size(tree) <= 200
+
+
+def test_given_keeps_examples_within_the_budget():
+    sizes = []
+
+    @given(lists(lists(lists(booleans()))), settings=Settings(
+        size_budget=100, max_examples=100))
+    def test_size(x):
+        sizes.append(total_size(x))
+
+    test_size()
+    assert max(sizes) <= 100
+
+
+def test_given_keeps_values_drawn_directly_within_the_budget():
+    sizes = []
+
+    @given(lists(lists(lists(booleans()))), settings=Settings(
+        size_budget=100, max_examples=100, max_shrinks=0, database=None))
+    def test_size(x):
+        sizes.append(total_size(x))
+
+    test_size()
+    assert max(sizes) <= 100
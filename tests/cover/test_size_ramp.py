@@ -0,0 +1,117 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+from random import Random
+
+from hypothesis import given, Settings
+from hypothesis.strategies import text, lists, integers
+from hypothesis.internal.sizing import scaled, scale_for, size_scale, \
+    current_scale
+from hypothesis.searchstrategy.strategies import SearchStrategy
+
+
+def test_scale_grows_to_one():
+    assert scale_for(1, 10) == 0.1
+    assert scale_for(5, 10) == 0.5
+    assert scale_for(10, 10) == 1.0
+    assert scale_for(100, 10) == 1.0
+
+
+def test_no_ramp_means_full_size():
+    assert scale_for(1, 0) == 1.0
+
+
+def test_full_size_outside_the_engine():
+    assert scaled(10) == 10
+    with size_scale(0.5):
+        assert scaled(10) == 5
+    assert scaled(10) == 10
+
+
+def test_small_scale_draws_small_lists():
+    strat = lists(integers(), average_size=100)
+    random = Random(0)
+    total = 0
+    for _ in range(20):
+        with size_scale(0.01):
+            parameter = strat.draw_parameter(random)
+        total += len(strat.draw_template(random, parameter))
+    assert total < 20 * 10
+
+
+def test_small_scale_draws_small_alphabets():
+    strat = text()
+    random = Random(0)
+    for _ in range(20):
+        with size_scale(0.0):
+            parameter = strat.draw_parameter(random)
+        template = strat.draw_template(random, parameter)
+        assert len(set(strat.reify(template))) <= 1
+
+
+class ScaleRecordingStrategy(SearchStrategy):
+
+    def __init__(self):
+        super(ScaleRecordingStrategy, self).__init__()
+        self.scales = []
+
+    def draw_parameter(self, random):
+        self.scales.append(current_scale.value)
+        return random.getrandbits(64)
+
+    def draw_template(self, random, parameter):
+        return random.getrandbits(64)
+
+    def reify(self, template):
+        return template
+
+
+def scales_used(size_ramp):
+    strat = ScaleRecordingStrategy()
+
+    @given(strat, settings=Settings(
+        max_examples=200, size_ramp=size_ramp, database=None))
+    def test_nothing(x):
+        pass
+
+    test_nothing()
+    return strat.scales
+
+
+def test_given_grows_the_scale_over_the_run():
+    scales = scales_used(0.5)
+    assert scales[0] <= 0.01
+    assert scales == sorted(scales)
+    assert scales[-1] == 1.0
+
+
+def test_ramp_can_be_disabled():
+    assert set(scales_used(0)) == set([1.0])
+
+
+def test_given_starts_with_small_examples():
+    sizes = []
+
+    @given(lists(integers(), average_size=100), settings=Settings(
+        max_examples=400, size_ramp=0.5, database=None))
+    def test_size(x):
+        sizes.append(len(x))
+
+    test_size()
+    assert sum(sizes[:10]) < 200
@@ -25,7 +25,8 @@ import pytest
 from hypothesis import Settings, assume, strategy
 from hypothesis.errors import Flaky, BadData, InvalidDefinition
 from tests.common.utils import capture_out
-from hypothesis.database import ExampleDatabase
+from hypothesis.database import ExampleDatabase, corpus_key, \
+    metadata_key
 from hypothesis.stateful import Bundle, GenericStateMachine, \
     RuleBasedStateMachine, StateMachineSearchStrategy, rule, \
     run_state_machine_as_test
@@ -471,7 +472,23 @@ def test_saves_failing_example_in_database():
     with pytest.raises(AssertionError):
         run_state_machine_as_test(
             SetStateMachine, Settings(database=db))
-    assert len(list(db.backend.keys())) == 1
+    keys = list(db.backend.keys())
+    assert len([
+        key for key in keys
+        for data in db.backend.fetch(key)
+        if metadata_key(key, data) in keys
+    ]) == 1
+
+
+def test_keeps_a_corpus_of_passing_runs():
+    db = ExampleDatabase()
+    run_state_machine_as_test(
+        GoodSet, Settings(database=db, max_corpus_size=10))
+    corpus = db.backend.fetch(corpus_key('GoodSet'))
+    assert 1 <= len(corpus) <= 10
+    strategy = StateMachineSearchStrategy(Settings.default)
+    storage = db.storage('GoodSet')
+    assert len(list(storage.fetch_corpus(strategy))) == len(corpus)
 
 
 def test_can_run_with_no_db():
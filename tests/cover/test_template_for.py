@@ -0,0 +1,100 @@
+# coding=utf-8
+
+# This file is part of Hypothesis (https://github.com/DRMacIver/hypothesis)
+
+# Most of this work is copyright (C) 2013-2015 David R. MacIver
+# (david@drmaciver.com), but it contains contributions by other. See
+# https://github.com/DRMacIver/hypothesis/blob/master/CONTRIBUTING.rst for a
+# full list of people who may hold copyright, and consult the git log if you
+# need to determine who owns an individual contribution.
+
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at http://mozilla.org/MPL/2.0/.
+
+# END HEADER
+
+from __future__ import division, print_function, absolute_import, \
+    unicode_literals
+
+import pytest
+from hypothesis import given, Settings
+from hypothesis.core import given_strategy, template_for_arguments
+from hypothesis.errors import NotInvertible, InvalidArgument
+from hypothesis.strategies import just, text, lists, floats, one_of, \
+    tuples, booleans, integers, sampled_from, fixed_dictionaries
+
+
+@pytest.mark.parametrize(('strat', 'value'), [
+    (integers(), 0),
+    (integers(), -10 ** 30),
+    (integers(min_value=3), 3),
+    (integers(min_value=-3, max_value=3), -3),
+    (booleans(), True),
+    (just('foo'), 'foo'),
+    (sampled_from(('a', 'b', 'c')), 'c'),
+    (text(), ''),
+    (text(), 'h\xe9llo ☃'),
+    (text(alphabet='ab'), 'abba'),
+    (text(alphabet='a'), 'aaa'),
+    (lists(integers()), [1, 2, 3]),
+    (lists(integers(), min_size=1, max_size=3), [1]),
+    (lists(booleans() | text()), [True, 'a', False]),
+    (tuples(integers(), text()), (1, 'a')),
+    (fixed_dictionaries({'a': integers(), 'b': text()}), {'a': 1, 'b': ''}),
+    (one_of(integers(), text()), 'a'),
+    (integers().filter(lambda x: x > 0), 1),
+])
+def test_template_for_round_trips(strat, value):
+    template = strat.template_for(value)
+    assert strat.reify(template) == value
+    assert strat.reify(strat.from_basic(strat.to_basic(template))) == value
+
+
+@pytest.mark.parametrize(('strat', 'value'), [
+    (integers(), 'a'),
+    (integers(), True),
+    (integers(min_value=3), 2),
+    (integers(min_value=-3, max_value=3), 4),
+    (booleans(), 1),
+    (just('foo'), 'bar'),
+    (sampled_from(('a', 'b', 'c')), 'd'),
+    (text(), 1),
+    (text(alphabet='ab'), 'abc'),
+    (text(alphabet='a'), 'ab'),
+    (lists(integers()), ['a']),
+    (lists(integers(), min_size=1, max_size=3), []),
+    (lists(integers(), min_size=1, max_size=3), [1, 2, 3, 4]),
+    (tuples(integers(), text()), (1,)),
+    (tuples(integers(), text()), [1, 'a']),
+    (fixed_dictionaries({'a': integers()}), {'b': 1}),
+    (fixed_dictionaries({'a': integers()}), [1]),
+    (one_of(integers(), text()), None),
+    (integers().filter(lambda x: x > 0), 0),
+    (integers().map(lambda x: x * 2), 2),
+    (floats(), 1.0),
+])
+def test_template_for_rejects_values_which_could_not_be_generated(
+    strat, value
+):
+    with pytest.raises(NotInvertible):
+        strat.template_for(value)
+
+
+@given(integers(), text(), settings=Settings(database=None))
+def takes_two_arguments(x, s):
+    pass
+
+
+def test_template_for_arguments_matches_given_strategy():
+    strat = given_strategy(takes_two_arguments)
+    template = template_for_arguments(takes_two_arguments, {'x': 1, 's': 'a'})
+    assert strat.reify(template) == ((), {'x': 1, 's': 'a'})
+
+
+def test_template_for_arguments_requires_every_argument():
+    with pytest.raises(InvalidArgument):
+        template_for_arguments(takes_two_arguments, {'x': 1})
+    with pytest.raises(InvalidArgument):
+        template_for_arguments(
+            takes_two_arguments, {'x': 1, 's': 'a', 'y': 2})
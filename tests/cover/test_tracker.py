@@ -17,7 +17,16 @@
 from __future__ import division, print_function, absolute_import, \
     unicode_literals
 
-from hypothesis.internal.tracker import Tracker
+from copy import deepcopy
+from decimal import Decimal
+from fractions import Fraction
+from collections import namedtuple
+
+import pytest
+from hypothesis.internal.tracker import Tracker, ValueTracker, \
+    value_tracking_key
+
+Point = namedtuple('Point', ('x', 'y'))
 
 
 class Foo(object):
@@ -84,3 +93,58 @@ def test_track_complex_with_nan():
     assert t.track(complex(0, nan)) == 2
     assert t.track(complex(nan, nan)) == 1
     assert t.track(complex(nan, nan)) == 2
+
+
+@pytest.mark.parametrize('value', [
+    None, True, 1, 1.0, -0.0, 0.0, float('nan'), 1j, '1', b'1',
+    Decimal('1.0'), Fraction(1, 2), [1], (1,), {1: 2}, set([1]),
+    frozenset([1]), [[True], (False, {'a': None})], Point(1, 2),
+])
+def test_values_have_the_same_key_as_equal_copies(value):
+    key = value_tracking_key(value)
+    assert key is not None
+    assert value_tracking_key(deepcopy(value)) == key
+
+
+@pytest.mark.parametrize(('x', 'y'), [
+    (1, True), (1, 1.0), (0.0, -0.0), ([1], (1,)), (set([1]), frozenset([1])),
+    ({1: 2}, {1: 3}), ((1, 2), Point(1, 2)), (Decimal('1.0'), Decimal('1')),
+])
+def test_distinguishes_values_which_may_behave_differently(x, y):
+    assert value_tracking_key(x) != value_tracking_key(y)
+
+
+def test_sets_and_dicts_do_not_depend_on_order():
+    x = set(range(100))
+    y = set(reversed(range(100)))
+    assert value_tracking_key(x) == value_tracking_key(y)
+    assert value_tracking_key(dict.fromkeys(x)) == value_tracking_key(
+        dict.fromkeys(y))
+
+
+def test_cannot_track_arbitrary_objects():
+    assert value_tracking_key(Foo()) is None
+    assert value_tracking_key([1, object()]) is None
+    assert value_tracking_key(iter([1])) is None
+
+
+def test_value_tracker_treats_equal_values_as_duplicates():
+    t = ValueTracker(abs)
+    assert t.track(1) == 1
+    assert t.track(-1) == 2
+    assert t.track(1) == 2
+    assert len(t) == 2
+
+
+def test_value_tracker_only_tracks_templates_for_unknown_values():
+    t = ValueTracker(lambda x: Foo())
+    assert t.track(1) == 1
+    assert t.track(2) == 1
+
+
+def test_value_tracker_ignores_errors_making_values():
+    def bad(x):
+        raise ValueError()
+    t = ValueTracker(bad)
+    assert t.track(1) == 1
+    assert t.track(1) == 2